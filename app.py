@@ -3,10 +3,19 @@ import json
 import os
 from datetime import datetime
 from utils.theming import apply_chatgpt_theme
-from utils.data_manager import save_user_data, load_corpus_data, get_corpus_statistics
+from utils.cards import stat_card, show_card_grid
+from utils.data_manager import (
+    save_user_data, load_corpus_data, get_corpus_statistics, get_recent_data, get_latest_sequence, changes_since
+)
 from utils.translations import get_translations, SUPPORTED_LANGUAGES
 from utils.ai_validation import validate_content
 from utils.auth import auth_sidebar, is_logged_in, get_current_user, update_user_contributions
+from utils.warmup import start_warmup
+from utils.session_memory import record_contribution, update_session_accounting
+from utils.profiler import profile_page_run
+
+# Profile this run when page profiling is on
+profile_page_run()
 
 # Page config
 st.set_page_config(
@@ -16,17 +25,21 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# No-op when started through run.py; otherwise warms caches for later sessions
+start_warmup()
+
 # Initialize session state - fixed light theme
 if 'theme_mode' not in st.session_state:
     st.session_state.theme_mode = 'light'
 if 'selected_language' not in st.session_state:
     st.session_state.selected_language = 'English'
-if 'user_contributions' not in st.session_state:
-    st.session_state.user_contributions = []
 
 # Apply ChatGPT-style theming
 apply_chatgpt_theme(st.session_state.theme_mode)
 
+# Keep this session's state size in the worker's memory accounting
+update_session_accounting()
+
 # Sidebar configuration
 with st.sidebar:
     # Language selection at top
@@ -173,102 +186,28 @@ internship_progress = stats.get('internship_progress', {})
 
 # Internship Progress Section
 st.markdown("### 🎯 Summer of AI 2025 - Corpus Collection Progress")
-progress_col1, progress_col2 = st.columns(2)
-
-with progress_col1:
-    audio_video_hours = internship_progress.get('audio_video_hours', 0)
-    audio_video_progress = internship_progress.get('audio_video_progress', 0)
-    st.markdown(f"""
-    <div style="
-        background-color: #E8F5E8;
-        padding: 1.5rem;
-        border-radius: 10px;
-        text-align: center;
-        border: 2px solid #4CAF50;
-        margin-bottom: 1rem;
-    ">
-        <h3 style="margin: 0; color: #2E7D32; font-size: 0.9rem; font-weight: normal;">🎙️ Audio & Video Hours</h3>
-        <h1 style="margin: 0.5rem 0 0 0; color: #1B5E20; font-size: 2rem; font-weight: bold;">{audio_video_hours} / 80</h1>
-        <div style="background-color: #C8E6C9; border-radius: 10px; margin-top: 0.5rem;">
-            <div style="background-color: #4CAF50; height: 8px; border-radius: 10px; width: {audio_video_progress}%;"></div>
-        </div>
-        <small style="color: #2E7D32;">{audio_video_progress:.1f}% Complete</small>
-    </div>
-    """, unsafe_allow_html=True)
-
-with progress_col2:
-    image_text_records = internship_progress.get('image_text_records', 0)
-    image_text_progress = internship_progress.get('image_text_progress', 0)
-    st.markdown(f"""
-    <div style="
-        background-color: #E3F2FD;
-        padding: 1.5rem;
-        border-radius: 10px;
-        text-align: center;
-        border: 2px solid #2196F3;
-        margin-bottom: 1rem;
-    ">
-        <h3 style="margin: 0; color: #1976D2; font-size: 0.9rem; font-weight: normal;">📝 Images & Text Records</h3>
-        <h1 style="margin: 0.5rem 0 0 0; color: #0D47A1; font-size: 2rem; font-weight: bold;">{image_text_records} / 800</h1>
-        <div style="background-color: #BBDEFB; border-radius: 10px; margin-top: 0.5rem;">
-            <div style="background-color: #2196F3; height: 8px; border-radius: 10px; width: {image_text_progress}%;"></div>
-        </div>
-        <small style="color: #1976D2;">{image_text_progress:.1f}% Complete</small>
-    </div>
-    """, unsafe_allow_html=True)
+audio_video_hours = internship_progress.get('audio_video_hours', 0)
+audio_video_progress = internship_progress.get('audio_video_progress', 0)
+image_text_records = internship_progress.get('image_text_records', 0)
+image_text_progress = internship_progress.get('image_text_progress', 0)
+show_card_grid([
+    stat_card("🎙️ Audio & Video Hours", f"{audio_video_hours} / 80", tone='green', compact=True,
+              progress=audio_video_progress, caption=f"{audio_video_progress:.1f}% Complete"),
+    stat_card("📝 Images & Text Records", f"{image_text_records} / 800", tone='blue', compact=True,
+              progress=image_text_progress, caption=f"{image_text_progress:.1f}% Complete")
+], columns=2)
 
 # Traditional Statistics section
 st.markdown("### 📊 Content Overview")
-col1, col2, col3 = st.columns(3)
-data = load_corpus_data()
-
-with col1:
-    voice_count = len([item for item in data if item.get('type') == 'voice_story'])
-    st.markdown(f"""
-    <div style="
-        background-color: #F8F9FA;
-        padding: 1.5rem;
-        border-radius: 10px;
-        text-align: center;
-        border: 1px solid #E9ECEF;
-        margin-bottom: 1rem;
-    ">
-        <h3 style="margin: 0; color: #6C757D; font-size: 0.9rem; font-weight: normal;">Voice Stories</h3>
-        <h1 style="margin: 0.5rem 0 0 0; color: #495057; font-size: 2.5rem; font-weight: bold;">{voice_count}</h1>
-    </div>
-    """, unsafe_allow_html=True)
-
-with col2:
-    video_count = len([item for item in data if item.get('type') == 'video_tradition'])
-    st.markdown(f"""
-    <div style="
-        background-color: #F8F9FA;
-        padding: 1.5rem;
-        border-radius: 10px;
-        text-align: center;
-        border: 1px solid #E9ECEF;
-        margin-bottom: 1rem;
-    ">
-        <h3 style="margin: 0; color: #6C757D; font-size: 0.9rem; font-weight: normal;">Video Traditions</h3>
-        <h1 style="margin: 0.5rem 0 0 0; color: #495057; font-size: 2.5rem; font-weight: bold;">{video_count}</h1>
-    </div>
-    """, unsafe_allow_html=True)
-
-with col3:
-    event_count = len([item for item in data if item.get('category') in ['Festivals', 'Religious Events', 'Cultural Celebrations']])
-    st.markdown(f"""
-    <div style="
-        background-color: #F8F9FA;
-        padding: 1.5rem;
-        border-radius: 10px;
-        text-align: center;
-        border: 1px solid #E9ECEF;
-        margin-bottom: 1rem;
-    ">
-        <h3 style="margin: 0; color: #6C757D; font-size: 0.9rem; font-weight: normal;">Festival Events</h3>
-        <h1 style="margin: 0.5rem 0 0 0; color: #495057; font-size: 2.5rem; font-weight: bold;">{event_count}</h1>
-    </div>
-    """, unsafe_allow_html=True)
+data = load_corpus_data(fields=['type', 'category'])
+voice_count = len([item for item in data if item.get('type') == 'voice_story'])
+video_count = len([item for item in data if item.get('type') == 'video_tradition'])
+event_count = len([item for item in data if item.get('category') in ['Festivals', 'Religious Events', 'Cultural Celebrations']])
+show_card_grid([
+    stat_card("Voice Stories", voice_count, compact=True),
+    stat_card("Video Traditions", video_count, compact=True),
+    stat_card("Festival Events", event_count, compact=True)
+], columns=3)
 
 # How to Contribute section (matching screenshot)
 st.markdown("""
@@ -333,7 +272,7 @@ with col2:
                     
                     save_user_data(user_data)
                     update_user_contributions(username)
-                    st.session_state.user_contributions.append(user_data)
+                    record_contribution(user_data)
                     st.success("✅ Thank you for your contribution!")
                     st.balloons()
                 else:
@@ -399,17 +338,42 @@ with feature_cols2[1]:
 st.markdown("---")
 st.markdown("### 📝 Recent Community Contributions")
 
-# Load and display recent corpus data
-corpus_data = load_corpus_data()
-if corpus_data:
-    recent_contributions = sorted(corpus_data, key=lambda x: x.get('timestamp', ''), reverse=True)[:5]
-    
-    for contrib in recent_contributions:
-        with st.expander(f"{contrib.get('category', 'General')} - {contrib.get('type', 'Contribution')}"):
-            st.write(contrib.get('content', ''))
-            st.caption(f"Language: {contrib.get('language', 'Unknown')} | Quality Score: {contrib.get('quality_score', 'N/A')}")
-else:
-    st.info("🌟 Be the first to contribute to our cultural knowledge base!")
+RECENT_LIMIT = 5
+RECENT_REFRESH_SECONDS = 15
+
+@st.fragment(run_every=RECENT_REFRESH_SECONDS)
+def render_recent_contributions():
+    """
+    Newest entries, kept in session state and brought up to date from the
+    change feed every RECENT_REFRESH_SECONDS, so a refresh only costs the new
+    entries.
+    """
+    recent = st.session_state.get('recent_contributions')
+    feed = changes_since(st.session_state.recent_seq) if recent is not None else None
+    # Edits and deletions may touch the entries shown; reload rather than patch them
+    if feed is None or feed['reset'] or any(change['op'] != 'add' for change in feed['changes']):
+        # Take the position first so nothing saved in between is missed
+        st.session_state.recent_seq = get_latest_sequence()
+        recent = get_recent_data(RECENT_LIMIT)
+    else:
+        new_entries = [change['entry'] for change in reversed(feed['changes']) if change['op'] == 'add']
+        seen = set()
+        recent = [
+            entry for entry in new_entries + recent
+            if entry.get('id') not in seen and not seen.add(entry.get('id'))
+        ][:RECENT_LIMIT]
+        st.session_state.recent_seq = feed['seq']
+    st.session_state.recent_contributions = recent
+
+    if recent:
+        for contrib in recent:
+            with st.expander(f"{contrib.get('category', 'General')} - {contrib.get('type', 'Contribution')}"):
+                st.write(contrib.get('content', ''))
+                st.caption(f"Language: {contrib.get('language', 'Unknown')} | Quality Score: {contrib.get('quality_score', 'N/A')}")
+    else:
+        st.info("🌟 Be the first to contribute to our cultural knowledge base!")
+
+render_recent_contributions()
 
 # Footer with corpus collection hints
 st.markdown("---")
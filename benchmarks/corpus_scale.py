@@ -0,0 +1,397 @@
+"""
+Scale benchmark for utils/data_manager.py.
+
+For each corpus size, generates a synthetic corpus (see synthetic_corpus.py)
+and times every public data_manager function against it, plus the gallery
+filter/sort/pagination path (query_corpus) and the statistics path. Each size
+runs in a fresh interpreter inside a scratch directory, so the real data/
+folder is never touched and memory figures are per size: resident memory
+after the cold load and peak resident memory for the whole run.
+
+Cases run up to --repeat times or until --op-budget seconds are spent, and
+the median is reported. Write cases (saves, updates and deletes, backup,
+compaction and duplicate cleaning) change the corpus in the scratch
+directory and run last; skip them with --no-writes. Use --json to save results and --compare to fail (exit status 1)
+when a case got slower than a saved baseline by more than --tolerance.
+
+Usage:
+    python benchmarks/corpus_scale.py --sizes 10000 100000
+    python benchmarks/corpus_scale.py --sizes 1000000 --repeat 3 --no-writes
+"""
+import argparse
+import inspect
+import json
+import os
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from synthetic_corpus import generate_corpus_file  # noqa: E402
+
+DEFAULT_WORKDIR = os.path.join(tempfile.gettempdir(), "festivevoice-bench")
+
+# Public functions with nothing worth timing, or only called on read replicas
+NOT_BENCHMARKED = {'ensure_data_directory', 'apply_replica_snapshot', 'apply_replica_changes'}
+
+# Writers saving at once in the concurrent save_user_data case
+CONCURRENT_WRITERS = 16
+
+# Absolute slowdown below which --compare ignores a case, to filter noise
+MIN_REGRESSION_MS = 1.0
+
+
+def rss_mb():
+    """Current resident memory of this process in MB."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return peak_rss_mb()
+
+
+def peak_rss_mb():
+    """Peak resident memory of this process in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+
+def case_context(dm):
+    """Contributors, ids and the original corpus that the cases refer to."""
+    contributors = sorted(dm.get_contributor_counts().items(), key=lambda item: item[1], reverse=True)
+    original = dm.load_corpus_data()
+    return {
+        'top': contributors[0][0] if contributors else "nobody",
+        'typical': contributors[len(contributors) // 2][0] if contributors else "nobody",
+        'week_ago': (datetime.now() - timedelta(days=7)).isoformat(),
+        'original': original,
+        'middle_id': original[len(original) // 2].get('id') if original else None
+    }
+
+
+def read_cases(dm, context):
+    """Reads served from the in-memory indexes."""
+    cache = dm._corpus_cache
+    top, typical, middle_id = context['top'], context['typical'], context['middle_id']
+
+    def clear_export_blob():
+        view = cache['by_contributor'].get(top)
+        if view:
+            view['export_blob'] = None
+
+    def force_reload():
+        cache['signature'] = None
+
+    return [
+        ("load_corpus_data (cold)", "read", "load_corpus_data", force_reload, dm.load_corpus_data),
+        ("load_corpus_data", "read", "load_corpus_data", None, dm.load_corpus_data),
+        ("load_corpus_data (list view fields)", "read", "load_corpus_data", None,
+         lambda: dm.load_corpus_data(fields=['type', 'title', 'category', 'region', 'recording_language'])),
+        ("get_corpus_version", "read", "get_corpus_version", None, dm.get_corpus_version),
+        ("get_corpus_metrics", "read", "get_corpus_metrics", None, dm.get_corpus_metrics),
+        ("generate_entry_id", "read", "generate_entry_id", None, dm.generate_entry_id),
+        ("get_entry_by_id", "read", "get_entry_by_id", None, lambda: dm.get_entry_by_id(middle_id)),
+        ("get_type_counts", "read", "get_type_counts", None, dm.get_type_counts),
+        ("get_region_counts", "read", "get_region_counts", None, dm.get_region_counts),
+        ("get_contributor_counts", "read", "get_contributor_counts", None, dm.get_contributor_counts),
+        ("get_contributor_count (top)", "read", "get_contributor_count", None, lambda: dm.get_contributor_count(top)),
+        ("get_contributor_summary (top)", "read", "get_contributor_summary", None, lambda: dm.get_contributor_summary(top)),
+        ("get_contributor_entries (top, recent)", "read", "get_contributor_entries", None,
+         lambda: dm.get_contributor_entries(top, sort_by='recent', limit=20)),
+        ("get_contributor_entries (typical, quality)", "read", "get_contributor_entries", None,
+         lambda: dm.get_contributor_entries(typical, sort_by='quality', limit=20)),
+        ("get_contributor_export (top, cold)", "read", "get_contributor_export", clear_export_blob,
+         lambda: dm.get_contributor_export(top)),
+        ("get_data_by_type", "read", "get_data_by_type", None, lambda: dm.get_data_by_type('voice_story')),
+        ("get_data_by_language", "read", "get_data_by_language", None, lambda: dm.get_data_by_language('English')),
+        ("get_data_by_region", "read", "get_data_by_region", None, lambda: dm.get_data_by_region('South India')),
+        ("get_data_by_festival", "read", "get_data_by_festival", None, lambda: dm.get_data_by_festival('Diwali')),
+        ("get_festival_content_summary", "read", "get_festival_content_summary", None, dm.get_festival_content_summary),
+        ("get_recent_data", "read", "get_recent_data", None, lambda: dm.get_recent_data(10)),
+        ("get_data_in_time_range (7 days)", "read", "get_data_in_time_range", None,
+         lambda: dm.get_data_in_time_range(context['week_ago'])),
+        ("search_corpus", "read", "search_corpus", None, lambda: dm.search_corpus('diwali')),
+        ("get_festival_list", "read", "get_festival_list", None, dm.get_festival_list),
+        ("export_corpus_subset", "read", "export_corpus_subset", None,
+         lambda: dm.export_corpus_subset({'types': ['voice_story', 'video_tradition'], 'min_quality': 4})),
+        ("validate_corpus_integrity", "read", "validate_corpus_integrity", None, dm.validate_corpus_integrity),
+        ("get_replication_snapshot", "read", "get_replication_snapshot", None, dm.get_replication_snapshot),
+    ]
+
+
+def gallery_cases(dm, context):
+    """Gallery filter, sort and keyset pagination, and the statistics page."""
+    cache = dm._corpus_cache
+
+    def clear_query_cache():
+        cache['query_cache'] = {}
+
+    def gallery_walk():
+        cursor = None
+        for _ in range(5):
+            result = dm.query_corpus({}, sort_by='recent', cursor=cursor, page_size=10)
+            cursor = result['next_cursor']
+        return result
+
+    return [
+        ("gallery first page", "gallery", "query_corpus", None, lambda: dm.query_corpus({}, sort_by='recent')),
+        ("gallery type filter (cold)", "gallery", "query_corpus", clear_query_cache,
+         lambda: dm.query_corpus({'type': 'voice_story'}, sort_by='quality')),
+        ("gallery type filter (cached)", "gallery", "query_corpus", None,
+         lambda: dm.query_corpus({'type': 'voice_story'}, sort_by='quality')),
+        ("gallery type+region filter (cold)", "gallery", "query_corpus", clear_query_cache,
+         lambda: dm.query_corpus({'type': 'video_tradition', 'region': 'South India'}, sort_by='recent')),
+        ("gallery contributor filter (cold)", "gallery", "query_corpus", clear_query_cache,
+         lambda: dm.query_corpus({'contributor': context['top']}, sort_by='contributor')),
+        ("gallery search (cold)", "gallery", "query_corpus", clear_query_cache,
+         lambda: dm.query_corpus({'search': 'diwali'}, sort_by='recent')),
+        ("gallery pages 1-5", "gallery", "query_corpus", None, gallery_walk),
+
+        ("get_corpus_statistics", "statistics", "get_corpus_statistics", None, dm.get_corpus_statistics),
+    ]
+
+
+def write_cases(dm, context):
+    """Saves rewrite the corpus, updates and deletes append to the journal; then the change feed."""
+    original, middle_id = context['original'], context['middle_id']
+    state = {}
+    lock = threading.Lock()
+
+    def restore_original():
+        # Duplicate cleaning removes what it finds; put the duplicates back
+        if dm.get_corpus_metrics()['entries'] != len(original):
+            dm.save_corpus_data(original)
+
+    def save_one():
+        with lock:
+            state['serial'] = state.get('serial', 0) + 1
+            serial = state['serial']
+        return dm.save_user_data({
+            'type': 'cultural_fact',
+            'content': f"Benchmark fact {serial}",
+            'category': 'Festivals',
+            'language': 'English',
+            'quality_score': 4,
+            'contributor': context['top']
+        })
+
+    def newest_ids(count):
+        return [entry['id'] for entry in dm.get_recent_data(count)]
+
+    def journal_one_update():
+        dm.update_entry(middle_id, {'quality_score': 4})
+
+    def save_concurrently():
+        writers = [threading.Thread(target=save_one) for _ in range(CONCURRENT_WRITERS)]
+        for writer in writers:
+            writer.start()
+        for writer in writers:
+            writer.join()
+
+    return [
+        ("save_user_data", "write", "save_user_data", None, save_one),
+        (f"save_user_data ({CONCURRENT_WRITERS} concurrent)", "write", "save_user_data", None, save_concurrently),
+        ("backup_corpus_data (full)", "write", "backup_corpus_data", None, lambda: dm.backup_corpus_data(full=True)),
+        ("backup_corpus_data (1 change)", "write", "backup_corpus_data", save_one, dm.backup_corpus_data),
+        ("save_corpus_data", "write", "save_corpus_data", None, lambda: dm.save_corpus_data(dm.load_corpus_data())),
+        ("update_entry", "write", "update_entry", None, lambda: dm.update_entry(middle_id, {'quality_score': 5})),
+        ("delete_entry (newest)", "write", "delete_entry", None, lambda: dm.delete_entry(newest_ids(1)[0])),
+        ("delete_entries (10 newest)", "write", "delete_entries", None, lambda: dm.delete_entries(newest_ids(10))),
+        ("compact_corpus (1 update)", "write", "compact_corpus", journal_one_update, dm.compact_corpus),
+        ("clean_duplicate_entries", "write", "clean_duplicate_entries", restore_original, dm.clean_duplicate_entries),
+
+        # Change feed, read after the writes above have logged changes
+        ("get_latest_sequence", "write", "get_latest_sequence", None, dm.get_latest_sequence),
+        ("changes_since (last 20)", "write", "changes_since", None,
+         lambda: dm.changes_since(max(0, dm.get_latest_sequence() - 20))),
+    ]
+
+
+def build_cases(dm):
+    """(name, group, function name, setup, call) for every case, writes last."""
+    context = case_context(dm)
+    return read_cases(dm, context) + gallery_cases(dm, context) + write_cases(dm, context)
+
+
+def run_scale(size, repeat, op_budget, writes):
+    """Time every case against the corpus in ./data. Runs inside the child interpreter."""
+    import contextlib
+    import io
+
+    from utils import data_manager as dm
+
+    file_mb = os.path.getsize(dm.DATA_FILE) / 1024 / 1024
+    baseline_rss = rss_mb()
+    start = time.perf_counter()
+    dm.load_corpus_data()
+    load_ms = (time.perf_counter() - start) * 1000
+    loaded_rss = rss_mb()
+
+    public = {
+        name for name, member in inspect.getmembers(dm, inspect.isfunction)
+        if not name.startswith('_') and member.__module__ == dm.__name__
+    }
+    cases = build_cases(dm)
+    results = {}
+    for name, group, function, setup, call in cases:
+        if group == "write" and not writes:
+            continue
+        times = []
+        budget_end = time.perf_counter() + op_budget
+        while len(times) < repeat and (not times or time.perf_counter() < budget_end):
+            if setup:
+                setup()
+            # Write helpers print progress; keep the child's stdout for results
+            with contextlib.redirect_stdout(io.StringIO()):
+                start = time.perf_counter()
+                call()
+                times.append((time.perf_counter() - start) * 1000)
+        results[name] = {
+            'group': group,
+            'function': function,
+            'runs': len(times),
+            'median_ms': statistics.median(times),
+            'min_ms': min(times)
+        }
+
+    covered = {function for _, _, function, _, _ in cases}
+    print(json.dumps({
+        'size': size,
+        'cases': results,
+        'memory': {
+            'file_mb': file_mb,
+            'initial_load_ms': load_ms,
+            'baseline_rss_mb': baseline_rss,
+            'loaded_rss_mb': loaded_rss,
+            'corpus_rss_mb': loaded_rss - baseline_rss,
+            'peak_rss_mb': peak_rss_mb()
+        },
+        'not_benchmarked': sorted(public - covered - NOT_BENCHMARKED)
+    }))
+
+
+def prepare_corpus(size, seed, workdir):
+    """Generate (or reuse) the corpus for a size and copy it into a fresh run directory."""
+    source = os.path.join(workdir, f"corpus_{size}_seed{seed}.json")
+    if not os.path.exists(source):
+        print(f"Generating {size} entries...", flush=True)
+        generate_corpus_file(source, size, seed=seed)
+
+    run_dir = os.path.join(workdir, f"run_{size}")
+    shutil.rmtree(run_dir, ignore_errors=True)
+    os.makedirs(os.path.join(run_dir, "data"))
+    shutil.copyfile(source, os.path.join(run_dir, "data", "corpus_data.json"))
+    return run_dir
+
+
+def run_child(size, run_dir, args):
+    """Benchmark one size in a fresh interpreter."""
+    command = [
+        sys.executable, os.path.abspath(__file__), "--run-scale", str(size),
+        "--repeat", str(args.repeat), "--op-budget", str(args.op_budget)
+    ]
+    if not args.writes:
+        command.append("--no-writes")
+    output = subprocess.run(command, cwd=run_dir, capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def print_scale(result):
+    memory = result['memory']
+    print(f"\n== {result['size']:,} entries "
+          f"(file {memory['file_mb']:.1f} MB, first load {memory['initial_load_ms']:.0f} ms, "
+          f"corpus in memory {memory['corpus_rss_mb']:.0f} MB, peak RSS {memory['peak_rss_mb']:.0f} MB)")
+    print(f"{'case':<45} {'group':<10} {'runs':>5} {'median_ms':>11} {'min_ms':>10}")
+    for name, case in result['cases'].items():
+        print(f"{name:<45} {case['group']:<10} {case['runs']:>5} {case['median_ms']:>11.3f} {case['min_ms']:>10.3f}")
+    if result['not_benchmarked']:
+        print(f"Public functions without a case: {', '.join(result['not_benchmarked'])}")
+
+
+def print_scaling(results):
+    """Median per case at every size, side by side."""
+    sizes = list(results)
+    print(f"\n{'case':<45}" + "".join(f" {int(size):>12,}" for size in sizes))
+    names = list(dict.fromkeys(name for result in results.values() for name in result['cases']))
+    for name in names:
+        row = ""
+        for size in sizes:
+            case = results[size]['cases'].get(name)
+            row += f" {case['median_ms']:>10.2f}ms" if case else f" {'-':>12}"
+        print(f"{name:<45}{row}")
+    row = "".join(f" {results[size]['memory']['peak_rss_mb']:>10.0f}MB" for size in sizes)
+    print(f"{'peak RSS':<45}{row}")
+
+
+def compare(results, baseline_path, tolerance):
+    """Cases slower than the baseline by more than tolerance, as printable lines."""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)
+    regressions = []
+    for size, result in results.items():
+        for name, case in result['cases'].items():
+            before = baseline.get(size, {}).get('cases', {}).get(name)
+            if not before:
+                continue
+            slower = case['median_ms'] - before['median_ms']
+            if slower > MIN_REGRESSION_MS and case['median_ms'] > before['median_ms'] * (1 + tolerance):
+                regressions.append(
+                    f"{int(size):,} entries, {name}: {before['median_ms']:.2f}ms -> {case['median_ms']:.2f}ms"
+                )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000], help="Corpus sizes to test")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per case (median is reported)")
+    parser.add_argument("--op-budget", type=float, default=3.0, help="Stop repeating a case after this many seconds")
+    parser.add_argument("--no-writes", dest="writes", action="store_false", help="Skip the write cases")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the synthetic corpora")
+    parser.add_argument("--workdir", default=DEFAULT_WORKDIR, help="Where corpora and run directories are kept")
+    parser.add_argument("--json", dest="json_path", help="Write results to this file")
+    parser.add_argument("--compare", help="Baseline results from --json to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown against the baseline")
+    parser.add_argument("--run-scale", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_scale:
+        run_scale(args.run_scale, args.repeat, args.op_budget, args.writes)
+        return
+
+    results = {}
+    for size in args.sizes:
+        run_dir = prepare_corpus(size, args.seed, args.workdir)
+        results[str(size)] = run_child(size, run_dir, args)
+        shutil.rmtree(run_dir, ignore_errors=True)
+        print_scale(results[str(size)])
+
+    if len(results) > 1:
+        print_scaling(results)
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.tolerance)
+        if regressions:
+            print(f"\nSlower than {args.compare} by more than {args.tolerance:.0%}:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,387 @@
+"""
+Load test for one app worker.
+
+Simulates concurrent browser sessions against a single process using
+Streamlit's headless AppTest runner. Each session is a thread with its own
+session state, logged in as one of the synthetic contributors, which runs the
+page scripts the way the server's per-session script threads do. Sessions
+keep picking a scenario (browse the gallery, search and filter it, submit a
+cultural fact, answer a quiz question, generate an export, open My
+Contributions) with an exponential think time between actions. AI validation
+is replaced by a local mock that waits --validation-ms, standing in for the
+API round trip, and then applies the rule-based check, so no API keys are
+needed or used.
+
+Each session count runs in a fresh interpreter inside a scratch directory
+holding a synthetic corpus (see synthetic_corpus.py), so data/ is never
+touched. For every level it reports completed actions per second, the error
+rate, CPU use and latency percentiles per page and action, measured after a
+--ramp period in which sessions start one by one. Latency is the server-side
+script run; network and browser rendering are not included.
+
+Usage:
+    python benchmarks/load_sessions.py --sessions 1 5 10 20 --duration 30
+    python benchmarks/load_sessions.py --sessions 10 --entries 100000 --json load.json
+"""
+import argparse
+import collections
+import contextlib
+import io
+import json
+import os
+import random
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from corpus_scale import DEFAULT_WORKDIR, peak_rss_mb, prepare_corpus  # noqa: E402
+
+PAGES = {
+    'home': "app.py",
+    'gallery': os.path.join("pages", "5_Community_Gallery.py"),
+    'quiz': os.path.join("pages", "4_🧠_Cultural_Quiz.py"),
+    'export': os.path.join("pages", "5_📊_Data_Export.py"),
+    'contributions': os.path.join("pages", "7_My_Contributions.py"),
+}
+
+# Share of scenarios picked by a session
+SCENARIO_WEIGHTS = {
+    'gallery_browse': 0.30,
+    'gallery_search': 0.20,
+    'contributions': 0.15,
+    'quiz': 0.15,
+    'submit_fact': 0.10,
+    'export': 0.10,
+}
+
+SEARCH_TERMS = ["diwali", "holi", "festival", "story", "temple", "dance", "harvest", "lamp"]
+CONTENT_TYPES = ["Voice Stories", "Video Traditions", "Festival Events", "Cultural Stories"]
+FACT_CATEGORIES = ["Festivals", "Religious Events", "Food Culture", "Regional Customs"]
+
+# Distinct error messages kept per level
+ERROR_SAMPLES = 5
+
+
+def mock_validation(validation_ms):
+    """Replace AI validation with a local stand-in that always accepts."""
+    from utils import ai_validation
+
+    def validate_content(content, content_type):
+        time.sleep(validation_ms / 1000)
+        result = ai_validation.basic_validation(content, content_type)
+        result.update(is_valid=True, validation_method='mock')
+        return result
+
+    # Pages import validate_content on every run, so they pick this up
+    ai_validation.validate_content = validate_content
+
+
+def share_runtime():
+    """
+    Let concurrent sessions share one runtime and script cache, as they do
+    in the server. AppTest installs a stand-in runtime for each run and
+    removes it when the run ends, which would pull it from under other
+    sessions' runs in flight, and recompiles the page on every run.
+    """
+    from streamlit import config
+    from streamlit.runtime import Runtime
+    from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+    from streamlit.testing.v1 import app_test
+
+    script_cache = ScriptCache()
+    app_test.ScriptCache = lambda: script_cache
+
+    last = {}
+
+    def instance(cls):
+        if cls._instance is not None:
+            last['runtime'] = cls._instance
+        if 'runtime' not in last:
+            raise RuntimeError("Runtime hasn't been created!")
+        return last['runtime']
+
+    Runtime.instance = classmethod(instance)
+    Runtime.exists = classmethod(lambda cls: cls._instance is not None or 'runtime' in last)
+    # AppTest also turns this on only for the length of each run
+    config.set_option("global.appTest", True)
+
+
+def find_button(at, label):
+    for button in at.button:
+        if button.label == label:
+            return button
+    raise LookupError(f"no button {label!r}")
+
+
+class Session:
+    """One simulated browser session: an AppTest per page sharing a login."""
+
+    def __init__(self, index, contributors, seed, timeout, record):
+        self.rng = random.Random(seed * 1000 + index)
+        self.username = f"user_{index % contributors:05d}"
+        self.timeout = timeout
+        self.record = record
+        self.apps = {}
+
+    def app(self, page):
+        """The session's AppTest for a page, opening the page on first use."""
+        from streamlit.testing.v1 import AppTest
+
+        at = self.apps.get(page)
+        if at is None:
+            at = AppTest.from_file(os.path.join(ROOT, PAGES[page]), default_timeout=self.timeout)
+            at.session_state['authenticated_user'] = {
+                'username': self.username,
+                'email': f"{self.username}@example.com",
+                'region': "Pan-India",
+                'role': 'user'
+            }
+            self.apps[page] = at
+            self.step(page, "open", at.run)
+        return at
+
+    def step(self, page, action, run):
+        """Run one script rerun and record its latency and outcome."""
+        started = time.perf_counter()
+        error = None
+        try:
+            at = run()
+            if at.exception:
+                error = at.exception[0].value
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        self.record(page, action, started, (time.perf_counter() - started) * 1000, error)
+
+    def gallery_browse(self):
+        at = self.app('gallery')
+        self.step('gallery', "view", at.run)
+        for _ in range(self.rng.randint(1, 3)):
+            try:
+                button = find_button(at, "Next →")
+            except LookupError:
+                break
+            if button.disabled:
+                break
+            self.step('gallery', "next page", button.click().run)
+
+    def gallery_search(self):
+        at = self.app('gallery')
+        self.step('gallery', "search", at.text_input[0].input(self.rng.choice(SEARCH_TERMS)).run)
+        content_type = next(box for box in at.selectbox if box.label == "Content Type:")
+        self.step('gallery', "filter", content_type.select(self.rng.choice(CONTENT_TYPES)).run)
+
+    def contributions(self):
+        at = self.app('contributions')
+        self.step('contributions', "view", at.run)
+
+    def quiz(self):
+        at = self.app('quiz')
+        category = at.selectbox[0].value
+
+        def answer():
+            choices = next(radio for radio in at.radio if radio.label == "Choose your answer:")
+            choices.set_value(self.rng.randrange(len(choices.options)))
+            return find_button(at, "Submit Answer").click().run()
+
+        self.step('quiz', "start", find_button(at, f"Start {category} Quiz").click().run)
+        self.step('quiz', "answer", answer)
+
+    def submit_fact(self):
+        at = self.app('home')
+
+        def submit():
+            at.text_area(key="quick_fact").input(
+                f"During the festival, families in {self.username}'s town light lamps because "
+                f"the tradition marks the harvest ({self.rng.random():.6f})."
+            )
+            category = next(box for box in at.selectbox if box.label == "Category:")
+            category.select(self.rng.choice(FACT_CATEGORIES))
+            return find_button(at, "Submit Fact").click().run()
+
+        self.step('home', "submit fact", submit)
+
+    def export(self):
+        at = self.app('export')
+        self.step('export', "generate", find_button(at, "🔽 Generate Export File").click().run)
+
+    def run(self, stop_at, think_ms):
+        scenarios = list(SCENARIO_WEIGHTS)
+        weights = list(SCENARIO_WEIGHTS.values())
+        while time.perf_counter() < stop_at:
+            name = self.rng.choices(scenarios, weights)[0]
+            try:
+                getattr(self, name)()
+            except Exception as e:
+                # A widget the scenario needs was missing after an earlier step failed
+                self.record(name, "scenario", time.perf_counter(), 0.0, f"{type(e).__name__}: {e}")
+            if think_ms:
+                pause = min(self.rng.expovariate(1000 / think_ms), stop_at - time.perf_counter())
+                time.sleep(max(pause, 0))
+
+
+def percentiles(times):
+    if len(times) < 2:
+        return {'p50_ms': times[0], 'p95_ms': times[0], 'p99_ms': times[0]}
+    cuts = statistics.quantiles(times, n=100, method='inclusive')
+    return {'p50_ms': cuts[49], 'p95_ms': cuts[94], 'p99_ms': cuts[98]}
+
+
+def run_load(sessions, duration, ramp, think_ms, validation_ms, timeout, contributors, seed):
+    """Drive the sessions and print the results as JSON. Runs inside the child interpreter."""
+    mock_validation(validation_ms)
+    share_runtime()
+
+    lock = threading.Lock()
+    records = []
+
+    def record(page, action, started, ms, error):
+        with lock:
+            records.append((page, action, started, ms, error))
+
+    start = time.perf_counter()
+    measure_from = start + ramp
+    stop_at = measure_from + duration
+    cpu_before = resource.getrusage(resource.RUSAGE_SELF)
+
+    def session_thread(index):
+        time.sleep(ramp * index / sessions)
+        Session(index, contributors, seed, timeout, record).run(stop_at, think_ms)
+
+    threads = [
+        threading.Thread(target=session_thread, args=(index,), name=f"session-{index}", daemon=True)
+        for index in range(sessions)
+    ]
+    # Page scripts and the data layer print progress; keep stdout for the results
+    with contextlib.redirect_stdout(io.StringIO()):
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    elapsed = time.perf_counter() - start
+    cpu_after = resource.getrusage(resource.RUSAGE_SELF)
+    cpu_seconds = (cpu_after.ru_utime - cpu_before.ru_utime) + (cpu_after.ru_stime - cpu_before.ru_stime)
+
+    # Only actions that started after the ramp count
+    measured = [r for r in records if r[2] >= measure_from]
+    window = max(stop_at, max((r[2] + r[3] / 1000 for r in measured), default=stop_at)) - measure_from
+    groups = collections.defaultdict(list)
+    errors = collections.Counter()
+    error_counts = collections.Counter()
+    for page, action, _, ms, error in measured:
+        groups[(page, action)].append(ms)
+        if error:
+            errors[(page, action)] += 1
+            error_counts[str(error).splitlines()[0][:200]] += 1
+
+    actions = {}
+    for (page, action), times in sorted(groups.items()):
+        actions[f"{page}: {action}"] = {
+            'count': len(times),
+            'errors': errors[(page, action)],
+            'mean_ms': statistics.fmean(times),
+            'max_ms': max(times),
+            **percentiles(times)
+        }
+
+    all_times = [r[3] for r in measured] or [0.0]
+    print(json.dumps({
+        'sessions': sessions,
+        'window_s': window,
+        'actions': len(measured),
+        'throughput': len(measured) / window if window else 0.0,
+        'errors': sum(errors.values()),
+        'error_rate': sum(errors.values()) / len(measured) if measured else 0.0,
+        'error_samples': [message for message, _ in error_counts.most_common(ERROR_SAMPLES)],
+        'latency': percentiles(all_times),
+        'cpu_percent': 100 * cpu_seconds / elapsed,
+        'peak_rss_mb': peak_rss_mb(),
+        'by_action': actions
+    }))
+
+
+def run_child(sessions, run_dir, args):
+    """Load one session count in a fresh interpreter."""
+    command = [
+        sys.executable, os.path.abspath(__file__), "--run-load", str(sessions),
+        "--duration", str(args.duration), "--ramp", str(args.ramp), "--think-ms", str(args.think_ms),
+        "--validation-ms", str(args.validation_ms), "--timeout", str(args.timeout),
+        "--entries", str(args.entries), "--seed", str(args.seed)
+    ]
+    output = subprocess.run(command, cwd=run_dir, capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def print_level(result):
+    latency = result['latency']
+    print(f"\n== {result['sessions']} sessions: {result['throughput']:.1f} actions/s, "
+          f"p50 {latency['p50_ms']:.0f} ms, p95 {latency['p95_ms']:.0f} ms, "
+          f"errors {result['error_rate']:.1%}, CPU {result['cpu_percent']:.0f}%, "
+          f"peak RSS {result['peak_rss_mb']:.0f} MB")
+    print(f"{'page: action':<30} {'count':>6} {'errors':>7} {'p50_ms':>9} {'p95_ms':>9} {'p99_ms':>9} {'max_ms':>9}")
+    for name, action in result['by_action'].items():
+        print(f"{name:<30} {action['count']:>6} {action['errors']:>7} {action['p50_ms']:>9.1f} "
+              f"{action['p95_ms']:>9.1f} {action['p99_ms']:>9.1f} {action['max_ms']:>9.1f}")
+    for message in result['error_samples']:
+        print(f"  error: {message}")
+
+
+def print_capacity(results):
+    """One line per session count, for finding where latency or errors take off."""
+    print(f"\n{'sessions':>8} {'actions/s':>10} {'p50_ms':>9} {'p95_ms':>9} {'p99_ms':>9} {'errors':>8} {'cpu':>6}")
+    for result in results:
+        latency = result['latency']
+        print(f"{result['sessions']:>8} {result['throughput']:>10.1f} {latency['p50_ms']:>9.1f} "
+              f"{latency['p95_ms']:>9.1f} {latency['p99_ms']:>9.1f} {result['error_rate']:>8.1%} "
+              f"{result['cpu_percent']:>5.0f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 5, 10], help="Concurrent session counts to test")
+    parser.add_argument("--duration", type=float, default=30.0, help="Measured seconds per session count")
+    parser.add_argument("--ramp", type=float, default=5.0, help="Seconds over which sessions start, not measured")
+    parser.add_argument("--think-ms", type=float, default=1000.0, help="Mean pause between a session's actions")
+    parser.add_argument("--validation-ms", type=float, default=800.0, help="Latency of the mocked AI validation")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Seconds before a script run counts as failed")
+    parser.add_argument("--entries", type=int, default=10000, help="Synthetic corpus size")
+    parser.add_argument("--contributors", type=int, default=None, help=argparse.SUPPRESS)
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the corpus and the sessions")
+    parser.add_argument("--workdir", default=DEFAULT_WORKDIR, help="Where corpora and run directories are kept")
+    parser.add_argument("--json", dest="json_path", help="Write results to this file")
+    parser.add_argument("--run-load", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_load:
+        # Synthetic contributors are user_00000 up to entries/50, as in synthetic_corpus.py
+        contributors = args.contributors or max(10, args.entries // 50)
+        run_load(args.run_load, args.duration, args.ramp, args.think_ms, args.validation_ms,
+                 args.timeout, contributors, args.seed)
+        return
+
+    results = []
+    for sessions in args.sessions:
+        run_dir = prepare_corpus(args.entries, args.seed, args.workdir)
+        with open(os.path.join(run_dir, "data", "users.json"), "w", encoding="utf-8") as f:
+            json.dump({}, f)
+        print(f"Running {sessions} sessions for {args.ramp + args.duration:.0f}s...", flush=True)
+        results.append(run_child(sessions, run_dir, args))
+        shutil.rmtree(run_dir, ignore_errors=True)
+        print_level(results[-1])
+
+    if len(results) > 1:
+        print_capacity(results)
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+"""
+Benchmark for choosing scrypt cost parameters.
+
+Simulates a burst of concurrent logins against the password hashing pool and
+reports login latency percentiles for each candidate cost. The strongest
+setting whose p95 latency stays within the SLO is the one to deploy via
+FESTIVEVOICE_SCRYPT_N / _R / _P and FESTIVEVOICE_HASH_WORKERS.
+
+Usage:
+    python benchmarks/password_hashing.py --concurrency 20 --slo-ms 250
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import password_hashing  # noqa: E402
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers."""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def run_burst(stored_hash, concurrency, rounds):
+    """Verify the same password from `concurrency` threads, `rounds` times each."""
+    def login():
+        start = time.perf_counter()
+        password_hashing.verify_password("benchmark-password", stored_hash)
+        return (time.perf_counter() - start) * 1000
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = [executor.submit(login) for _ in range(concurrency * rounds)]
+        return [f.result() for f in futures]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=10, help="Peak concurrent logins")
+    parser.add_argument("--rounds", type=int, default=3, help="Logins per simulated user")
+    parser.add_argument("--slo-ms", type=float, default=250.0, help="p95 login latency target")
+    parser.add_argument("--workers", type=int, default=password_hashing.HASH_POOL_WORKERS,
+                        help="Hashing pool size (0 = inline)")
+    parser.add_argument("--n", type=int, nargs="+", default=[2 ** 13, 2 ** 14, 2 ** 15, 2 ** 16],
+                        help="scrypt N values to try")
+    parser.add_argument("--r", type=int, default=password_hashing.SCRYPT_R)
+    parser.add_argument("--p", type=int, default=password_hashing.SCRYPT_P)
+    args = parser.parse_args()
+
+    password_hashing.configure_hash_pool(args.workers)
+    # Start the workers before timing so spawn cost is not counted
+    password_hashing.hash_password("warmup", {'n': 2 ** 10, 'r': 8, 'p': 1})
+
+    print(f"workers={args.workers} concurrency={args.concurrency} slo_p95={args.slo_ms:.0f}ms")
+    print(f"{'n':>8} {'r':>3} {'p':>3} {'mem_mb':>7} {'p50_ms':>8} {'p95_ms':>8} {'p99_ms':>8} {'logins/s':>9}  slo")
+
+    best = None
+    for n in args.n:
+        params = {'n': n, 'r': args.r, 'p': args.p}
+        stored_hash = password_hashing.hash_password("benchmark-password", params)
+
+        start = time.perf_counter()
+        latencies = run_burst(stored_hash, args.concurrency, args.rounds)
+        elapsed = time.perf_counter() - start
+
+        p95 = percentile(latencies, 95)
+        meets_slo = p95 <= args.slo_ms
+        if meets_slo:
+            best = params
+        mem_mb = 128 * args.r * n / (1024 * 1024)
+        print(f"{n:>8} {args.r:>3} {args.p:>3} {mem_mb:>7.1f} {percentile(latencies, 50):>8.1f} "
+              f"{p95:>8.1f} {percentile(latencies, 99):>8.1f} {len(latencies) / elapsed:>9.1f}  "
+              f"{'ok' if meets_slo else 'MISS'}")
+
+    password_hashing.shutdown_hash_pool()
+
+    if best:
+        print(f"\nRecommended: FESTIVEVOICE_SCRYPT_N={best['n']} FESTIVEVOICE_SCRYPT_R={best['r']} "
+              f"FESTIVEVOICE_SCRYPT_P={best['p']} FESTIVEVOICE_HASH_WORKERS={args.workers}")
+    else:
+        print("\nNo candidate met the SLO; add hashing workers or lower N.")
+
+
+if __name__ == "__main__":
+    main()
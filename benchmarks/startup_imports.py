@@ -0,0 +1,98 @@
+"""
+Benchmark for page cold-start import time.
+
+Runs the top-level imports of app.py and each page in a fresh interpreter,
+the way a cold worker would on its first run of that page, and reports the
+median time and which heavy dependencies were loaded. Use --budget-ms to
+fail (exit status 1) when any page goes over its import-time budget, and
+--json to save results for comparison between commits.
+
+Usage:
+    python benchmarks/startup_imports.py --runs 5 --budget-ms 1500
+"""
+import argparse
+import ast
+import glob
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ["pandas", "numpy", "openai", "anthropic"]
+
+
+def page_scripts():
+    """app.py followed by every page, in sidebar order."""
+    return ["app.py"] + sorted(os.path.relpath(p, ROOT) for p in glob.glob(os.path.join(ROOT, "pages", "*.py")))
+
+
+def measure(script):
+    """Time the top-level imports of one script. Runs inside the child interpreter."""
+    sys.path.insert(0, ROOT)
+    os.chdir(ROOT)
+
+    with open(script, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=script)
+    imports = ast.Module(
+        body=[node for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))],
+        type_ignores=[]
+    )
+    code = compile(imports, script, "exec")
+
+    start = time.perf_counter()
+    exec(code, {"__name__": "__page__"})
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    print(json.dumps({
+        "ms": elapsed_ms,
+        "heavy": [name for name in HEAVY_MODULES if name in sys.modules]
+    }))
+
+
+def run_child(script):
+    """Measure one script in a fresh interpreter."""
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--measure", script],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3, help="Cold starts per page (median is reported)")
+    parser.add_argument("--budget-ms", type=float, default=None, help="Fail if any page's median exceeds this")
+    parser.add_argument("--json", dest="json_path", help="Write results to this file")
+    parser.add_argument("--measure", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        measure(args.measure)
+        return
+
+    print(f"{'page':<40} {'median_ms':>10} {'min_ms':>8}  heavy modules loaded")
+    results = {}
+    over_budget = []
+    for script in page_scripts():
+        samples = [run_child(script) for _ in range(args.runs)]
+        times = [s["ms"] for s in samples]
+        median = statistics.median(times)
+        results[script] = {"median_ms": median, "min_ms": min(times), "heavy": samples[-1]["heavy"]}
+        if args.budget_ms is not None and median > args.budget_ms:
+            over_budget.append(script)
+        print(f"{script:<40} {median:>10.1f} {min(times):>8.1f}  {', '.join(samples[-1]['heavy']) or '-'}")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+
+    if over_budget:
+        print(f"\nOver the {args.budget_ms:.0f}ms budget: {', '.join(over_budget)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,280 @@
+"""
+Synthetic corpus generator for scale testing.
+
+Writes a corpus_data.json of any size whose entries follow the schemas the
+pages save (voice_story, video_tradition, cultural_fact, cultural_story,
+festival_event and quiz_attempt). Categorical fields (category, region,
+languages, festival, quality score, ...) are drawn per type from the value
+distribution in a reference corpus, data/corpus_data.json by default, and
+free text is taken from its entries so text lengths stay realistic. Quiz
+attempts use the question bank in the quiz page. Contributors follow a
+Zipf-like distribution so a few active users own most entries, and
+timestamps are spread over the last --days days. Titles and content are made
+unique, except for a --duplicate-rate share of entries that resubmit an
+earlier entry's content. Entries are written as they are generated, so a
+million-entry corpus never has to fit in memory here.
+
+Usage:
+    python benchmarks/synthetic_corpus.py --entries 100000 --output /tmp/corpus_100k.json
+"""
+import argparse
+import ast
+import bisect
+import collections
+import glob
+import itertools
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REFERENCE_FILE = os.path.join(ROOT, "data", "corpus_data.json")
+
+# Share of entries per type. quiz_attempt is absent from the bundled corpus but
+# is the most frequent write once the quiz is in use.
+DEFAULT_TYPE_WEIGHTS = {
+    'cultural_fact': 0.35,
+    'quiz_attempt': 0.30,
+    'voice_story': 0.12,
+    'video_tradition': 0.10,
+    'cultural_story': 0.08,
+    'festival_event': 0.05,
+}
+
+# Fields each type saves, in the order the pages write them. Fields not listed
+# in TEXT_FIELDS are categorical and drawn from the reference distribution.
+SCHEMAS = {
+    'voice_story': [
+        'title', 'category', 'region', 'recording_language', 'description', 'significance',
+        'transcription', 'has_audio', 'audio_filename', 'festival_event', 'language'
+    ],
+    'video_tradition': [
+        'title', 'category', 'region', 'state', 'description', 'cultural_context', 'participants_info',
+        'video_filename', 'video_size_mb', 'duration', 'video_language', 'festival_event',
+        'privacy_level', 'consent_given', 'language'
+    ],
+    'cultural_fact': ['content', 'category', 'language', 'festival_event'],
+    'cultural_story': [
+        'category', 'title', 'content', 'origin', 'original_language', 'region', 'moral_lesson',
+        'audience_age', 'characters', 'setting_time', 'setting_place', 'variations',
+        'festival_event', 'user_language'
+    ],
+    'festival_event': [
+        'name', 'category', 'region', 'months', 'description', 'traditions', 'foods',
+        'significance', 'festival_event', 'language'
+    ],
+}
+
+TEXT_FIELDS = {
+    'title', 'description', 'significance', 'transcription', 'cultural_context', 'participants_info',
+    'content', 'moral_lesson', 'characters', 'setting_time', 'setting_place', 'variations',
+    'traditions', 'foods', 'origin'
+}
+
+# Types whose entries carry a validation score
+SCORED_TYPES = {'voice_story', 'video_tradition', 'cultural_fact', 'cultural_story', 'festival_event'}
+
+# Used when the reference corpus has no entries of a type
+FALLBACK_VALUES = {
+    'category': ["Folk Tale", "Traditional Practices", "Religious Festival", "Art & Music"],
+    'region': ["Pan-India", "North India", "South India", "East India", "West India", "Central India", "Northeast India"],
+    'language': ["English", "Hindi", "Telugu", "Tamil", "Bengali"],
+    'festival_event': ["Diwali", "Holi", "Durga Puja", "Navratri", "Pongal", "Onam", None],
+    'quality_score': [3, 4, 5],
+}
+
+FALLBACK_TEXT = (
+    "Families gather in the evening to light lamps, share sweets and retell the stories "
+    "their grandparents told them, keeping the tradition alive for the next generation."
+)
+
+QUIZ_PAGE_GLOB = os.path.join(ROOT, "pages", "*Cultural_Quiz.py")
+
+
+class WeightedChoice:
+    """Draw values with the frequencies they had in the reference corpus."""
+
+    def __init__(self, counter):
+        self.values = list(counter.keys())
+        self.cumulative = list(itertools.accumulate(counter.values()))
+
+    def __call__(self, rng):
+        return self.values[bisect.bisect_right(self.cumulative, rng.random() * self.cumulative[-1])]
+
+
+def load_reference(path):
+    """Per-type value counts and text samples from a reference corpus."""
+    values = collections.defaultdict(collections.Counter)
+    texts = collections.defaultdict(list)
+    try:
+        with open(path, encoding="utf-8") as f:
+            entries = json.load(f)
+    except (OSError, ValueError):
+        entries = []
+
+    for entry in entries:
+        entry_type = entry.get('type')
+        if entry_type not in SCHEMAS:
+            continue
+        for field in SCHEMAS[entry_type] + ['quality_score']:
+            value = entry.get(field)
+            if field in TEXT_FIELDS:
+                if value:
+                    texts[(entry_type, field)].append(value)
+            else:
+                values[(entry_type, field)][json.dumps(value)] += 1
+    return values, texts
+
+
+def load_quiz_questions():
+    """(category, question) pairs from the quiz page's question bank."""
+    for path in glob.glob(QUIZ_PAGE_GLOB):
+        with open(path, encoding="utf-8") as f:
+            tree = ast.parse(f.read())
+        for node in tree.body:
+            if isinstance(node, ast.Assign) and any(getattr(t, 'id', None) == 'quiz_categories' for t in node.targets):
+                categories = ast.literal_eval(node.value)
+                return [
+                    (category, question)
+                    for category, info in categories.items()
+                    for question in info['sample_questions']
+                ]
+    return [("General", {
+        "question": "Which festival is known as the festival of lights?",
+        "options": ["Holi", "Diwali", "Onam", "Pongal"],
+        "correct": 1
+    })]
+
+
+class CorpusGenerator:
+    """Build synthetic entries that look like the reference corpus."""
+
+    def __init__(self, reference=REFERENCE_FILE, seed=0, days=365, contributors=None,
+                 type_weights=None, duplicate_rate=0.01):
+        self.rng = random.Random(seed)
+        self.duplicate_rate = duplicate_rate
+        # type -> content of a recent entry, reused for resubmissions
+        self.previous_content = {}
+        self.values, self.texts = load_reference(reference)
+        self.choices = {key: WeightedChoice(counter) for key, counter in self.values.items()}
+        self.quiz_questions = load_quiz_questions()
+        self.type_choice = WeightedChoice(type_weights or DEFAULT_TYPE_WEIGHTS)
+        self.contributors = contributors
+        self.end = datetime.now()
+        self.span_seconds = days * 86400
+        self.languages = WeightedChoice(self.values.get(('cultural_fact', 'language')) or
+                                        collections.Counter({json.dumps(v): 1 for v in FALLBACK_VALUES['language']}))
+
+    def _value(self, entry_type, field):
+        choice = self.choices.get((entry_type, field))
+        if choice is not None:
+            return json.loads(choice(self.rng))
+        fallback = FALLBACK_VALUES.get(field)
+        return self.rng.choice(fallback) if fallback else None
+
+    def _text(self, entry_type, field, serial):
+        samples = self.texts.get((entry_type, field))
+        text = self.rng.choice(samples) if samples else FALLBACK_TEXT
+        # Titles and content are what search, sorting and duplicate cleaning look at
+        return f"{text} #{serial}" if field in ('title', 'name', 'content') else text
+
+    def _contributor(self):
+        # Zipf-like: contributor k is picked with weight 1/k
+        index = int(self.contributors ** self.rng.random()) - 1
+        return f"user_{min(index, self.contributors - 1):05d}"
+
+    def entry(self, serial):
+        """Generate the serial-th entry."""
+        entry_type = self.type_choice(self.rng)
+        moment = self.end - timedelta(seconds=self.rng.random() * self.span_seconds)
+
+        if entry_type == 'quiz_attempt':
+            category, question = self.rng.choice(self.quiz_questions)
+            answer = self.rng.randrange(len(question['options']))
+            entry = {
+                'type': 'quiz_attempt',
+                'category': category,
+                'question': question['question'],
+                'user_answer': question['options'][answer],
+                'correct_answer': question['options'][question['correct']],
+                'is_correct': answer == question['correct'],
+                'user_language': json.loads(self.languages(self.rng))
+            }
+        else:
+            entry = {'type': entry_type}
+            for field in SCHEMAS[entry_type]:
+                if field in TEXT_FIELDS:
+                    entry[field] = self._text(entry_type, field, serial)
+                elif field == 'name':
+                    entry[field] = self._value(entry_type, field) or self._text(entry_type, field, serial)
+                else:
+                    entry[field] = self._value(entry_type, field)
+            if 'content' in entry:
+                if entry_type in self.previous_content and self.rng.random() < self.duplicate_rate:
+                    entry['content'] = self.previous_content[entry_type]
+                self.previous_content[entry_type] = entry['content']
+
+        entry['timestamp'] = moment.isoformat()
+        if entry_type in SCORED_TYPES:
+            entry['quality_score'] = self._value(entry_type, 'quality_score') or 3
+        entry['contributor'] = self._contributor()
+        entry['id'] = f"entry_{moment.strftime('%Y%m%d_%H%M%S_%f')}_{serial:07d}"
+        return entry
+
+
+def generate_corpus_file(path, entries, seed=0, reference=REFERENCE_FILE, days=365, contributors=None,
+                         duplicate_rate=0.01):
+    """
+    Write a synthetic corpus of `entries` entries to path as a JSON list.
+
+    Returns:
+        dict: Entry counts per type
+    """
+    contributors = contributors or max(10, entries // 50)
+    generator = CorpusGenerator(
+        reference=reference, seed=seed, days=days, contributors=contributors, duplicate_rate=duplicate_rate
+    )
+    counts = collections.Counter()
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write("[\n")
+        for serial in range(entries):
+            entry = generator.entry(serial)
+            counts[entry['type']] += 1
+            if serial:
+                f.write(",\n")
+            f.write(json.dumps(entry, ensure_ascii=False))
+        f.write("\n]\n")
+    os.replace(tmp_path, path)
+    return dict(counts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, default=10000, help="Number of entries to generate")
+    parser.add_argument("--output", required=True, help="File to write")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed; the same seed gives the same entries, dated back from now")
+    parser.add_argument("--reference", default=REFERENCE_FILE, help="Corpus to take distributions and text from")
+    parser.add_argument("--days", type=int, default=365, help="Spread timestamps over this many days")
+    parser.add_argument("--contributors", type=int, default=None, help="Distinct contributors (default entries/50)")
+    parser.add_argument("--duplicate-rate", type=float, default=0.01, help="Share of entries resubmitting earlier content")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    counts = generate_corpus_file(
+        args.output, args.entries, args.seed, args.reference, args.days, args.contributors, args.duplicate_rate
+    )
+    elapsed = time.perf_counter() - start
+    size_mb = os.path.getsize(args.output) / 1024 / 1024
+    print(f"Wrote {args.entries} entries ({size_mb:.1f} MB) to {args.output} in {elapsed:.1f}s")
+    for entry_type, count in sorted(counts.items(), key=lambda item: item[1], reverse=True):
+        print(f"  {entry_type:<18} {count:>9}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,20 +1,23 @@
 import streamlit as st
 import json
 from datetime import datetime
-from utils.data_manager import save_user_data, load_corpus_data, get_festival_list
+from utils.data_manager import save_user_data, load_corpus_data, get_festival_list, get_entry_by_id
 from utils.ai_validation import validate_content
 from utils.theming import apply_chatgpt_theme
 from utils.translations import get_translations
 from utils.auth import is_logged_in, get_current_user, update_user_contributions
+from utils.session_memory import record_contribution
 import base64
+from utils.profiler import profile_page_run
+
+# Profile this run when page profiling is on
+profile_page_run()
 
 # Initialize session state
 if 'theme_mode' not in st.session_state:
     st.session_state.theme_mode = 'light'
 if 'selected_language' not in st.session_state:
     st.session_state.selected_language = 'English'
-if 'user_contributions' not in st.session_state:
-    st.session_state.user_contributions = []
 
 # Apply ChatGPT-style theming
 apply_chatgpt_theme(st.session_state.theme_mode)
@@ -156,7 +159,7 @@ with col1:
                     save_user_data(voice_story_data)
                     username = current_user.get('username') if current_user else 'unknown'
                     update_user_contributions(username)
-                    st.session_state.user_contributions.append(voice_story_data)
+                    record_contribution(voice_story_data)
                     st.success("✅ Voice story submitted successfully!")
                     st.balloons()
                     
@@ -169,7 +172,9 @@ with col2:
     st.markdown("### 📊 Voice Story Statistics")
     
     # Load and display statistics
-    data = load_corpus_data()
+    # Only the fields the statistics and story list show; the story text is
+    # fetched per story when asked for
+    data = load_corpus_data(fields=['type', 'title', 'category', 'region', 'recording_language', 'has_audio', 'audio_filename'])
     voice_stories = [item for item in data if item.get('type') == 'voice_story']
     
     st.metric("🎙️ Total Voice Stories", len(voice_stories))
@@ -231,12 +236,14 @@ if voice_stories:
                         st.markdown(f"**Category:** {story.get('category', 'Unknown')}")
                         st.markdown(f"**Region:** {story.get('region', 'Unknown')}")
                         st.markdown(f"**Language:** {story.get('recording_language', 'Unknown')}")
-                        st.markdown(f"**Description:** {story.get('description', '')}")
-                        if story.get('transcription'):
-                            st.markdown("**Story Text:**")
-                            st.write(story.get('transcription'))
-                        if story.get('significance'):
-                            st.markdown(f"**Cultural Significance:** {story.get('significance')}")
+                        if st.toggle("📖 Show story text", key=f"voice_text_{story.get('id', i + j)}"):
+                            full_story = get_entry_by_id(story.get('id')) or story
+                            st.markdown(f"**Description:** {full_story.get('description', '')}")
+                            if full_story.get('transcription'):
+                                st.markdown("**Story Text:**")
+                                st.write(full_story.get('transcription'))
+                            if full_story.get('significance'):
+                                st.markdown(f"**Cultural Significance:** {full_story.get('significance')}")
                         if story.get('has_audio'):
                             st.markdown("🎧 **Audio Recording Available**")
                             
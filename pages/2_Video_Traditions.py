@@ -1,20 +1,23 @@
 import streamlit as st
 import json
 from datetime import datetime
-from utils.data_manager import save_user_data, load_corpus_data, get_festival_list
+from utils.data_manager import save_user_data, load_corpus_data, get_festival_list, get_entry_by_id
 from utils.ai_validation import validate_content
 from utils.theming import apply_chatgpt_theme
 from utils.translations import get_translations
 from utils.auth import is_logged_in, get_current_user, update_user_contributions
+from utils.session_memory import record_contribution
 import base64
+from utils.profiler import profile_page_run
+
+# Profile this run when page profiling is on
+profile_page_run()
 
 # Initialize session state
 if 'theme_mode' not in st.session_state:
     st.session_state.theme_mode = 'light'
 if 'selected_language' not in st.session_state:
     st.session_state.selected_language = 'English'
-if 'user_contributions' not in st.session_state:
-    st.session_state.user_contributions = []
 
 # Apply ChatGPT-style theming
 apply_chatgpt_theme(st.session_state.theme_mode)
@@ -181,7 +184,7 @@ with col1:
                         save_user_data(video_tradition_data)
                         username = current_user.get('username') if current_user else 'unknown'
                         update_user_contributions(username)
-                        st.session_state.user_contributions.append(video_tradition_data)
+                        record_contribution(video_tradition_data)
                         st.success("✅ Video tradition submitted successfully!")
                         st.balloons()
                         st.info(f"📹 Video file '{video_file.name}' ({video_size_mb:.1f}MB) has been saved with your contribution.")
@@ -194,7 +197,12 @@ with col2:
     st.markdown("### 📊 Video Tradition Statistics")
     
     # Load and display statistics
-    data = load_corpus_data()
+    # Only the fields the statistics and video list show; descriptions are
+    # fetched per video when asked for
+    data = load_corpus_data(fields=[
+        'type', 'title', 'category', 'region', 'state', 'video_language', 'duration', 'cultural_context',
+        'participants_info', 'video_filename', 'video_size_mb', 'privacy_level'
+    ])
     video_traditions = [item for item in data if item.get('type') == 'video_tradition']
     
     st.metric("📹 Total Videos", len(video_traditions))
@@ -264,7 +272,9 @@ if video_traditions:
                         st.markdown(f"**Language:** {video.get('video_language', 'Unknown')}")
                         if video.get('duration'):
                             st.markdown(f"**Duration:** {video.get('duration')}")
-                        st.markdown(f"**Description:** {video.get('description', '')}")
+                        if st.toggle("📖 Show description", key=f"video_text_{video.get('id', i + j)}"):
+                            full_video = get_entry_by_id(video.get('id')) or video
+                            st.markdown(f"**Description:** {full_video.get('description', '')}")
                         if video.get('cultural_context'):
                             st.markdown(f"**Cultural Context:** {video.get('cultural_context')}")
                         if video.get('participants_info'):
@@ -6,6 +6,11 @@ from utils.data_manager import save_user_data, load_corpus_data, get_festival_li
 from utils.ai_validation import validate_content
 from utils.translations import get_translations
 from utils.auth import is_logged_in, get_current_user, update_user_contributions
+from utils.session_memory import record_contribution
+from utils.profiler import profile_page_run
+
+# Profile this run when page profiling is on
+profile_page_run()
 
 st.set_page_config(page_title="Cultural Stories", page_icon="🎭", layout="wide")
 
@@ -205,9 +210,7 @@ if st.button("📚 Submit Story") and story_title and story_content:
             save_user_data(user_data)
             username = current_user.get('username') if current_user else 'unknown'
             update_user_contributions(username)
-            if 'user_contributions' not in st.session_state:
-                st.session_state.user_contributions = []
-            st.session_state.user_contributions.append(user_data)
+            record_contribution(user_data)
             
             st.success("✅ Thank you for sharing your cultural story!")
             st.balloons()
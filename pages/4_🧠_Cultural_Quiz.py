@@ -3,9 +3,14 @@ import json
 import random
 from datetime import datetime
 from utils.theming import apply_chatgpt_theme
-from utils.data_manager import save_user_data, load_corpus_data
+from utils.data_manager import save_user_data, load_corpus_data, get_corpus_version
 from utils.ai_validation import validate_content
 from utils.translations import get_translations
+from utils.session_memory import record_contribution, get_session_contribution_counts
+from utils.profiler import profile_page_run
+
+# Profile this run when page profiling is on
+profile_page_run()
 
 st.set_page_config(page_title="Cultural Quiz", page_icon="🧠", layout="wide")
 
@@ -120,17 +125,47 @@ quiz_categories = {
 # Event background color
 event_bg_color = st.session_state.get('event_color', '#E3F2FD')
 
-# Quiz mode selection
-st.subheader("🎯 Choose Your Quiz Mode")
-
-quiz_mode = st.radio(
-    "Select how you'd like to participate:",
-    ["Take Quiz", "Contribute Questions", "View Leaderboard"],
-    horizontal=True
-)
+@st.cache_data(show_spinner=False, max_entries=1)
+def get_quiz_analytics(corpus_version):
+    """Leaderboard statistics, recomputed only when the corpus version changes."""
+    corpus_data = load_corpus_data()
+    quiz_attempts = [item for item in corpus_data if item.get('type') == 'quiz_attempt']
+    question_contributions = [item for item in corpus_data if item.get('type') == 'quiz_question_contribution']
+    
+    # Category performance
+    category_stats = {}
+    for attempt in quiz_attempts:
+        cat = attempt.get('category', 'Unknown')
+        if cat not in category_stats:
+            category_stats[cat] = {'correct': 0, 'total': 0}
+        category_stats[cat]['total'] += 1
+        if attempt.get('is_correct'):
+            category_stats[cat]['correct'] += 1
+    
+    # Quality distribution
+    quality_scores = [q.get('quality_score', 0) for q in question_contributions if q.get('quality_score')]
+    
+    # Contribution by category
+    contrib_categories = {}
+    for contrib in question_contributions:
+        cat = contrib.get('category', 'Unknown')
+        contrib_categories[cat] = contrib_categories.get(cat, 0) + 1
+    
+    return {
+        'total_attempts': len(quiz_attempts),
+        'correct_answers': len([q for q in quiz_attempts if q.get('is_correct')]),
+        'category_stats': category_stats,
+        'questions_contributed': len(question_contributions),
+        'average_quality': sum(quality_scores) / len(quality_scores) if quality_scores else None,
+        'contrib_categories': contrib_categories
+    }
 
-if quiz_mode == "Take Quiz":
-    st.markdown("---")
+@st.fragment
+def render_quiz_session():
+    """
+    Category picker, questions and answers of the quiz.
+    Runs as a fragment so answering a question only reruns this section.
+    """
     st.subheader("📝 Take the Cultural Knowledge Quiz")
     
     # Category selection for quiz
@@ -197,10 +232,11 @@ if quiz_mode == "Take Quiz":
                     'timestamp': datetime.now().isoformat()
                 }
                 save_user_data(quiz_data)
+                record_contribution(quiz_data)
                 
                 if st.session_state.quiz_questions_answered < len(questions):
                     if st.button("Next Question"):
-                        st.rerun()
+                        st.rerun(scope="fragment")
                 else:
                     st.markdown("### 🎉 Quiz Complete!")
                     score_percentage = (st.session_state.quiz_score / len(questions)) * 100
@@ -213,6 +249,19 @@ if quiz_mode == "Take Quiz":
                     else:
                         st.warning("📚 Keep exploring Indian culture!")
 
+# Quiz mode selection
+st.subheader("🎯 Choose Your Quiz Mode")
+
+quiz_mode = st.radio(
+    "Select how you'd like to participate:",
+    ["Take Quiz", "Contribute Questions", "View Leaderboard"],
+    horizontal=True
+)
+
+if quiz_mode == "Take Quiz":
+    st.markdown("---")
+    render_quiz_session()
+
 elif quiz_mode == "Contribute Questions":
     st.markdown("---")
     st.subheader("✍️ Contribute Quiz Questions")
@@ -303,9 +352,7 @@ elif quiz_mode == "Contribute Questions":
             }
             
             save_user_data(question_data)
-            if 'user_contributions' not in st.session_state:
-                st.session_state.user_contributions = []
-            st.session_state.user_contributions.append(question_data)
+            record_contribution(question_data)
             
             st.success("✅ Thank you for contributing a quiz question!")
             st.balloons()
@@ -316,58 +363,37 @@ elif quiz_mode == "View Leaderboard":
     st.markdown("---")
     st.subheader("🏆 Cultural Knowledge Leaderboard")
     
-    # Load quiz data for analytics
-    corpus_data = load_corpus_data()
-    quiz_attempts = [item for item in corpus_data if item.get('type') == 'quiz_attempt']
-    question_contributions = [item for item in corpus_data if item.get('type') == 'quiz_question_contribution']
+    # Quiz analytics are cached until the corpus changes
+    analytics = get_quiz_analytics(get_corpus_version())
     
-    if quiz_attempts or question_contributions:
+    if analytics['total_attempts'] or analytics['questions_contributed']:
         col1, col2 = st.columns(2)
         
         with col1:
             st.markdown("#### 📊 Quiz Statistics")
-            if quiz_attempts:
-                total_attempts = len(quiz_attempts)
-                correct_answers = len([q for q in quiz_attempts if q.get('is_correct')])
+            if analytics['total_attempts']:
+                total_attempts = analytics['total_attempts']
+                correct_answers = analytics['correct_answers']
                 accuracy_rate = (correct_answers / total_attempts * 100) if total_attempts > 0 else 0
                 
                 st.metric("Total Quiz Attempts", total_attempts)
                 st.metric("Overall Accuracy", f"{accuracy_rate:.1f}%")
                 
-                # Category performance
-                category_stats = {}
-                for attempt in quiz_attempts:
-                    cat = attempt.get('category', 'Unknown')
-                    if cat not in category_stats:
-                        category_stats[cat] = {'correct': 0, 'total': 0}
-                    category_stats[cat]['total'] += 1
-                    if attempt.get('is_correct'):
-                        category_stats[cat]['correct'] += 1
-                
                 st.markdown("**Category Performance:**")
-                for cat, stats in category_stats.items():
+                for cat, stats in analytics['category_stats'].items():
                     accuracy = (stats['correct'] / stats['total'] * 100) if stats['total'] > 0 else 0
                     st.markdown(f"• {cat}: {accuracy:.1f}% ({stats['correct']}/{stats['total']})")
         
         with col2:
             st.markdown("#### 🌟 Contribution Stats")
-            if question_contributions:
-                st.metric("Questions Contributed", len(question_contributions))
-                
-                # Quality distribution
-                quality_scores = [q.get('quality_score', 0) for q in question_contributions if q.get('quality_score')]
-                if quality_scores:
-                    avg_quality = sum(quality_scores) / len(quality_scores)
-                    st.metric("Average Question Quality", f"{avg_quality:.1f}/5")
+            if analytics['questions_contributed']:
+                st.metric("Questions Contributed", analytics['questions_contributed'])
                 
-                # Contribution by category
-                contrib_categories = {}
-                for contrib in question_contributions:
-                    cat = contrib.get('category', 'Unknown')
-                    contrib_categories[cat] = contrib_categories.get(cat, 0) + 1
+                if analytics['average_quality'] is not None:
+                    st.metric("Average Question Quality", f"{analytics['average_quality']:.1f}/5")
                 
                 st.markdown("**Questions by Category:**")
-                for cat, count in sorted(contrib_categories.items(), key=lambda x: x[1], reverse=True):
+                for cat, count in sorted(analytics['contrib_categories'].items(), key=lambda x: x[1], reverse=True):
                     st.markdown(f"• {cat}: {count}")
     else:
         st.info("📊 No quiz data available yet. Start taking quizzes or contributing questions!")
@@ -376,30 +402,26 @@ elif quiz_mode == "View Leaderboard":
 st.markdown("---")
 st.subheader("📈 Your Progress")
 
-if 'user_contributions' in st.session_state:
-    user_quiz_data = [
-        contrib for contrib in st.session_state.user_contributions 
-        if contrib.get('type') in ['quiz_attempt', 'quiz_question_contribution']
-    ]
+# Counted for the whole session, not just the summaries still held in it
+session_counts = get_session_contribution_counts()
+attempts_user = session_counts.get('quiz_attempt', 0)
+questions_contributed_user = session_counts.get('quiz_question_contribution', 0)
+
+if attempts_user or questions_contributed_user:
+    col3, col4, col5 = st.columns(3)
     
-    if user_quiz_data:
-        quiz_attempts_user = [c for c in user_quiz_data if c.get('type') == 'quiz_attempt']
-        question_contribs_user = [c for c in user_quiz_data if c.get('type') == 'quiz_question_contribution']
-        
-        col3, col4, col5 = st.columns(3)
-        
-        with col3:
-            st.metric("Quiz Attempts", len(quiz_attempts_user))
-        
-        with col4:
-            correct_user = len([q for q in quiz_attempts_user if q.get('is_correct')])
-            user_accuracy = (correct_user / len(quiz_attempts_user) * 100) if quiz_attempts_user else 0
-            st.metric("Your Accuracy", f"{user_accuracy:.1f}%")
-        
-        with col5:
-            st.metric("Questions Contributed", len(question_contribs_user))
-    else:
-        st.info("🎯 Take your first quiz or contribute a question to see your progress!")
+    with col3:
+        st.metric("Quiz Attempts", attempts_user)
+    
+    with col4:
+        correct_user = session_counts.get('correct_answers', 0)
+        user_accuracy = (correct_user / attempts_user * 100) if attempts_user else 0
+        st.metric("Your Accuracy", f"{user_accuracy:.1f}%")
+    
+    with col5:
+        st.metric("Questions Contributed", questions_contributed_user)
+else:
+    st.info("🎯 Take your first quiz or contribute a question to see your progress!")
 
 # Navigation
 st.markdown("---")
@@ -1,10 +1,16 @@
 import streamlit as st
 import json
-from datetime import datetime
-from utils.data_manager import load_corpus_data
+from utils.data_manager import (
+    query_corpus, get_type_counts, get_region_counts, get_contributor_counts, get_latest_sequence, changes_since
+)
 from utils.theming import apply_chatgpt_theme
+from utils.cards import stat_card, contributor_card, show_card_grid, render_entry_header
 from utils.translations import get_translations
 from utils.auth import auth_sidebar
+from utils.profiler import profile_page_run
+
+# Profile this run when page profiling is on
+profile_page_run()
 
 # Initialize session state
 if 'theme_mode' not in st.session_state:
@@ -41,364 +47,256 @@ st.markdown("""
 with st.sidebar:
     auth_sidebar()
 
-# Load all data
-data = load_corpus_data()
+# Counts come from the corpus indexes, no full load needed
+type_counts = get_type_counts()
+contributor_counts = get_contributor_counts()
 
-if not data:
+if not type_counts:
     st.info("🌟 No content has been uploaded yet. Be the first to contribute!")
     st.stop()
 
 # Content statistics overview
-col1, col2, col3, col4 = st.columns(4)
-
-voice_stories = [item for item in data if item.get('type') == 'voice_story']
-video_traditions = [item for item in data if item.get('type') == 'video_tradition']
-festival_events = [item for item in data if item.get('type') == 'festival_event']
-cultural_stories = [item for item in data if item.get('type') == 'cultural_story']
-
-with col1:
-    st.markdown(f"""
-    <div style="
-        background-color: #E8F5E8;
-        padding: 1.5rem;
-        border-radius: 10px;
-        text-align: center;
-        border: 1px solid #4CAF50;
-    ">
-        <h3 style="margin: 0; color: #2E7D32;">🎙️ Voice Stories</h3>
-        <h2 style="margin: 0.5rem 0 0 0; color: #1B5E20;">{len(voice_stories)}</h2>
-    </div>
-    """, unsafe_allow_html=True)
-
-with col2:
-    st.markdown(f"""
-    <div style="
-        background-color: #E3F2FD;
-        padding: 1.5rem;
-        border-radius: 10px;
-        text-align: center;
-        border: 1px solid #2196F3;
-    ">
-        <h3 style="margin: 0; color: #1976D2;">📹 Video Traditions</h3>
-        <h2 style="margin: 0.5rem 0 0 0; color: #0D47A1;">{len(video_traditions)}</h2>
-    </div>
-    """, unsafe_allow_html=True)
-
-with col3:
-    st.markdown(f"""
-    <div style="
-        background-color: #FFF3E0;
-        padding: 1.5rem;
-        border-radius: 10px;
-        text-align: center;
-        border: 1px solid #FF9800;
-    ">
-        <h3 style="margin: 0; color: #F57C00;">🎊 Festival Events</h3>
-        <h2 style="margin: 0.5rem 0 0 0; color: #E65100;">{len(festival_events)}</h2>
-    </div>
-    """, unsafe_allow_html=True)
-
-with col4:
-    st.markdown(f"""
-    <div style="
-        background-color: #F3E5F5;
-        padding: 1.5rem;
-        border-radius: 10px;
-        text-align: center;
-        border: 1px solid #9C27B0;
-    ">
-        <h3 style="margin: 0; color: #7B1FA2;">📚 Cultural Stories</h3>
-        <h2 style="margin: 0.5rem 0 0 0; color: #4A148C;">{len(cultural_stories)}</h2>
-    </div>
-    """, unsafe_allow_html=True)
+show_card_grid([
+    stat_card("🎙️ Voice Stories", type_counts.get('voice_story', 0), tone='green'),
+    stat_card("📹 Video Traditions", type_counts.get('video_tradition', 0), tone='blue'),
+    stat_card("🎊 Festival Events", type_counts.get('festival_event', 0), tone='orange'),
+    stat_card("📚 Cultural Stories", type_counts.get('cultural_story', 0), tone='purple')
+], columns=4)
 
 st.markdown("---")
 
-# Filter and search options
-st.markdown("### 🔍 Explore Community Content")
-
-col1, col2, col3, col4 = st.columns(4)
-
-with col1:
-    content_type = st.selectbox(
-        "Content Type:",
-        ["All", "Voice Stories", "Video Traditions", "Festival Events", "Cultural Stories"]
-    )
-
-with col2:
-    # Get unique contributors
-    contributors = list(set([item.get('contributor', 'Unknown') for item in data if item.get('contributor')]))
-    contributor_filter = st.selectbox(
-        "Contributor:",
-        ["All"] + sorted(contributors)
-    )
-
-with col3:
-    # Get unique regions
-    regions = list(set([item.get('region', 'Unknown') for item in data if item.get('region')]))
-    region_filter = st.selectbox(
-        "Region:",
-        ["All"] + sorted(regions)
-    )
-
-with col4:
-    sort_by = st.selectbox(
-        "Sort by:",
-        ["Recent First", "Oldest First", "Quality Score", "Contributor A-Z"]
+# Follow the change feed from this full run on
+st.session_state.gallery_seq = get_latest_sequence()
+st.session_state.gallery_new_count = 0
+
+@st.fragment(run_every=30)
+def render_new_contributions_notice():
+    """
+    Count contributions saved since the page was last fully loaded, from the
+    change feed, and offer to show them.
+    """
+    feed = changes_since(st.session_state.gallery_seq)
+    st.session_state.gallery_seq = feed['seq']
+    if feed['reset'] or st.session_state.gallery_new_count is None:
+        st.session_state.gallery_new_count = None
+    else:
+        st.session_state.gallery_new_count += sum(1 for change in feed['changes'] if change['op'] == 'add')
+
+    new_count = st.session_state.gallery_new_count
+    if new_count != 0:
+        col1, col2 = st.columns([4, 1])
+        with col1:
+            if new_count is None:
+                st.info("🔔 The gallery has been updated since you opened it.")
+            else:
+                st.info(f"🔔 {new_count} new contribution{'s' if new_count != 1 else ''} since you opened the gallery.")
+        with col2:
+            if st.button("🔄 Show latest", use_container_width=True):
+                st.session_state.gallery_cursors = [None]
+                st.rerun()
+
+render_new_contributions_notice()
+
+@st.fragment
+def render_gallery_browser(contributors, regions):
+    """
+    Filters, pagination and results of the gallery.
+    Runs as a fragment so a filter change or page turn only reruns this
+    section, not the page header and statistics above it. The filter
+    options are passed in from the last full run.
+    """
+    # Filter and search options
+    st.markdown("### 🔍 Explore Community Content")
+
+    col1, col2, col3, col4 = st.columns(4)
+
+    with col1:
+        content_type = st.selectbox(
+            "Content Type:",
+            ["All", "Voice Stories", "Video Traditions", "Festival Events", "Cultural Stories"]
+        )
+
+    with col2:
+        contributor_filter = st.selectbox(
+            "Contributor:",
+            ["All"] + sorted(contributors)
+        )
+
+    with col3:
+        region_filter = st.selectbox(
+            "Region:",
+            ["All"] + sorted(regions)
+        )
+
+    with col4:
+        sort_by = st.selectbox(
+            "Sort by:",
+            ["Recent First", "Oldest First", "Quality Score", "Contributor A-Z"]
+        )
+
+    # Search functionality
+    search_term = st.text_input("🔍 Search content by title, description, or keywords:")
+
+    # Query one page from the corpus indexes
+    type_filters = {
+        "Voice Stories": 'voice_story',
+        "Video Traditions": 'video_tradition',
+        "Festival Events": 'festival_event',
+        "Cultural Stories": 'cultural_story'
+    }
+    sort_keys = {
+        "Recent First": 'recent',
+        "Oldest First": 'oldest',
+        "Quality Score": 'quality',
+        "Contributor A-Z": 'contributor'
+    }
+    filters = {
+        'type': type_filters.get(content_type),
+        'contributor': contributor_filter if contributor_filter != "All" else None,
+        'region': region_filter if region_filter != "All" else None,
+        'search': search_term
+    }
+    items_per_page = 10
+
+    # Keyset pagination: keep the stack of cursors for pages visited so far,
+    # starting over whenever the filters or sort order change
+    query_signature = (content_type, contributor_filter, region_filter, sort_by, search_term)
+    if st.session_state.get('gallery_query') != query_signature:
+        st.session_state.gallery_query = query_signature
+        st.session_state.gallery_cursors = [None]
+
+    result = query_corpus(
+        filters,
+        sort_by=sort_keys[sort_by],
+        cursor=st.session_state.gallery_cursors[-1],
+        page_size=items_per_page
     )
-
-# Search functionality
-search_term = st.text_input("🔍 Search content by title, description, or keywords:")
-
-# Filter data based on selections
-filtered_data = data.copy()
-
-# Filter by content type
-if content_type == "Voice Stories":
-    filtered_data = voice_stories
-elif content_type == "Video Traditions":
-    filtered_data = video_traditions
-elif content_type == "Festival Events":
-    filtered_data = festival_events
-elif content_type == "Cultural Stories":
-    filtered_data = cultural_stories
-
-# Filter by contributor
-if contributor_filter != "All":
-    filtered_data = [item for item in filtered_data if item.get('contributor') == contributor_filter]
-
-# Filter by region
-if region_filter != "All":
-    filtered_data = [item for item in filtered_data if item.get('region') == region_filter]
-
-# Filter by search term
-if search_term:
-    search_lower = search_term.lower()
-    filtered_data = [
-        item for item in filtered_data
-        if search_lower in item.get('title', '').lower() or
-           search_lower in item.get('name', '').lower() or
-           search_lower in item.get('description', '').lower() or
-           search_lower in item.get('content', '').lower()
-    ]
-
-# Sort data
-if sort_by == "Recent First":
-    filtered_data.sort(key=lambda x: x.get('timestamp', ''), reverse=True)
-elif sort_by == "Oldest First":
-    filtered_data.sort(key=lambda x: x.get('timestamp', ''))
-elif sort_by == "Quality Score":
-    filtered_data.sort(key=lambda x: x.get('quality_score', 0), reverse=True)
-elif sort_by == "Contributor A-Z":
-    filtered_data.sort(key=lambda x: x.get('contributor', 'Unknown').lower())
-
-# Pagination
-items_per_page = 10
-total_items = len(filtered_data)
-total_pages = (total_items + items_per_page - 1) // items_per_page
-
-if total_items == 0:
-    st.info("No content matches your search criteria. Try adjusting the filters.")
-    st.stop()
-
-st.markdown(f"**Found {total_items} items**")
-
-if total_pages > 1:
-    page = st.selectbox(f"Page (1-{total_pages}):", range(1, total_pages + 1))
-    start_idx = (page - 1) * items_per_page
-    end_idx = min(start_idx + items_per_page, total_items)
-    page_data = filtered_data[start_idx:end_idx]
-else:
-    page_data = filtered_data
-
-# Display content
-st.markdown("---")
-
-for item in page_data:
-    item_type = item.get('type', 'unknown')
-    contributor = item.get('contributor', 'Unknown')
-    timestamp = item.get('timestamp', '')
-    
-    # Parse timestamp for display
-    try:
-        dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-        formatted_date = dt.strftime('%Y-%m-%d %H:%M')
-    except:
-        formatted_date = timestamp
-
-    # Display based on content type
-    if item_type == 'voice_story':
-        with st.container():
-            st.markdown(f"""
-            <div style="
-                background-color: #F8F9FA;
-                padding: 1.5rem;
-                border-radius: 10px;
-                margin-bottom: 1rem;
-                border-left: 4px solid #4CAF50;
-            ">
-                <h4 style="margin: 0 0 0.5rem 0; color: #2E7D32;">
-                    🎙️ {item.get('title', 'Untitled Voice Story')}
-                </h4>
-                <p style="margin: 0; color: #666; font-size: 0.9em;">
-                    By {contributor} • {formatted_date} • {item.get('region', 'Unknown')}
-                </p>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            col1, col2 = st.columns([3, 1])
-            with col1:
-                st.markdown(f"**Category:** {item.get('category', 'Unknown')}")
-                st.markdown(f"**Language:** {item.get('recording_language', 'Unknown')}")
-                st.markdown(f"**Description:** {item.get('description', '')}")
-                if item.get('transcription'):
-                    with st.expander("📝 Story Transcription"):
-                        st.write(item.get('transcription'))
-                if item.get('significance'):
-                    st.markdown(f"**Cultural Significance:** {item.get('significance')}")
-            
-            with col2:
-                if item.get('quality_score'):
-                    st.metric("Quality Score", f"{item.get('quality_score')}/5")
-                if item.get('has_audio'):
-                    st.info("🎧 Audio Available")
-
-    elif item_type == 'video_tradition':
-        with st.container():
-            st.markdown(f"""
-            <div style="
-                background-color: #F8F9FA;
-                padding: 1.5rem;
-                border-radius: 10px;
-                margin-bottom: 1rem;
-                border-left: 4px solid #2196F3;
-            ">
-                <h4 style="margin: 0 0 0.5rem 0; color: #1976D2;">
-                    📹 {item.get('title', 'Untitled Video')}
-                </h4>
-                <p style="margin: 0; color: #666; font-size: 0.9em;">
-                    By {contributor} • {formatted_date} • {item.get('region', 'Unknown')}
-                </p>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            col1, col2 = st.columns([3, 1])
-            with col1:
-                st.markdown(f"**Category:** {item.get('category', 'Unknown')}")
-                st.markdown(f"**Description:** {item.get('description', '')}")
-                if item.get('cultural_context'):
-                    st.markdown(f"**Cultural Context:** {item.get('cultural_context')}")
-                if item.get('participants_info'):
-                    st.markdown(f"**Participants:** {item.get('participants_info')}")
-            
-            with col2:
-                if item.get('quality_score'):
-                    st.metric("Quality Score", f"{item.get('quality_score')}/5")
-                st.markdown(f"**Duration:** {item.get('duration', 'Unknown')}")
-                st.markdown(f"**Language:** {item.get('video_language', 'Unknown')}")
-                st.markdown(f"**Size:** {item.get('video_size_mb', 0)}MB")
-
-    elif item_type == 'festival_event':
-        with st.container():
-            st.markdown(f"""
-            <div style="
-                background-color: #F8F9FA;
-                padding: 1.5rem;
-                border-radius: 10px;
-                margin-bottom: 1rem;
-                border-left: 4px solid #FF9800;
-            ">
-                <h4 style="margin: 0 0 0.5rem 0; color: #F57C00;">
-                    🎊 {item.get('name', 'Untitled Festival')}
-                </h4>
-                <p style="margin: 0; color: #666; font-size: 0.9em;">
-                    By {contributor} • {formatted_date} • {item.get('region', 'Unknown')}
-                </p>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            col1, col2 = st.columns([3, 1])
-            with col1:
-                st.markdown(f"**Category:** {item.get('category', 'Unknown')}")
-                if item.get('months'):
-                    st.markdown(f"**Celebration Months:** {', '.join(item.get('months', []))}")
-                st.markdown(f"**Description:** {item.get('description', '')}")
-                if item.get('traditions'):
-                    st.markdown(f"**Traditions:** {item.get('traditions')}")
-                if item.get('foods'):
-                    st.markdown(f"**Traditional Foods:** {item.get('foods')}")
-                if item.get('significance'):
-                    st.markdown(f"**Significance:** {item.get('significance')}")
-            
-            with col2:
-                if item.get('quality_score'):
-                    st.metric("Quality Score", f"{item.get('quality_score')}/5")
-
-    elif item_type == 'cultural_story':
-        with st.container():
-            st.markdown(f"""
-            <div style="
-                background-color: #F8F9FA;
-                padding: 1.5rem;
-                border-radius: 10px;
-                margin-bottom: 1rem;
-                border-left: 4px solid #9C27B0;
-            ">
-                <h4 style="margin: 0 0 0.5rem 0; color: #7B1FA2;">
-                    📚 {item.get('title', 'Untitled Story')}
-                </h4>
-                <p style="margin: 0; color: #666; font-size: 0.9em;">
-                    By {contributor} • {formatted_date} • {item.get('region', 'Unknown')}
-                </p>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            col1, col2 = st.columns([3, 1])
-            with col1:
-                st.markdown(f"**Category:** {item.get('category', 'Unknown')}")
-                st.markdown(f"**Language:** {item.get('original_language', 'Unknown')}")
-                content_preview = item.get('content', '')[:300]
-                st.markdown(f"**Story:** {content_preview}{'...' if len(item.get('content', '')) > 300 else ''}")
-                if item.get('moral_lesson'):
-                    st.markdown(f"**Moral:** {item.get('moral_lesson')}")
-            
-            with col2:
-                if item.get('quality_score'):
-                    st.metric("Quality Score", f"{item.get('quality_score')}/5")
-                st.markdown(f"**Audience:** {item.get('audience_age', 'All ages')}")
-
+    page_data = result['items']
+    total_items = result['total']
+    total_pages = (total_items + items_per_page - 1) // items_per_page
+
+    if total_items == 0:
+        st.info("No content matches your search criteria. Try adjusting the filters.")
+        return
+
+    st.markdown(f"**Found {total_items} items**")
+
+    if total_pages > 1:
+        page_number = len(st.session_state.gallery_cursors)
+        nav_prev, nav_label, nav_next = st.columns([1, 2, 1])
+        with nav_prev:
+            st.button("← Previous", disabled=page_number == 1, use_container_width=True,
+                      on_click=st.session_state.gallery_cursors.pop)
+        with nav_label:
+            st.markdown(f"<p style='text-align: center;'>Page {page_number} of {total_pages}</p>", unsafe_allow_html=True)
+        with nav_next:
+            st.button("Next →", disabled=result['next_cursor'] is None, use_container_width=True,
+                      on_click=st.session_state.gallery_cursors.append, args=(result['next_cursor'],))
+
+    # Display content
     st.markdown("---")
+    theme_mode = st.session_state.theme_mode
+    language = st.session_state.selected_language
+
+    for item in page_data:
+        item_type = item.get('type', 'unknown')
+
+        # Display based on content type
+        if item_type == 'voice_story':
+            with st.container():
+                st.markdown(render_entry_header(item, theme_mode, language), unsafe_allow_html=True)
+
+                col1, col2 = st.columns([3, 1])
+                with col1:
+                    st.markdown(f"**Category:** {item.get('category', 'Unknown')}")
+                    st.markdown(f"**Language:** {item.get('recording_language', 'Unknown')}")
+                    st.markdown(f"**Description:** {item.get('description', '')}")
+                    if item.get('transcription'):
+                        with st.expander("📝 Story Transcription"):
+                            st.write(item.get('transcription'))
+                    if item.get('significance'):
+                        st.markdown(f"**Cultural Significance:** {item.get('significance')}")
+
+                with col2:
+                    if item.get('quality_score'):
+                        st.metric("Quality Score", f"{item.get('quality_score')}/5")
+                    if item.get('has_audio'):
+                        st.info("🎧 Audio Available")
+
+        elif item_type == 'video_tradition':
+            with st.container():
+                st.markdown(render_entry_header(item, theme_mode, language), unsafe_allow_html=True)
+
+                col1, col2 = st.columns([3, 1])
+                with col1:
+                    st.markdown(f"**Category:** {item.get('category', 'Unknown')}")
+                    st.markdown(f"**Description:** {item.get('description', '')}")
+                    if item.get('cultural_context'):
+                        st.markdown(f"**Cultural Context:** {item.get('cultural_context')}")
+                    if item.get('participants_info'):
+                        st.markdown(f"**Participants:** {item.get('participants_info')}")
+
+                with col2:
+                    if item.get('quality_score'):
+                        st.metric("Quality Score", f"{item.get('quality_score')}/5")
+                    st.markdown(f"**Duration:** {item.get('duration', 'Unknown')}")
+                    st.markdown(f"**Language:** {item.get('video_language', 'Unknown')}")
+                    st.markdown(f"**Size:** {item.get('video_size_mb', 0)}MB")
+
+        elif item_type == 'festival_event':
+            with st.container():
+                st.markdown(render_entry_header(item, theme_mode, language), unsafe_allow_html=True)
+
+                col1, col2 = st.columns([3, 1])
+                with col1:
+                    st.markdown(f"**Category:** {item.get('category', 'Unknown')}")
+                    if item.get('months'):
+                        st.markdown(f"**Celebration Months:** {', '.join(item.get('months', []))}")
+                    st.markdown(f"**Description:** {item.get('description', '')}")
+                    if item.get('traditions'):
+                        st.markdown(f"**Traditions:** {item.get('traditions')}")
+                    if item.get('foods'):
+                        st.markdown(f"**Traditional Foods:** {item.get('foods')}")
+                    if item.get('significance'):
+                        st.markdown(f"**Significance:** {item.get('significance')}")
+
+                with col2:
+                    if item.get('quality_score'):
+                        st.metric("Quality Score", f"{item.get('quality_score')}/5")
+
+        elif item_type == 'cultural_story':
+            with st.container():
+                st.markdown(render_entry_header(item, theme_mode, language), unsafe_allow_html=True)
+
+                col1, col2 = st.columns([3, 1])
+                with col1:
+                    st.markdown(f"**Category:** {item.get('category', 'Unknown')}")
+                    st.markdown(f"**Language:** {item.get('original_language', 'Unknown')}")
+                    content_preview = item.get('content', '')[:300]
+                    st.markdown(f"**Story:** {content_preview}{'...' if len(item.get('content', '')) > 300 else ''}")
+                    if item.get('moral_lesson'):
+                        st.markdown(f"**Moral:** {item.get('moral_lesson')}")
+
+                with col2:
+                    if item.get('quality_score'):
+                        st.metric("Quality Score", f"{item.get('quality_score')}/5")
+                    st.markdown(f"**Audience:** {item.get('audience_age', 'All ages')}")
+
+        st.markdown("---")
+
+render_gallery_browser(list(contributor_counts.keys()), list(get_region_counts().keys()))
 
 # Contributors section
 st.markdown("### 👥 Top Contributors")
 
-# Count contributions by user
-contributor_counts = {}
-for item in data:
-    contributor = item.get('contributor', 'Unknown')
-    if contributor != 'Unknown':
-        contributor_counts[contributor] = contributor_counts.get(contributor, 0) + 1
-
 if contributor_counts:
     # Sort by contribution count
     sorted_contributors = sorted(contributor_counts.items(), key=lambda x: x[1], reverse=True)
     
     # Display top 10 contributors
-    cols = st.columns(5)
-    for i, (contributor, count) in enumerate(sorted_contributors[:10]):
-        with cols[i % 5]:
-            st.markdown(f"""
-            <div style="
-                background-color: #F8F9FA;
-                padding: 1rem;
-                border-radius: 8px;
-                text-align: center;
-                border: 1px solid #DEE2E6;
-            ">
-                <h4 style="margin: 0; color: #495057;">{contributor}</h4>
-                <p style="margin: 0.5rem 0 0 0; color: #6C757D;">{count} contributions</p>
-            </div>
-            """, unsafe_allow_html=True)
+    show_card_grid([
+        contributor_card(contributor, count) for contributor, count in sorted_contributors[:10]
+    ], columns=5)
 
 # Footer
 st.markdown("---")
@@ -1,11 +1,18 @@
 import streamlit as st
 import json
-import pandas as pd
 from datetime import datetime
 import io
+from utils.lazy_imports import lazy_import
 from utils.theming import apply_chatgpt_theme
-from utils.data_manager import load_corpus_data
+from utils.data_manager import load_corpus_data, get_corpus_version
 from utils.translations import get_translations
+from utils.profiler import profile_page_run
+
+# Profile this run when page profiling is on
+profile_page_run()
+
+# pandas is only loaded once a chart or export file is built
+pd = lazy_import("pandas")
 
 st.set_page_config(page_title="Data Export", page_icon="📊", layout="wide")
 
@@ -21,40 +28,63 @@ translations = get_translations(selected_language)
 st.title("📊 Corpus Data Analytics & Export")
 st.markdown("### Analyze and Export Collected Cultural Data")
 
-# Load corpus data
-corpus_data = load_corpus_data()
-
-if not corpus_data:
+@st.cache_data(show_spinner=False, max_entries=1)
+def get_overview_statistics(corpus_version):
+    """Distribution and quality statistics, recomputed only when the corpus version changes."""
+    corpus_data = load_corpus_data()
+    data_types = {}
+    languages = {}
+    regions = {}
+    categories = {}
+    
+    for entry in corpus_data:
+        # Count by type
+        entry_type = entry.get('type', 'Unknown')
+        data_types[entry_type] = data_types.get(entry_type, 0) + 1
+        
+        # Count by language
+        lang = entry.get('language', entry.get('user_language', 'Unknown'))
+        languages[lang] = languages.get(lang, 0) + 1
+        
+        # Count by region
+        region = entry.get('region', 'Unknown')
+        if region != 'Unknown':
+            regions[region] = regions.get(region, 0) + 1
+        
+        # Count by category
+        category = entry.get('category', entry.get('period', 'General'))
+        categories[category] = categories.get(category, 0) + 1
+    
+    quality_scores = [entry.get('quality_score', 0) for entry in corpus_data if entry.get('quality_score')]
+    timestamps = [entry.get('timestamp', '') for entry in corpus_data if entry.get('timestamp')]
+    
+    return {
+        'total_entries': len(corpus_data),
+        'data_types': data_types,
+        'languages': languages,
+        'regions': regions,
+        'categories': categories,
+        'quality_count': len(quality_scores),
+        'average_quality': sum(quality_scores) / len(quality_scores) if quality_scores else 0,
+        'high_quality': len([score for score in quality_scores if score >= 4]),
+        'most_recent': max(timestamps) if timestamps else None
+    }
+
+# Corpus statistics are cached per corpus version
+overview = get_overview_statistics(get_corpus_version())
+
+if not overview['total_entries']:
     st.warning("📭 No data available for export. Start contributing to build the corpus!")
     st.stop()
 
 # Data overview
 st.subheader("📈 Data Overview")
 
-# Calculate statistics
-total_entries = len(corpus_data)
-data_types = {}
-languages = {}
-regions = {}
-categories = {}
-
-for entry in corpus_data:
-    # Count by type
-    entry_type = entry.get('type', 'Unknown')
-    data_types[entry_type] = data_types.get(entry_type, 0) + 1
-    
-    # Count by language
-    lang = entry.get('language', entry.get('user_language', 'Unknown'))
-    languages[lang] = languages.get(lang, 0) + 1
-    
-    # Count by region
-    region = entry.get('region', 'Unknown')
-    if region != 'Unknown':
-        regions[region] = regions.get(region, 0) + 1
-    
-    # Count by category
-    category = entry.get('category', entry.get('period', 'General'))
-    categories[category] = categories.get(category, 0) + 1
+total_entries = overview['total_entries']
+data_types = overview['data_types']
+languages = overview['languages']
+regions = overview['regions']
+categories = overview['categories']
 
 # Display metrics
 col1, col2, col3, col4 = st.columns(4)
@@ -125,156 +155,156 @@ with tab4:
 st.markdown("---")
 st.subheader("🎯 Data Quality Analysis")
 
-quality_scores = [entry.get('quality_score', 0) for entry in corpus_data if entry.get('quality_score')]
-
-if quality_scores:
+if overview['quality_count']:
     col5, col6, col7 = st.columns(3)
     
     with col5:
-        avg_quality = sum(quality_scores) / len(quality_scores)
-        st.metric("Average Quality Score", f"{avg_quality:.2f}/5")
+        st.metric("Average Quality Score", f"{overview['average_quality']:.2f}/5")
     
     with col6:
-        high_quality = len([score for score in quality_scores if score >= 4])
-        st.metric("High Quality Entries", f"{high_quality} ({high_quality/len(quality_scores)*100:.1f}%)")
+        high_quality = overview['high_quality']
+        st.metric("High Quality Entries", f"{high_quality} ({high_quality/overview['quality_count']*100:.1f}%)")
     
     with col7:
-        recent_entries = [entry for entry in corpus_data if entry.get('timestamp')]
-        if recent_entries:
-            recent_entries.sort(key=lambda x: x.get('timestamp', ''), reverse=True)
-            st.metric("Most Recent Entry", recent_entries[0].get('timestamp', '')[:10])
-
-# Export functionality
-st.markdown("---")
-st.subheader("💾 Export Data")
-
-export_format = st.selectbox(
-    "Choose export format:",
-    ["JSON", "CSV", "Excel"]
-)
-
-# Filter options
-st.markdown("#### Export Filters")
-col8, col9, col10 = st.columns(3)
-
-with col8:
-    filter_type = st.multiselect(
-        "Filter by data type:",
-        options=list(data_types.keys()),
-        default=list(data_types.keys())
+        if overview['most_recent']:
+            st.metric("Most Recent Entry", overview['most_recent'][:10])
+
+@st.fragment
+def render_export_panel(data_types, languages, total_entries):
+    """Export filters, file generation and preview; reruns on its own when a filter changes."""
+    st.markdown("---")
+    st.subheader("💾 Export Data")
+
+    export_format = st.selectbox(
+        "Choose export format:",
+        ["JSON", "CSV", "Excel"]
     )
 
-with col9:
-    filter_language = st.multiselect(
-        "Filter by language:",
-        options=list(languages.keys()),
-        default=list(languages.keys())
-    )
+    # Filter options
+    st.markdown("#### Export Filters")
+    col8, col9, col10 = st.columns(3)
 
-with col10:
-    min_quality = st.slider(
-        "Minimum quality score:",
-        min_value=0.0,
-        max_value=5.0,
-        value=0.0,
-        step=0.1
-    )
+    with col8:
+        filter_type = st.multiselect(
+            "Filter by data type:",
+            options=list(data_types.keys()),
+            default=list(data_types.keys())
+        )
 
-# Apply filters
-filtered_data = []
-for entry in corpus_data:
-    # Type filter
-    if entry.get('type') not in filter_type:
-        continue
-    
-    # Language filter
-    entry_lang = entry.get('language', entry.get('user_language', 'Unknown'))
-    if entry_lang not in filter_language:
-        continue
-    
-    # Quality filter
-    entry_quality = entry.get('quality_score', 0)
-    if entry_quality < min_quality:
-        continue
-    
-    filtered_data.append(entry)
-
-st.info(f"📊 {len(filtered_data)} entries match your filter criteria (out of {total_entries} total)")
-
-# Generate export file
-if st.button("🔽 Generate Export File") and filtered_data:
-    if export_format == "JSON":
-        export_data = json.dumps(filtered_data, indent=2, ensure_ascii=False)
-        st.download_button(
-            label="📥 Download JSON",
-            data=export_data,
-            file_name=f"indian_culture_corpus_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
-            mime="application/json"
+    with col9:
+        filter_language = st.multiselect(
+            "Filter by language:",
+            options=list(languages.keys()),
+            default=list(languages.keys())
         )
-    
-    elif export_format == "CSV":
-        # Flatten the data for CSV
-        flattened_data = []
-        for entry in filtered_data:
-            flat_entry = {}
-            for key, value in entry.items():
-                if isinstance(value, (list, dict)):
-                    flat_entry[key] = json.dumps(value, ensure_ascii=False)
-                else:
-                    flat_entry[key] = value
-            flattened_data.append(flat_entry)
-        
-        df = pd.DataFrame(flattened_data)
-        csv_data = df.to_csv(index=False)
-        st.download_button(
-            label="📥 Download CSV",
-            data=csv_data,
-            file_name=f"indian_culture_corpus_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-            mime="text/csv"
+
+    with col10:
+        min_quality = st.slider(
+            "Minimum quality score:",
+            min_value=0.0,
+            max_value=5.0,
+            value=0.0,
+            step=0.1
         )
-    
-    elif export_format == "Excel":
-        # Create Excel file
-        flattened_data = []
-        for entry in filtered_data:
-            flat_entry = {}
-            for key, value in entry.items():
-                if isinstance(value, (list, dict)):
-                    flat_entry[key] = json.dumps(value, ensure_ascii=False)
-                else:
-                    flat_entry[key] = value
-            flattened_data.append(flat_entry)
+
+    # Apply filters
+    filtered_data = []
+    for entry in load_corpus_data():
+        # Type filter
+        if entry.get('type') not in filter_type:
+            continue
         
-        df = pd.DataFrame(flattened_data)
+        # Language filter
+        entry_lang = entry.get('language', entry.get('user_language', 'Unknown'))
+        if entry_lang not in filter_language:
+            continue
         
-        # Create Excel buffer
-        excel_buffer = io.BytesIO()
-        with pd.ExcelWriter(excel_buffer, engine='openpyxl') as writer:
-            df.to_excel(writer, sheet_name='Cultural_Corpus', index=False)
+        # Quality filter
+        entry_quality = entry.get('quality_score', 0)
+        if entry_quality < min_quality:
+            continue
         
-        st.download_button(
-            label="📥 Download Excel",
-            data=excel_buffer.getvalue(),
-            file_name=f"indian_culture_corpus_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
-            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-        )
-
-# Sample data preview
-st.markdown("---")
-st.subheader("👁️ Data Preview")
-
-if st.checkbox("Show sample data (first 10 entries)"):
-    sample_data = filtered_data[:10]
-    
-    for i, entry in enumerate(sample_data):
-        with st.expander(f"Entry {i+1}: {entry.get('type', 'Unknown')} - {entry.get('timestamp', '')[:10]}"):
-            # Display entry details
-            for key, value in entry.items():
-                if key not in ['timestamp']:  # Skip timestamp in main display
-                    if isinstance(value, str) and len(value) > 100:
-                        st.markdown(f"**{key}**: {value[:100]}...")
+        filtered_data.append(entry)
+
+    st.info(f"📊 {len(filtered_data)} entries match your filter criteria (out of {total_entries} total)")
+
+    # Generate export file
+    if st.button("🔽 Generate Export File") and filtered_data:
+        if export_format == "JSON":
+            export_data = json.dumps(filtered_data, indent=2, ensure_ascii=False)
+            st.download_button(
+                label="📥 Download JSON",
+                data=export_data,
+                file_name=f"indian_culture_corpus_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
+                mime="application/json"
+            )
+        
+        elif export_format == "CSV":
+            # Flatten the data for CSV
+            flattened_data = []
+            for entry in filtered_data:
+                flat_entry = {}
+                for key, value in entry.items():
+                    if isinstance(value, (list, dict)):
+                        flat_entry[key] = json.dumps(value, ensure_ascii=False)
+                    else:
+                        flat_entry[key] = value
+                flattened_data.append(flat_entry)
+            
+            df = pd.DataFrame(flattened_data)
+            csv_data = df.to_csv(index=False)
+            st.download_button(
+                label="📥 Download CSV",
+                data=csv_data,
+                file_name=f"indian_culture_corpus_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+                mime="text/csv"
+            )
+        
+        elif export_format == "Excel":
+            # Create Excel file
+            flattened_data = []
+            for entry in filtered_data:
+                flat_entry = {}
+                for key, value in entry.items():
+                    if isinstance(value, (list, dict)):
+                        flat_entry[key] = json.dumps(value, ensure_ascii=False)
                     else:
-                        st.markdown(f"**{key}**: {value}")
+                        flat_entry[key] = value
+                flattened_data.append(flat_entry)
+            
+            df = pd.DataFrame(flattened_data)
+            
+            # Create Excel buffer
+            excel_buffer = io.BytesIO()
+            with pd.ExcelWriter(excel_buffer, engine='openpyxl') as writer:
+                df.to_excel(writer, sheet_name='Cultural_Corpus', index=False)
+            
+            st.download_button(
+                label="📥 Download Excel",
+                data=excel_buffer.getvalue(),
+                file_name=f"indian_culture_corpus_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
+                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+            )
+
+    # Sample data preview
+    st.markdown("---")
+    st.subheader("👁️ Data Preview")
+
+    if st.checkbox("Show sample data (first 10 entries)"):
+        sample_data = filtered_data[:10]
+        
+        for i, entry in enumerate(sample_data):
+            with st.expander(f"Entry {i+1}: {entry.get('type', 'Unknown')} - {entry.get('timestamp', '')[:10]}"):
+                # Display entry details
+                for key, value in entry.items():
+                    if key not in ['timestamp']:  # Skip timestamp in main display
+                        if isinstance(value, str) and len(value) > 100:
+                            st.markdown(f"**{key}**: {value[:100]}...")
+                        else:
+                            st.markdown(f"**{key}**: {value}")
+
+# Export functionality
+render_export_panel(data_types, languages, total_entries)
 
 # Data usage guidelines
 st.markdown("---")
@@ -310,23 +340,25 @@ st.subheader("🔌 API Access")
 with st.expander("Advanced: API Access Information"):
     st.markdown("""
     ### 📡 Programmatic Access
-    For researchers and developers who need programmatic access to the corpus data:
+    For researchers and developers who need programmatic access to the corpus data,
+    run from the project directory and go through `utils.data_manager`. It reads
+    whichever storage layout is configured: `data/corpus_data.json`, or the monthly
+    partitions in `data/corpus/` listed in `manifest.json`, plus edits not yet
+    compacted into either.
     
     ```python
-    # Example Python code to load corpus data
-    import json
-    
-    def load_corpus_data():
-        with open('data/corpus_data.json', 'r', encoding='utf-8') as f:
-            return json.load(f)
+    from utils.data_manager import export_corpus_subset, load_corpus_data
     
-    # Filter by type
-    def filter_by_type(data, data_type):
-        return [item for item in data if item.get('type') == data_type]
+    # The whole corpus
+    corpus = load_corpus_data()
     
-    # Filter by language
-    def filter_by_language(data, language):
-        return [item for item in data if item.get('language') == language]
+    # Filter by type, language, region, quality or date
+    stories = export_corpus_subset({
+        'types': ['voice_story'],
+        'languages': ['English'],
+        'min_quality': 4,
+        'date_from': '2025-01-01T00:00:00'
+    })
     ```
     
     ### 📚 Data Schema
@@ -1,19 +1,22 @@
 import streamlit as st
 import json
 from datetime import datetime
-from utils.data_manager import save_user_data, load_corpus_data, get_festival_list
+from utils.data_manager import save_user_data, load_corpus_data, get_festival_list, get_entry_by_id
 from utils.ai_validation import validate_content
 from utils.theming import apply_chatgpt_theme
 from utils.translations import get_translations, SUPPORTED_LANGUAGES
 from utils.auth import is_logged_in, get_current_user, update_user_contributions
+from utils.session_memory import record_contribution
+from utils.profiler import profile_page_run
+
+# Profile this run when page profiling is on
+profile_page_run()
 
 # Initialize session state
 if 'theme_mode' not in st.session_state:
     st.session_state.theme_mode = 'light'
 if 'selected_language' not in st.session_state:
     st.session_state.selected_language = 'English'
-if 'user_contributions' not in st.session_state:
-    st.session_state.user_contributions = []
 
 # Apply ChatGPT-style theming
 apply_chatgpt_theme(st.session_state.theme_mode)
@@ -132,7 +135,7 @@ with col1:
                     save_user_data(festival_data)
                     username = current_user.get('username') if current_user else 'unknown'
                     update_user_contributions(username)
-                    st.session_state.user_contributions.append(festival_data)
+                    record_contribution(festival_data)
                     st.success("✅ Festival information added successfully!")
                     st.balloons()
                 else:
@@ -142,7 +145,9 @@ with col2:
     st.markdown("### 📊 Festival Statistics")
     
     # Load data and show statistics
-    data = load_corpus_data()
+    # Only the fields the statistics and festival cards show; descriptions are
+    # fetched per festival when asked for
+    data = load_corpus_data(fields=['type', 'name', 'region', 'category', 'months', 'traditions', 'foods'])
     festival_data = [item for item in data if item.get('type') == 'festival_event']
     
     st.metric("🎊 Total Festivals", len(festival_data))
@@ -182,13 +187,15 @@ if festival_data:
                         st.markdown(f"**Type:** {festival.get('category', 'Unknown')}")
                         if festival.get('months'):
                             st.markdown(f"**Months:** {', '.join(festival.get('months', []))}")
-                        st.markdown(f"**Description:** {festival.get('description', '')}")
                         if festival.get('traditions'):
                             st.markdown(f"**Traditions:** {festival.get('traditions', '')}")
                         if festival.get('foods'):
                             st.markdown(f"**Traditional Foods:** {festival.get('foods', '')}")
-                        if festival.get('significance'):
-                            st.markdown(f"**Significance:** {festival.get('significance', '')}")
+                        if st.toggle("📖 Show description", key=f"festival_text_{festival.get('id', i + j)}"):
+                            full_festival = get_entry_by_id(festival.get('id')) or festival
+                            st.markdown(f"**Description:** {full_festival.get('description', '')}")
+                            if full_festival.get('significance'):
+                                st.markdown(f"**Significance:** {full_festival.get('significance', '')}")
 else:
     st.info("🌟 Be the first to add information about Indian festivals!")
 
@@ -1,10 +1,15 @@
 import streamlit as st
 import json
 from datetime import datetime
-from utils.data_manager import load_corpus_data
+from utils.data_manager import get_contributor_summary, get_contributor_entries, get_contributor_export
 from utils.theming import apply_chatgpt_theme
+from utils.cards import stat_card, show_card_grid
 from utils.translations import get_translations
 from utils.auth import is_logged_in, get_current_user, auth_sidebar
+from utils.profiler import profile_page_run
+
+# Profile this run when page profiling is on
+profile_page_run()
 
 # Initialize session state
 if 'theme_mode' not in st.session_state:
@@ -74,75 +79,20 @@ st.markdown(f"""
 </div>
 """, unsafe_allow_html=True)
 
-# Load all data and filter by current user
-data = load_corpus_data()
-user_contributions = [item for item in data if item.get('contributor') == username]
+# Counts come from the user's materialized view, no corpus scan needed
+summary = get_contributor_summary(username)
+contribution_count = summary['total']
+type_counts = summary['type_counts']
 
 # Statistics overview
-col1, col2, col3, col4 = st.columns(4)
-
-voice_stories = [item for item in user_contributions if item.get('type') == 'voice_story']
-video_traditions = [item for item in user_contributions if item.get('type') == 'video_tradition']
-festival_events = [item for item in user_contributions if item.get('type') == 'festival_event']
-cultural_facts = [item for item in user_contributions if item.get('type') == 'cultural_fact']
-
-with col1:
-    st.markdown(f"""
-    <div style="
-        background-color: #E8F5E8;
-        padding: 1.5rem;
-        border-radius: 10px;
-        text-align: center;
-        border: 1px solid #4CAF50;
-    ">
-        <h3 style="margin: 0; color: #2E7D32;">🎙️ Voice Stories</h3>
-        <h2 style="margin: 0.5rem 0 0 0; color: #1B5E20;">{len(voice_stories)}</h2>
-    </div>
-    """, unsafe_allow_html=True)
-
-with col2:
-    st.markdown(f"""
-    <div style="
-        background-color: #E3F2FD;
-        padding: 1.5rem;
-        border-radius: 10px;
-        text-align: center;
-        border: 1px solid #2196F3;
-    ">
-        <h3 style="margin: 0; color: #1976D2;">📹 Video Traditions</h3>
-        <h2 style="margin: 0.5rem 0 0 0; color: #0D47A1;">{len(video_traditions)}</h2>
-    </div>
-    """, unsafe_allow_html=True)
-
-with col3:
-    st.markdown(f"""
-    <div style="
-        background-color: #FFF3E0;
-        padding: 1.5rem;
-        border-radius: 10px;
-        text-align: center;
-        border: 1px solid #FF9800;
-    ">
-        <h3 style="margin: 0; color: #F57C00;">🎊 Festival Events</h3>
-        <h2 style="margin: 0.5rem 0 0 0; color: #E65100;">{len(festival_events)}</h2>
-    </div>
-    """, unsafe_allow_html=True)
-
-with col4:
-    st.markdown(f"""
-    <div style="
-        background-color: #F3E5F5;
-        padding: 1.5rem;
-        border-radius: 10px;
-        text-align: center;
-        border: 1px solid #9C27B0;
-    ">
-        <h3 style="margin: 0; color: #7B1FA2;">💡 Cultural Facts</h3>
-        <h2 style="margin: 0.5rem 0 0 0; color: #4A148C;">{len(cultural_facts)}</h2>
-    </div>
-    """, unsafe_allow_html=True)
-
-if not user_contributions:
+show_card_grid([
+    stat_card("🎙️ Voice Stories", type_counts.get('voice_story', 0), tone='green'),
+    stat_card("📹 Video Traditions", type_counts.get('video_tradition', 0), tone='blue'),
+    stat_card("🎊 Festival Events", type_counts.get('festival_event', 0), tone='orange'),
+    stat_card("💡 Cultural Facts", type_counts.get('cultural_fact', 0), tone='purple')
+], columns=4)
+
+if not contribution_count:
     st.info("🌟 You haven't made any contributions yet! Visit other pages to start sharing your cultural knowledge.")
     st.stop()
 
@@ -168,43 +118,39 @@ with col3:
         [5, 10, 20, 50]
     )
 
-# Filter contributions
-filtered_contributions = user_contributions.copy()
-
-if content_filter == "Voice Stories":
-    filtered_contributions = voice_stories
-elif content_filter == "Video Traditions":
-    filtered_contributions = video_traditions
-elif content_filter == "Festival Events":
-    filtered_contributions = festival_events
-elif content_filter == "Cultural Facts":
-    filtered_contributions = cultural_facts
-
-# Sort contributions
-if sort_by == "Recent First":
-    filtered_contributions.sort(key=lambda x: x.get('timestamp', ''), reverse=True)
-elif sort_by == "Oldest First":
-    filtered_contributions.sort(key=lambda x: x.get('timestamp', ''))
-elif sort_by == "Quality Score":
-    filtered_contributions.sort(key=lambda x: x.get('quality_score', 0), reverse=True)
-elif sort_by == "Title A-Z":
-    filtered_contributions.sort(key=lambda x: x.get('title', x.get('content', '')).lower())
-
-# Pagination
-total_items = len(filtered_contributions)
+# Filter, sort and paginate from the user's view
+type_filters = {
+    "Voice Stories": 'voice_story',
+    "Video Traditions": 'video_tradition',
+    "Festival Events": 'festival_event',
+    "Cultural Facts": 'cultural_fact'
+}
+sort_keys = {
+    "Recent First": 'recent',
+    "Oldest First": 'oldest',
+    "Quality Score": 'quality',
+    "Title A-Z": 'title'
+}
+entry_type = type_filters.get(content_filter)
+total_items = type_counts.get(entry_type, 0) if entry_type else contribution_count
 total_pages = (total_items + items_per_page - 1) // items_per_page
 
 if total_pages > 1:
     page = st.selectbox(f"Page (1-{total_pages}):", range(1, total_pages + 1))
-    start_idx = (page - 1) * items_per_page
-    end_idx = min(start_idx + items_per_page, total_items)
-    page_contributions = filtered_contributions[start_idx:end_idx]
 else:
-    page_contributions = filtered_contributions
+    page = 1
+
+page_contributions, total_items = get_contributor_entries(
+    username,
+    entry_type=entry_type,
+    sort_by=sort_keys[sort_by],
+    offset=(page - 1) * items_per_page,
+    limit=items_per_page
+)
 
 # Display contributions
 st.markdown("---")
-st.markdown(f"### 📚 Your Contributions ({len(filtered_contributions)} items)")
+st.markdown(f"### 📚 Your Contributions ({total_items} items)")
 
 for item in page_contributions:
     item_type = item.get('type', 'unknown')
@@ -292,17 +238,9 @@ col1, col2 = st.columns(2)
 
 with col1:
     if st.button("📄 Export as JSON", use_container_width=True):
-        import json
-        export_data = {
-            'username': username,
-            'export_date': datetime.now().isoformat(),
-            'total_contributions': len(user_contributions),
-            'contributions': user_contributions
-        }
-        json_str = json.dumps(export_data, indent=2, ensure_ascii=False)
         st.download_button(
             label="Download JSON File",
-            data=json_str,
+            data=get_contributor_export(username),
             file_name=f"{username}_contributions_{datetime.now().strftime('%Y%m%d')}.json",
             mime="application/json"
         )
@@ -315,14 +253,15 @@ Username: {username}
 Export Date: {datetime.now().strftime('%Y-%m-%d %H:%M')}
 
 Statistics:
-- Voice Stories: {len(voice_stories)}
-- Video Traditions: {len(video_traditions)}
-- Festival Events: {len(festival_events)}
-- Cultural Facts: {len(cultural_facts)}
-- Total Contributions: {len(user_contributions)}
+- Voice Stories: {type_counts.get('voice_story', 0)}
+- Video Traditions: {type_counts.get('video_tradition', 0)}
+- Festival Events: {type_counts.get('festival_event', 0)}
+- Cultural Facts: {type_counts.get('cultural_fact', 0)}
+- Total Contributions: {contribution_count}
 
 Detailed Contributions:
 """
+        user_contributions, _ = get_contributor_entries(username, sort_by=None)
         for i, item in enumerate(user_contributions, 1):
             item_type = item.get('type', 'unknown')
             title = item.get('title', item.get('name', item.get('content', '')[:50]))
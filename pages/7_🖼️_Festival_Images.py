@@ -3,10 +3,15 @@ import json
 import os
 from datetime import datetime
 from utils.theming import apply_chatgpt_theme
+from utils.cards import show_card_grid, render_image_card, render_sample_image_card
 from utils.data_manager import save_user_data, load_corpus_data, get_data_by_type
 from utils.translations import get_translations, SUPPORTED_LANGUAGES
 from utils.ai_validation import validate_content
 from utils.auth import auth_sidebar, is_logged_in, get_current_user, update_user_contributions
+from utils.profiler import profile_page_run
+
+# Profile this run when page profiling is on
+profile_page_run()
 
 # Page config
 st.set_page_config(
@@ -102,36 +107,10 @@ with tab1:
         st.markdown(f"**Found {len(filtered_images)} images**")
         
         # Display images in grid
-        for i in range(0, len(filtered_images), 3):
-            cols = st.columns(3)
-            for j, col in enumerate(cols):
-                if i + j < len(filtered_images):
-                    img = filtered_images[i + j]
-                    with col:
-                        st.markdown(f"""
-                        <div style="
-                            border: 1px solid #ddd;
-                            border-radius: 10px;
-                            padding: 1rem;
-                            margin-bottom: 1rem;
-                            background: white;
-                            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-                        ">
-                            <h4 style="margin: 0 0 0.5rem 0; color: #333;">{img.get('title', 'Untitled')}</h4>
-                            <p style="color: #666; font-size: 0.9rem; margin: 0.5rem 0;">
-                                <strong>Festival:</strong> {img.get('festival_event', 'General')}<br>
-                                <strong>Region:</strong> {img.get('region', 'Unknown')}<br>
-                                <strong>Type:</strong> {img.get('image_type', 'Photo')}
-                            </p>
-                            <p style="color: #555; font-size: 0.85rem; margin: 0.5rem 0;">
-                                {img.get('description', 'No description available')[:100]}...
-                            </p>
-                            <small style="color: #888;">
-                                Uploaded by: {img.get('contributor', 'Unknown')} | 
-                                Quality: {'⭐' * img.get('quality_score', 3)}
-                            </small>
-                        </div>
-                        """, unsafe_allow_html=True)
+        show_card_grid([
+            render_image_card(img, st.session_state.theme_mode, st.session_state.selected_language)
+            for img in filtered_images
+        ], columns=3)
     else:
         st.info("🖼️ No festival images uploaded yet. Be the first to share festival visuals!")
 
@@ -320,43 +299,7 @@ with tab3:
         st.markdown("**Holi Color Celebration**")
         st.caption("Vibrant colors of the spring festival")
     
-    for i in range(0, len(sample_images), 2):
-        cols = st.columns(2)
-        for j, col in enumerate(cols):
-            if i + j < len(sample_images):
-                img = sample_images[i + j]
-                with col:
-                    st.markdown(f"""
-                    <div style="
-                        border: 2px solid #FF7F50;
-                        border-radius: 15px;
-                        padding: 1.5rem;
-                        margin-bottom: 1rem;
-                        background: linear-gradient(145deg, #fff, #f8f9fa);
-                        box-shadow: 0 4px 8px rgba(255, 127, 80, 0.2);
-                    ">
-                        <div style="
-                            width: 100%;
-                            height: 200px;
-                            background: linear-gradient(45deg, #FF7F50, #FF6B35);
-                            border-radius: 10px;
-                            display: flex;
-                            align-items: center;
-                            justify-content: center;
-                            margin-bottom: 1rem;
-                        ">
-                            <span style="color: white; font-size: 3rem;">🖼️</span>
-                        </div>
-                        <h4 style="margin: 0 0 0.5rem 0; color: #FF6B35;">{img['title']}</h4>
-                        <p style="color: #666; font-size: 0.9rem; margin: 0.5rem 0;">
-                            <strong>Festival:</strong> {img['festival']}<br>
-                            <strong>Region:</strong> {img['region']}
-                        </p>
-                        <p style="color: #555; font-size: 0.9rem; margin: 0.5rem 0;">
-                            {img['description']}
-                        </p>
-                    </div>
-                    """, unsafe_allow_html=True)
+    show_card_grid([render_sample_image_card(img) for img in sample_images], columns=2)
 
 # Footer
 st.markdown("---")
@@ -0,0 +1,223 @@
+import json
+from datetime import datetime
+
+import streamlit as st
+
+from utils.auth import auth_sidebar, is_admin
+from utils.instrumentation import (
+    dump_instrumentation_json,
+    get_instrumentation_snapshot,
+    is_instrumentation_enabled,
+    reset_instrumentation,
+    set_instrumentation_enabled,
+)
+from utils.profiler import (
+    SLOW_RERUN_MS,
+    clear_page_profiles,
+    get_page_profiles,
+    get_page_summary,
+    get_section_summary,
+    is_profiling_enabled,
+    profile_page_run,
+    set_profiling_enabled,
+)
+from utils.theming import apply_chatgpt_theme
+
+# Profile this run when page profiling is on
+profile_page_run()
+
+st.set_page_config(page_title="Metrics", page_icon="📈", layout="wide")
+
+# Apply theming
+if 'theme_mode' not in st.session_state:
+    st.session_state.theme_mode = 'light'
+apply_chatgpt_theme(st.session_state.theme_mode)
+
+if not is_admin():
+    st.warning("🔒 This page is only available to administrators.")
+    with st.sidebar:
+        auth_sidebar()
+    st.stop()
+
+st.title("📈 Worker Metrics")
+st.markdown("Hot-path operation metrics and page rerun profiles recorded by this worker process.")
+
+def format_ms(value, bounds):
+    if value is None:
+        return "-"
+    if value == float('inf'):
+        return f">{bounds[-1]:,}"
+    return f"{value:,.1f}"
+
+def render_operations_tab():
+    """Latency, call counts and payload sizes of the instrumented operations."""
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        enabled = st.toggle("Recording enabled", value=is_instrumentation_enabled())
+        if enabled != is_instrumentation_enabled():
+            set_instrumentation_enabled(enabled)
+    with col2:
+        if st.button("🔄 Reset counters"):
+            reset_instrumentation()
+            st.rerun()
+    with col3:
+        st.download_button(
+            "📥 Download JSON",
+            data=dump_instrumentation_json(),
+            file_name=f"festivevoice_metrics_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
+            mime="application/json"
+        )
+
+    snapshot = get_instrumentation_snapshot()
+    bounds = snapshot['bucket_bounds_ms']
+    operations = {name: info for name, info in snapshot['operations'].items() if info['all']['count']}
+    st.caption(f"Recording since {snapshot['since'][:19]}")
+
+    if not operations:
+        st.info("No calls recorded yet.")
+        return
+
+    # Operations, slowest in total first
+    st.subheader("⏱️ Operations")
+    rows = []
+    for name, info in sorted(operations.items(), key=lambda item: item[1]['all']['total_ms'], reverse=True):
+        stats = info['all']
+        rows.append({
+            'Operation': name,
+            'Calls': stats['count'],
+            'Errors': stats['errors'],
+            'Total ms': round(stats['total_ms'], 1),
+            'Mean ms': round(stats['mean_ms'], 2),
+            'p50 ms': format_ms(stats['p50_ms'], bounds),
+            'p95 ms': format_ms(stats['p95_ms'], bounds),
+            'p99 ms': format_ms(stats['p99_ms'], bounds),
+            'Max ms': round(stats['max_ms'], 1),
+            'Mean payload': f"{stats['payload_mean']:,.0f} {info['unit']}"
+        })
+    st.dataframe(rows, use_container_width=True, hide_index=True)
+
+    # Time spent per page across all operations
+    st.subheader("📄 Pages")
+    page_totals = {}
+    for info in operations.values():
+        for page, stats in info['pages'].items():
+            totals = page_totals.setdefault(page, {'Page': page, 'Calls': 0, 'Total ms': 0.0})
+            totals['Calls'] += stats['count']
+            totals['Total ms'] += stats['total_ms']
+    page_rows = sorted(page_totals.values(), key=lambda row: row['Total ms'], reverse=True)
+    for row in page_rows:
+        row['Total ms'] = round(row['Total ms'], 1)
+    st.dataframe(page_rows, use_container_width=True, hide_index=True)
+
+    # Breakdown of one operation
+    st.subheader("🔍 Operation Detail")
+    selected = st.selectbox("Operation", [row['Operation'] for row in rows])
+    info = operations[selected]
+
+    detail_rows = []
+    for page, stats in sorted(info['pages'].items(), key=lambda item: item[1]['total_ms'], reverse=True):
+        detail_rows.append({
+            'Page': page,
+            'Calls': stats['count'],
+            'Errors': stats['errors'],
+            'Total ms': round(stats['total_ms'], 1),
+            'p95 ms': format_ms(stats['p95_ms'], bounds),
+            'Max ms': round(stats['max_ms'], 1),
+            f"Mean payload ({info['unit']})": stats['payload_mean'],
+            f"Max payload ({info['unit']})": stats['payload_max']
+        })
+    st.dataframe(detail_rows, use_container_width=True, hide_index=True)
+
+    labels = [f"≤{bound:g}ms" for bound in bounds] + [f">{bounds[-1]:g}ms"]
+    st.markdown("**Latency histogram (all pages)**")
+    st.dataframe([dict(zip(labels, info['all']['buckets']))], use_container_width=True, hide_index=True)
+
+def render_profiles_tab():
+    """Wall time of recent page reruns, split into data, compute and render, by page and section."""
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        enabled = st.toggle("Profile page reruns", value=is_profiling_enabled())
+        if enabled != is_profiling_enabled():
+            set_profiling_enabled(enabled)
+    with col2:
+        if st.button("🗑️ Clear profiles"):
+            clear_page_profiles()
+            st.rerun()
+
+    profiles = get_page_profiles()
+    with col3:
+        st.download_button(
+            "📥 Download JSON",
+            data=json.dumps(profiles, indent=2, ensure_ascii=False),
+            file_name=f"festivevoice_profiles_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
+            mime="application/json",
+            key="download_profiles"
+        )
+
+    if not profiles:
+        st.info("No page reruns profiled yet. Turn profiling on and use the app.")
+        return
+
+    # Slowest pages on average
+    st.subheader("🐢 Slowest Pages")
+    st.dataframe([
+        {
+            'Page': page['page'],
+            'Runs': page['runs'],
+            'Mean ms': page['mean_ms'],
+            'Max ms': page['max_ms'],
+            'Data ms': page['split_ms']['data'],
+            'Compute ms': page['split_ms']['compute'],
+            'Render ms': page['split_ms']['render'],
+            f"Runs over {SLOW_RERUN_MS:g}ms": page['slow_runs']
+        }
+        for page in get_page_summary()
+    ], use_container_width=True, hide_index=True)
+
+    # Sections taking the most time across runs
+    st.subheader("📑 Slowest Sections")
+    st.dataframe([
+        {
+            'Page': section['page'],
+            'Section': section['section'],
+            'From line': section['line'],
+            'Runs': section['runs'],
+            'Total ms': section['total_ms']
+        }
+        for section in get_section_summary()[:30]
+    ], use_container_width=True, hide_index=True)
+
+    # Individual reruns, newest first
+    st.subheader("🕑 Recent Reruns")
+    st.dataframe([
+        {
+            'Started': profile['started_at'][11:23],
+            'Page': profile['page'],
+            'Wall ms': profile['wall_ms'],
+            'Data ms': profile['split_ms']['data'],
+            'Compute ms': profile['split_ms']['compute'],
+            'Render ms': profile['split_ms']['render'],
+            'Samples': profile['samples'],
+            'Top section': profile['sections'][0]['section'] if profile['sections'] else "-"
+        }
+        for profile in profiles
+    ], use_container_width=True, hide_index=True)
+
+    # Sampled stacks of slow reruns
+    slow_profiles = [profile for profile in profiles if profile['slow']]
+    if slow_profiles:
+        st.subheader("🔬 Slow Rerun Stacks")
+        choice = st.selectbox(
+            "Rerun",
+            range(len(slow_profiles)),
+            format_func=lambda i: f"{slow_profiles[i]['started_at'][11:19]} · {slow_profiles[i]['page']} · {slow_profiles[i]['wall_ms']:,.0f} ms"
+        )
+        for entry in slow_profiles[choice]['stacks']:
+            st.markdown(f"**{entry['ms']:,.1f} ms**")
+            st.code(entry['stack'].replace(";", "\n  → "), language=None)
+
+operations_tab, profiles_tab = st.tabs(["⏱️ Operations", "🧭 Page Profiles"])
+with operations_tab:
+    render_operations_tab()
+with profiles_tab:
+    render_profiles_tab()
@@ -0,0 +1,28 @@
+"""
+Start FestiveVoice with the warm-up routine running from server start.
+
+Equivalent to `streamlit run app.py`, except that the corpus indexes, theme
+stylesheets, AI clients and password hashing pool are built in a background
+thread while the server boots. Set FESTIVEVOICE_STATUS_PORT to expose /ready
+for load balancer health checks.
+
+Usage:
+    python run.py --server.port 5000 --server.address 0.0.0.0
+"""
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+if __name__ == "__main__":
+    # Data paths are relative to the project root
+    os.chdir(ROOT)
+    sys.path.insert(0, ROOT)
+
+    from streamlit.web import cli as stcli
+
+    from utils.warmup import start_warmup
+
+    start_warmup()
+    sys.argv = ["streamlit", "run", os.path.join(ROOT, "app.py")] + sys.argv[1:]
+    sys.exit(stcli.main())
@@ -0,0 +1,54 @@
+import os
+
+import pytest
+
+from utils import partitions
+
+
+@pytest.fixture
+def partition_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(partitions, "PARTITION_DIR", str(tmp_path))
+    monkeypatch.setattr(partitions, "MANIFEST_PATH", str(tmp_path / "manifest.json"))
+    monkeypatch.setattr(partitions, "_loaded", {})
+    monkeypatch.setattr(partitions, "_unreadable", set())
+    return tmp_path
+
+
+def _entry(entry_id, month):
+    return {'id': entry_id, 'type': 'cultural_fact', 'timestamp': f"{month}-15T12:00:00"}
+
+
+def test_round_trip(partition_dir):
+    entries = [_entry('a', '2020-01'), _entry('b', '2020-02'), {'id': 'c'}]
+    partitions.write_partitions(entries)
+    partitions._loaded.clear()
+
+    assert sorted(entry['id'] for entry in partitions.read_partitions()) == ['a', 'b', 'c']
+    assert set(partitions.load_manifest()) == {'2020-01', '2020-02', partitions.UNDATED}
+
+
+def test_unreadable_partition_survives_full_write(partition_dir):
+    partitions.write_partitions([_entry('a', '2020-01'), _entry('b', '2020-02')])
+    corrupt = partition_dir / partitions.load_manifest()['2020-01']['file']
+    corrupt.write_bytes(b"not json")
+    partitions._loaded.clear()
+
+    entries = partitions.read_partitions()
+    assert [entry['id'] for entry in entries] == ['b']
+
+    partitions.write_partitions(entries)
+    assert corrupt.read_bytes() == b"not json"
+    assert '2020-01' in partitions.load_manifest()
+
+
+def test_adding_to_unreadable_partition_fails(partition_dir):
+    partitions.write_partitions([_entry('a', '2020-01')])
+    corrupt = partition_dir / partitions.load_manifest()['2020-01']['file']
+    corrupt.write_bytes(b"not json")
+    partitions._loaded.clear()
+
+    entries = partitions.read_partitions() + [_entry('b', '2020-01')]
+    with pytest.raises(OSError):
+        partitions.write_partitions(entries, months={'2020-01'})
+    assert corrupt.read_bytes() == b"not json"
+    assert os.path.exists(partitions.MANIFEST_PATH)
@@ -1,7 +1,41 @@
 import os
 import json
+import threading
 from typing import Dict, Any, List, Optional
+from utils.lazy_imports import lazy_import
+from utils.instrumentation import instrument
 
+# SDKs are imported on first use, and only when their API key is set
+openai = lazy_import("openai")
+anthropic = lazy_import("anthropic")
+
+# API clients are built once per process and shared by all sessions
+_clients = {}
+_clients_lock = threading.Lock()
+
+def get_openai_client():
+    """Get the shared OpenAI client, or None if no API key is configured."""
+    api_key = os.environ.get("OPENAI_API_KEY")
+    if not api_key:
+        return None
+    with _clients_lock:
+        if _clients.get('openai_key') != api_key:
+            _clients['openai'] = openai.OpenAI(api_key=api_key)
+            _clients['openai_key'] = api_key
+        return _clients['openai']
+
+def get_anthropic_client():
+    """Get the shared Anthropic client, or None if no API key is configured."""
+    api_key = os.environ.get("ANTHROPIC_API_KEY")
+    if not api_key:
+        return None
+    with _clients_lock:
+        if _clients.get('anthropic_key') != api_key:
+            _clients['anthropic'] = anthropic.Anthropic(api_key=api_key)
+            _clients['anthropic_key'] = api_key
+        return _clients['anthropic']
+
+@instrument("ai_validation.validate_content", payload=lambda args, kwargs, result: len(args[0]), unit="chars")
 def validate_content(content: str, content_type: str) -> Dict[str, Any]:
     """
     Validate user-contributed content using AI models.
@@ -19,17 +53,14 @@ def validate_content(content: str, content_type: str) -> Dict[str, Any]:
             print(f"Anthropic validation failed: {e}")
             return basic_validation(content, content_type)
 
+@instrument("ai_validation.validate_with_openai", payload=lambda args, kwargs, result: len(args[0]), unit="chars")
 def validate_with_openai(content: str, content_type: str) -> Dict[str, Any]:
     """Validate content using OpenAI API."""
     try:
-        from openai import OpenAI
-        
-        OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY")
-        if not OPENAI_API_KEY:
+        client = get_openai_client()
+        if client is None:
             raise Exception("OpenAI API key not found")
         
-        client = OpenAI(api_key=OPENAI_API_KEY)
-        
         prompt = f"""
         Analyze the following {content_type} content for quality and cultural accuracy:
 
@@ -86,17 +117,14 @@ def validate_with_openai(content: str, content_type: str) -> Dict[str, Any]:
     except Exception as e:
         raise Exception(f"OpenAI validation error: {e}")
 
+@instrument("ai_validation.validate_with_anthropic", payload=lambda args, kwargs, result: len(args[0]), unit="chars")
 def validate_with_anthropic(content: str, content_type: str) -> Dict[str, Any]:
     """Validate content using Anthropic Claude API."""
     try:
-        import anthropic
-        
-        ANTHROPIC_API_KEY = os.environ.get("ANTHROPIC_API_KEY")
-        if not ANTHROPIC_API_KEY:
+        client = get_anthropic_client()
+        if client is None:
             raise Exception("Anthropic API key not found")
         
-        client = anthropic.Anthropic(api_key=ANTHROPIC_API_KEY)
-        
         prompt = f"""
         Analyze this {content_type} content for cultural accuracy and educational value:
 
@@ -150,6 +178,7 @@ def validate_with_anthropic(content: str, content_type: str) -> Dict[str, Any]:
     except Exception as e:
         raise Exception(f"Anthropic validation error: {e}")
 
+@instrument("ai_validation.basic_validation", payload=lambda args, kwargs, result: len(args[0]), unit="chars")
 def basic_validation(content: str, content_type: str) -> Dict[str, Any]:
     """
     Basic validation when AI APIs are unavailable.
@@ -1,14 +1,24 @@
 import streamlit as st
 import json
-import hashlib
 from datetime import datetime
 import os
 from threading import Lock
+from utils.password_hashing import hash_password, verify_password
+from utils.data_manager import get_contributor_count
+from utils.session_memory import clear_session_contributions
+from utils.instrumentation import instrument
+from utils.replication import is_follower, ship_users
 
 # File lock for thread-safe operations
 auth_lock = Lock()
 AUTH_FILE = "data/users.json"
 
+# Size of users.json as last read or written, for the metrics endpoint
+_users_file = {'bytes': 0, 'users': 0}
+
+# Usernames allowed on admin pages, in addition to users whose role is 'admin'
+ADMIN_USERS = {name.strip() for name in os.environ.get("FESTIVEVOICE_ADMIN_USERS", "").split(",") if name.strip()}
+
 def ensure_auth_file():
     """Ensure the auth file exists"""
     os.makedirs("data", exist_ok=True)
@@ -16,32 +26,57 @@ def ensure_auth_file():
         with open(AUTH_FILE, 'w') as f:
             json.dump({}, f)
 
-def hash_password(password: str) -> str:
-    """Hash password using SHA-256"""
-    return hashlib.sha256(password.encode()).hexdigest()
-
+@instrument("auth.load_users", payload=lambda args, kwargs, result: len(result), unit="users")
 def load_users():
     """Load users from JSON file"""
     ensure_auth_file()
     try:
         with auth_lock:
             with open(AUTH_FILE, 'r') as f:
-                return json.load(f)
+                users = json.load(f)
+                _users_file['bytes'] = os.fstat(f.fileno()).st_size
+        _users_file['users'] = len(users)
+        return users
     except:
         return {}
 
+@instrument("auth.save_users", payload=lambda args, kwargs, result: len(args[0]), unit="users", failed=lambda result: result is False)
 def save_users(users_data):
     """Save users to JSON file"""
+    # Read replicas take the users store from the primary
+    if is_follower():
+        print("save_users refused: this worker is a read replica, send writes to the primary")
+        return False
     ensure_auth_file()
     try:
-        with auth_lock:
-            with open(AUTH_FILE, 'w') as f:
-                json.dump(users_data, f, indent=2)
+        _write_users_file(users_data)
+        ship_users(users_data)
         return True
     except Exception as e:
         st.error(f"Error saving user data: {e}")
         return False
 
+def _write_users_file(users_data):
+    with auth_lock:
+        with open(AUTH_FILE, 'w') as f:
+            json.dump(users_data, f, indent=2)
+            _users_file['bytes'] = f.tell()
+    _users_file['users'] = len(users_data)
+
+def apply_replica_users(users_data):
+    """Replace the users store with the primary's copy, on a read replica"""
+    ensure_auth_file()
+    try:
+        _write_users_file(users_data)
+        return True
+    except Exception as e:
+        print(f"Error applying replica users: {e}")
+        return False
+
+def get_users_file_stats():
+    """Get the size in bytes and user count of users.json as last read or written"""
+    return dict(_users_file)
+
 def register_user(username, email, password, region, full_name=""):
     """Register a new user"""
     users = load_users()
@@ -63,7 +98,6 @@ def register_user(username, email, password, region, full_name=""):
         'full_name': full_name,
         'registration_date': datetime.now().isoformat(),
         'last_login': None,
-        'contributions_count': 0,
         'role': 'user'
     }
     
@@ -80,9 +114,14 @@ def authenticate_user(username, password):
         return False, "Invalid username or password"
     
     user_data = users[username]
-    if user_data['password_hash'] != hash_password(password):
+    is_valid, needs_rehash = verify_password(password, user_data.get('password_hash', ''))
+    if not is_valid:
         return False, "Invalid username or password"
     
+    # Upgrade legacy SHA-256 or outdated scrypt hashes now that we know the password
+    if needs_rehash:
+        users[username]['password_hash'] = hash_password(password)
+    
     # Update last login
     users[username]['last_login'] = datetime.now().isoformat()
     save_users(users)
@@ -95,15 +134,12 @@ def get_user_data(username):
     return users.get(username)
 
 def update_user_contributions(username):
-    """Update user contribution count"""
-    users = load_users()
-    if username in users:
-        users[username]['contributions_count'] = users[username].get('contributions_count', 0) + 1
-        save_users(users)
-        
-        # Also update session state if this user is currently logged in
-        if is_logged_in() and get_current_user().get('username') == username:
-            st.session_state.authenticated_user['contributions_count'] = users[username]['contributions_count']
+    """
+    Refresh the session's contribution count after a submission.
+    Counts are derived from the corpus index, so nothing is written to users.json.
+    """
+    if is_logged_in() and st.session_state.authenticated_user.get('username') == username:
+        st.session_state.authenticated_user['contributions_count'] = get_contributor_count(username)
 
 def is_logged_in():
     """Check if user is logged in"""
@@ -112,7 +148,7 @@ def is_logged_in():
 def get_current_user():
     """Get current logged in user data"""
     if is_logged_in():
-        # Get fresh user data from file to ensure we have latest contribution count
+        # Get fresh user data from file to ensure we have the latest profile
         username = st.session_state.authenticated_user.get('username')
         if username:
             fresh_user_data = get_user_data(username)
@@ -120,15 +156,28 @@ def get_current_user():
                 # Update session with fresh data
                 st.session_state.authenticated_user.update(fresh_user_data)
                 st.session_state.authenticated_user['username'] = username
+            # Contribution count comes from the corpus index, not users.json
+            st.session_state.authenticated_user['contributions_count'] = get_contributor_count(username)
         return st.session_state.authenticated_user
     return None
 
+def is_admin():
+    """Check if the logged in user may see admin pages"""
+    if not is_logged_in():
+        return False
+    username = st.session_state.authenticated_user.get('username')
+    if username in ADMIN_USERS:
+        return True
+    user = get_user_data(username) or {}
+    return user.get('role') == 'admin'
+
 def logout_user():
     """Logout current user"""
     if 'authenticated_user' in st.session_state:
         del st.session_state.authenticated_user
     if 'user_profile' in st.session_state:
         del st.session_state.user_profile
+    clear_session_contributions()
 
 def login_form():
     """Display login form"""
@@ -0,0 +1,310 @@
+"""
+Incremental, compressed corpus backups with retention and point-in-time restore.
+
+Backups go to BACKUP_DIR as gzip files: base snapshots of the whole corpus,
+and deltas holding the change log records (see data_manager.changes_since)
+made since the previous backup, so a routine backup costs I/O in proportion
+to the changes rather than the corpus. manifest.json lists every file with
+the sequence numbers it covers and its SHA-256. A new base is taken every
+BASE_EVERY backups, and whenever the change log can't provide the delta (it
+was trimmed, or the corpus was replaced as a whole). The newest KEEP_BASES
+bases and the deltas after them are kept.
+
+The process that owns the corpus backs up every BACKUP_INTERVAL_SECONDS once
+it has written something. From the command line:
+
+    python -m utils.backups list
+    python -m utils.backups backup [--full]
+    python -m utils.backups verify
+    python -m utils.backups restore --at 2026-10-19T12:00:00 [--output restored.json]
+
+restore rebuilds the corpus as of --at (default: the newest backup) from the
+base before it and the changes after that base up to --at, checking every
+file against its checksum first.
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+BACKUP_DIR = os.environ.get("FESTIVEVOICE_BACKUP_DIR", "data/backups")
+# Seconds between scheduled backups; 0 turns the schedule off
+BACKUP_INTERVAL_SECONDS = float(os.environ.get("FESTIVEVOICE_BACKUP_INTERVAL", 3600))
+# Backups per base snapshot: a base, then BASE_EVERY - 1 deltas
+BASE_EVERY = int(os.environ.get("FESTIVEVOICE_BACKUP_BASE_EVERY", 24))
+# Base snapshots kept, with the deltas that follow each
+KEEP_BASES = int(os.environ.get("FESTIVEVOICE_BACKUP_KEEP", 7))
+MANIFEST_FILE = "manifest.json"
+COMPRESS_LEVEL = 6
+# Changes read from the change log per call while building a delta
+CHANGES_PER_READ = 1000
+
+# Held while a backup is taken. take_backup reads the corpus, which takes
+# data_manager's file_lock, so never acquire this with file_lock held.
+_backup_lock = threading.Lock()
+_schedule = {'thread': None}
+_schedule_lock = threading.Lock()
+
+class BackupError(Exception):
+    """A backup file is missing or does not match its checksum."""
+
+def _manifest_path() -> str:
+    return os.path.join(BACKUP_DIR, MANIFEST_FILE)
+
+def load_manifest() -> List[Dict[str, Any]]:
+    """Get the backups taken so far, oldest first."""
+    try:
+        with open(_manifest_path(), 'r', encoding='utf-8') as f:
+            return json.load(f)['backups']
+    except FileNotFoundError:
+        return []
+
+def _save_manifest(backups: List[Dict[str, Any]]):
+    tmp_path = f"{_manifest_path()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'backups': backups}, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, _manifest_path())
+
+def _write_compressed(name: str, data: bytes) -> Dict[str, Any]:
+    """Write data gzipped to BACKUP_DIR/name; returns its size and checksum."""
+    compressed = gzip.compress(data, compresslevel=COMPRESS_LEVEL)
+    path = os.path.join(BACKUP_DIR, name)
+    with open(f"{path}.tmp", 'wb') as f:
+        f.write(compressed)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(f"{path}.tmp", path)
+    return {'file': name, 'bytes': len(compressed), 'sha256': hashlib.sha256(compressed).hexdigest()}
+
+def _read_compressed(backup: Dict[str, Any]) -> bytes:
+    """Read a backup file, checking it against the manifest."""
+    path = os.path.join(BACKUP_DIR, backup['file'])
+    try:
+        with open(path, 'rb') as f:
+            compressed = f.read()
+    except FileNotFoundError:
+        raise BackupError(f"{backup['file']} is missing")
+    if hashlib.sha256(compressed).hexdigest() != backup['sha256']:
+        raise BackupError(f"{backup['file']} does not match its checksum")
+    return gzip.decompress(compressed)
+
+def _changes_after(seq: int) -> Optional[List[Dict[str, Any]]]:
+    """Every change after seq, or None if the change log can't provide them."""
+    from utils.data_manager import changes_since
+
+    changes = []
+    while True:
+        feed = changes_since(seq, CHANGES_PER_READ)
+        if feed['reset']:
+            return None
+        if not feed['changes']:
+            return changes
+        changes.extend(feed['changes'])
+        seq = feed['seq']
+
+def take_backup(full: bool = False) -> Optional[Dict[str, Any]]:
+    """
+    Back up the corpus: a delta of the changes since the last backup, or a
+    base snapshot when one is due, full is set, or no delta can be built.
+
+    Returns:
+        dict: The manifest record of the new backup, or None if nothing
+        changed since the last one
+    """
+    from utils.data_manager import get_latest_sequence, get_replication_snapshot
+
+    with _backup_lock:
+        os.makedirs(BACKUP_DIR, exist_ok=True)
+        backups = load_manifest()
+        last = backups[-1] if backups else None
+        since_base = 0
+        for backup in reversed(backups):
+            since_base += 1
+            if backup['kind'] == 'base':
+                break
+
+        if last and not full and get_latest_sequence() == last['seq']:
+            return None
+
+        created_at = datetime.now()
+        stamp = created_at.strftime("%Y%m%d_%H%M%S_%f")
+        changes = None
+        if last and not full and since_base < BASE_EVERY:
+            changes = _changes_after(last['seq'])
+
+        if changes:
+            lines = "".join(json.dumps(change, ensure_ascii=False) + "\n" for change in changes)
+            record = {
+                'kind': 'delta',
+                'from_seq': last['seq'],
+                'seq': changes[-1]['seq'],
+                'count': len(changes),
+                **_write_compressed(f"delta_{stamp}_{changes[-1]['seq']}.jsonl.gz", lines.encode('utf-8'))
+            }
+        elif changes is None:
+            snapshot = get_replication_snapshot()
+            data = json.dumps(snapshot, ensure_ascii=False).encode('utf-8')
+            record = {
+                'kind': 'base',
+                'seq': snapshot['seq'],
+                'count': len(snapshot['entries']),
+                **_write_compressed(f"base_{stamp}_{snapshot['seq']}.json.gz", data)
+            }
+        else:
+            return None
+
+        record['created_at'] = created_at.isoformat()
+        backups.append(record)
+        _save_manifest(_apply_retention(backups))
+        return record
+
+def _apply_retention(backups: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Drop bases beyond KEEP_BASES, with their deltas, deleting their files."""
+    base_positions = [i for i, backup in enumerate(backups) if backup['kind'] == 'base']
+    if len(base_positions) <= KEEP_BASES:
+        return backups
+    first_kept = base_positions[-KEEP_BASES]
+    for backup in backups[:first_kept]:
+        try:
+            os.remove(os.path.join(BACKUP_DIR, backup['file']))
+        except FileNotFoundError:
+            pass
+    return backups[first_kept:]
+
+def verify_backups() -> List[str]:
+    """Check every backup file against its checksum. Returns the problems found."""
+    problems = []
+    expected = None
+    for backup in load_manifest():
+        try:
+            _read_compressed(backup)
+        except BackupError as e:
+            problems.append(str(e))
+        if backup['kind'] == 'delta' and backup['from_seq'] != expected:
+            problems.append(f"{backup['file']} does not follow the backup before it")
+        expected = backup['seq']
+    return problems
+
+def _apply_changes(entries: List[Dict[str, Any]], changes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Apply add, update and delete change records to a list of entries."""
+    positions = {entry.get('id'): i for i, entry in enumerate(entries)}
+    deleted = set()
+    for change in changes:
+        if change['op'] == 'add':
+            positions[change['entry'].get('id')] = len(entries)
+            entries.append(change['entry'])
+            continue
+        position = positions.get(change['id'])
+        if position is None or position in deleted:
+            continue
+        if change['op'] == 'update':
+            entries[position] = {**entries[position], **change['patch']}
+        elif change['op'] == 'delete':
+            deleted.add(position)
+    return [entry for i, entry in enumerate(entries) if i not in deleted]
+
+def restore_backup(at: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Rebuild the corpus as of the ISO time at (default: the newest backup).
+
+    Returns:
+        dict: 'entries', 'seq' (last change included) and 'files' read
+    """
+    backups = load_manifest()
+    if at is not None:
+        # The base must predate the restore point; deltas may end after it
+        candidates = [i for i, backup in enumerate(backups) if backup['kind'] == 'base' and backup['created_at'] <= at]
+    else:
+        candidates = [i for i, backup in enumerate(backups) if backup['kind'] == 'base']
+    if not candidates:
+        raise BackupError("no base backup taken before that time")
+
+    start = candidates[-1]
+    snapshot = json.loads(_read_compressed(backups[start]))
+    entries, seq = snapshot['entries'], snapshot['seq']
+    files = [backups[start]['file']]
+    for backup in backups[start + 1:]:
+        if backup['kind'] == 'base' or backup['from_seq'] != seq:
+            break
+        changes = [json.loads(line) for line in _read_compressed(backup).splitlines()]
+        if at is not None:
+            changes = [change for change in changes if change['at'] <= at]
+        if changes:
+            entries = _apply_changes(entries, changes)
+            seq = changes[-1]['seq']
+        files.append(backup['file'])
+        if seq != backup['seq']:
+            # The restore point falls inside this delta
+            break
+    return {'entries': entries, 'seq': seq, 'files': files}
+
+def start_backup_schedule():
+    """Back up every BACKUP_INTERVAL_SECONDS from a daemon thread, once per process."""
+    # Called after every corpus write; once started, return without locking
+    if _schedule['thread'] is not None or BACKUP_INTERVAL_SECONDS <= 0:
+        return
+    with _schedule_lock:
+        if _schedule['thread'] is not None:
+            return
+        _schedule['thread'] = threading.Thread(target=_backup_periodically, name="corpus-backups", daemon=True)
+        _schedule['thread'].start()
+
+def _backup_periodically():
+    from utils.data_manager import backup_corpus_data
+
+    while True:
+        time.sleep(BACKUP_INTERVAL_SECONDS)
+        backup_corpus_data()
+
+def main():
+    parser = argparse.ArgumentParser(description="List, take, verify and restore corpus backups.")
+    parser.add_argument("command", choices=["list", "backup", "verify", "restore"])
+    parser.add_argument("--full", action="store_true", help="backup: take a base snapshot")
+    parser.add_argument("--at", default=None, help="restore: ISO time to restore to (default: newest backup)")
+    parser.add_argument("--output", default=None, help="restore: write the corpus to this file instead of replacing the live one")
+    args = parser.parse_args()
+
+    if args.command == "list":
+        for backup in load_manifest():
+            covers = f"{backup.get('from_seq', '')}..{backup['seq']}" if backup['kind'] == 'delta' else f"at {backup['seq']}"
+            print(f"{backup['created_at']}  {backup['kind']:<5}  {covers:<16} {backup['count']:>8} "
+                  f"{backup['bytes'] / 1024:>10.1f} KB  {backup['file']}")
+        return 0
+
+    if args.command == "backup":
+        from utils.data_manager import backup_corpus_data
+        return 0 if backup_corpus_data(full=args.full) else 1
+
+    if args.command == "verify":
+        problems = verify_backups()
+        for problem in problems:
+            print(problem)
+        print(f"{len(load_manifest())} backups, {len(problems)} problems")
+        return 1 if problems else 0
+
+    start = time.perf_counter()
+    try:
+        restored = restore_backup(args.at)
+    except BackupError as e:
+        print(f"Restore failed: {e}")
+        return 1
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(restored['entries'], f, indent=2, ensure_ascii=False)
+    else:
+        from utils.data_manager import save_corpus_data
+        if not save_corpus_data(restored['entries']):
+            return 1
+    print(f"Restored {len(restored['entries'])} entries as of change {restored['seq']} "
+          f"from {len(restored['files'])} files in {time.perf_counter() - start:.2f}s")
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,470 @@
+"""
+Card rendering for the FestiveVoice pages.
+
+Cards are built from templates compiled once at import and styled by shared
+classes that ship in the theme stylesheet (see build_card_css), so a whole
+row or grid of cards is sent as one st.markdown payload instead of one
+inline-styled block per card. Cards for corpus entries are cached by
+(entry id, updated_at, theme, language): update_entry sets a new updated_at,
+so an edited entry is rendered afresh rather than served from the cache.
+"""
+import html
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from string import Template
+from typing import Any, Callable, Dict, List, Optional
+
+import streamlit as st
+
+ENTRY_CARD_CACHE_SIZE = 1024
+
+# Colour sets for the statistic and entry cards:
+# background, border, label, value, progress track
+CARD_TONES = {
+    'neutral': ('#F8F9FA', '#E9ECEF', '#6C757D', '#495057', '#E9ECEF'),
+    'green': ('#E8F5E8', '#4CAF50', '#2E7D32', '#1B5E20', '#C8E6C9'),
+    'blue': ('#E3F2FD', '#2196F3', '#1976D2', '#0D47A1', '#BBDEFB'),
+    'orange': ('#FFF3E0', '#FF9800', '#F57C00', '#E65100', '#FFE0B2'),
+    'purple': ('#F3E5F5', '#9C27B0', '#7B1FA2', '#4A148C', '#E1BEE7'),
+}
+
+# Accent tone and fallback title for each entry type shown in the gallery
+ENTRY_STYLES = {
+    'voice_story': ('green', '🎙️', 'title', 'Untitled Voice Story'),
+    'video_tradition': ('blue', '📹', 'title', 'Untitled Video'),
+    'festival_event': ('orange', '🎊', 'name', 'Untitled Festival'),
+    'cultural_story': ('purple', '📚', 'title', 'Untitled Story'),
+}
+
+_STAT_CARD = Template(
+    '<div class="fv-stat fv-tone-$tone$extra_class">'
+    '<h3 class="fv-stat-label">$label</h3>'
+    '<h$value_level class="fv-stat-value">$value</h$value_level>'
+    '$progress'
+    '</div>'
+)
+_PROGRESS_BAR = Template(
+    '<div class="fv-progress"><div class="fv-progress-fill" style="width: $percent%;"></div></div>'
+    '<small class="fv-stat-caption">$caption</small>'
+)
+_CONTRIBUTOR_CARD = Template(
+    '<div class="fv-contributor"><h4>$name</h4><p>$count contributions</p></div>'
+)
+_GRID = Template('<div class="fv-grid fv-grid-$columns">$cards</div>')
+_ENTRY_HEADER = Template(
+    '<div class="fv-entry fv-tone-$tone">'
+    '<h4 class="fv-entry-title">$icon $title</h4>'
+    '<p class="fv-entry-meta">By $contributor • $date • $region</p>'
+    '</div>'
+)
+_IMAGE_CARD = Template(
+    '<div class="fv-image-card">'
+    '<h4>$title</h4>'
+    '<p class="fv-image-meta"><strong>Festival:</strong> $festival<br>'
+    '<strong>Region:</strong> $region<br>'
+    '<strong>Type:</strong> $image_type</p>'
+    '<p class="fv-image-description">$description...</p>'
+    '<small>Uploaded by: $contributor | Quality: $stars</small>'
+    '</div>'
+)
+_SAMPLE_IMAGE_CARD = Template(
+    '<div class="fv-image-card fv-image-sample">'
+    '<div class="fv-image-placeholder"><span>🖼️</span></div>'
+    '<h4>$title</h4>'
+    '<p class="fv-image-meta"><strong>Festival:</strong> $festival<br>'
+    '<strong>Region:</strong> $region</p>'
+    '<p class="fv-image-description">$description</p>'
+    '</div>'
+)
+
+_fragment_cache: "OrderedDict[tuple, str]" = OrderedDict()
+_fragment_lock = threading.Lock()
+_fragment_stats = {'hits': 0, 'misses': 0}
+
+def build_card_css(colors: Dict[str, str]) -> str:
+    """
+    Build the card classes for a theme.
+
+    Args:
+        colors: Theme colors from get_theme_colors
+
+    Returns:
+        str: CSS appended to the theme stylesheet
+    """
+    tones = "\n".join(
+        f".fv-tone-{name} {{ --fv-bg: {bg}; --fv-border: {border}; --fv-label: {label}; "
+        f"--fv-value: {value}; --fv-track: {track}; }}"
+        for name, (bg, border, label, value, track) in CARD_TONES.items()
+    )
+
+    return f"""
+    /* Card grids */
+    .fv-grid {{
+        display: grid;
+        gap: 1rem;
+        margin-bottom: 1rem;
+    }}
+
+    .fv-grid-1 {{ grid-template-columns: minmax(0, 1fr); }}
+    .fv-grid-2 {{ grid-template-columns: repeat(2, minmax(0, 1fr)); }}
+    .fv-grid-3 {{ grid-template-columns: repeat(3, minmax(0, 1fr)); }}
+    .fv-grid-4 {{ grid-template-columns: repeat(4, minmax(0, 1fr)); }}
+    .fv-grid-5 {{ grid-template-columns: repeat(5, minmax(0, 1fr)); }}
+
+    @media (max-width: 768px) {{
+        .fv-grid {{ grid-template-columns: minmax(0, 1fr); }}
+    }}
+
+    {tones}
+
+    /* Statistic cards */
+    .fv-stat {{
+        background-color: var(--fv-bg);
+        padding: 1.5rem;
+        border-radius: 10px;
+        text-align: center;
+        border: 1px solid var(--fv-border);
+    }}
+
+    .fv-stat-label {{
+        margin: 0;
+        color: var(--fv-label);
+    }}
+
+    .fv-stat-value {{
+        margin: 0.5rem 0 0 0;
+        color: var(--fv-value);
+    }}
+
+    .fv-stat-compact .fv-stat-label {{
+        font-size: 0.9rem;
+        font-weight: normal;
+    }}
+
+    .fv-stat-compact .fv-stat-value {{
+        font-size: 2.5rem;
+        font-weight: bold;
+    }}
+
+    .fv-stat-progress {{
+        border-width: 2px;
+    }}
+
+    .fv-stat-progress .fv-stat-value {{
+        font-size: 2rem;
+    }}
+
+    .fv-progress {{
+        background-color: var(--fv-track);
+        border-radius: 10px;
+        margin-top: 0.5rem;
+    }}
+
+    .fv-progress-fill {{
+        background-color: var(--fv-border);
+        height: 8px;
+        border-radius: 10px;
+    }}
+
+    .fv-stat-caption {{
+        color: var(--fv-label);
+    }}
+
+    /* Contributor cards */
+    .fv-contributor {{
+        background-color: #F8F9FA;
+        padding: 1rem;
+        border-radius: 8px;
+        text-align: center;
+        border: 1px solid #DEE2E6;
+    }}
+
+    .fv-contributor h4 {{
+        margin: 0;
+        color: #495057;
+    }}
+
+    .fv-contributor p {{
+        margin: 0.5rem 0 0 0;
+        color: #6C757D;
+    }}
+
+    /* Gallery entry headers */
+    .fv-entry {{
+        background-color: #F8F9FA;
+        padding: 1.5rem;
+        border-radius: 10px;
+        margin-bottom: 1rem;
+        border-left: 4px solid var(--fv-border);
+    }}
+
+    .fv-entry-title {{
+        margin: 0 0 0.5rem 0;
+        color: var(--fv-label);
+    }}
+
+    .fv-entry-meta {{
+        margin: 0;
+        color: #666;
+        font-size: 0.9em;
+    }}
+
+    /* Festival image cards */
+    .fv-image-card {{
+        border: 1px solid #ddd;
+        border-radius: 10px;
+        padding: 1rem;
+        background: white;
+        box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+    }}
+
+    .fv-image-card h4 {{
+        margin: 0 0 0.5rem 0;
+        color: #333;
+    }}
+
+    .fv-image-meta {{
+        color: #666;
+        font-size: 0.9rem;
+        margin: 0.5rem 0;
+    }}
+
+    .fv-image-description {{
+        color: #555;
+        font-size: 0.85rem;
+        margin: 0.5rem 0;
+    }}
+
+    .fv-image-card small {{
+        color: #888;
+    }}
+
+    .fv-image-sample {{
+        border: 2px solid #FF7F50;
+        border-radius: 15px;
+        padding: 1.5rem;
+        background: linear-gradient(145deg, #fff, #f8f9fa);
+        box-shadow: 0 4px 8px rgba(255, 127, 80, 0.2);
+    }}
+
+    .fv-image-sample h4 {{
+        color: #FF6B35;
+    }}
+
+    .fv-image-placeholder {{
+        width: 100%;
+        height: 200px;
+        background: linear-gradient(45deg, #FF7F50, #FF6B35);
+        border-radius: 10px;
+        display: flex;
+        align-items: center;
+        justify-content: center;
+        margin-bottom: 1rem;
+    }}
+
+    .fv-image-placeholder span {{
+        color: white;
+        font-size: 3rem;
+    }}
+
+    /* Styled cards (create_styled_card) */
+    .fv-card {{
+        background-color: {colors['secondary_bg']};
+        padding: 1.5rem;
+        border-radius: 12px;
+        border: 1px solid {colors['border_color']};
+        margin: 1rem 0;
+        color: {colors['text_color']};
+        box-shadow: 0 1px 3px rgba(0,0,0,0.1);
+        transition: all 0.2s;
+    }}
+
+    .fv-card h4 {{
+        margin-top: 0;
+        color: {colors['text_color']};
+    }}
+
+    .fv-card-success {{
+        background-color: rgba(16, 163, 127, 0.1);
+        border-color: {colors['success_color']};
+    }}
+
+    .fv-card-warning {{
+        background-color: rgba(245, 158, 11, 0.1);
+        border-color: {colors['warning_color']};
+    }}
+
+    .fv-card-error {{
+        background-color: rgba(239, 68, 68, 0.1);
+        border-color: {colors['error_color']};
+    }}
+
+    .fv-card-info {{
+        background-color: rgba(59, 130, 246, 0.1);
+        border-color: {colors['info_color']};
+    }}
+
+    /* Message bubbles (create_chatgpt_message) */
+    .fv-message {{
+        background-color: {colors['secondary_bg']};
+        color: {colors['text_color']};
+        padding: 1rem 1.5rem;
+        border-radius: 12px;
+        margin: 1rem 20% 1rem 0;
+        box-shadow: 0 1px 3px rgba(0,0,0,0.1);
+        max-width: 80%;
+    }}
+
+    .fv-message-user {{
+        background-color: {colors['accent_color']};
+        color: white;
+        margin: 1rem 0 1rem 20%;
+    }}
+
+    .fv-message-body {{
+        display: flex;
+        align-items: flex-start;
+        gap: 0.5rem;
+    }}
+
+    .fv-message-avatar {{
+        font-size: 1.2rem;
+    }}
+
+    .fv-message-content {{
+        flex: 1;
+    }}
+    """
+
+def stat_card(label: str, value: Any, tone: str = 'neutral', compact: bool = False,
+              progress: Optional[float] = None, caption: str = "") -> str:
+    """
+    Render one statistic card.
+
+    Args:
+        label: Card heading
+        value: Number or text shown large under the heading
+        tone: One of CARD_TONES
+        compact: Small label and large value, as on the home page
+        progress: Percentage for a progress bar under the value
+        caption: Text under the progress bar
+
+    Returns:
+        str: HTML for the card, to be passed to render_card_grid
+    """
+    extra_class = ""
+    progress_html = ""
+    value_level = 2
+    if compact:
+        extra_class += " fv-stat-compact"
+        value_level = 1
+    if progress is not None:
+        extra_class += " fv-stat-progress"
+        progress_html = _PROGRESS_BAR.substitute(percent=min(max(progress, 0), 100), caption=caption)
+
+    return _STAT_CARD.substitute(
+        tone=tone,
+        extra_class=extra_class,
+        label=label,
+        value=value,
+        value_level=value_level,
+        progress=progress_html
+    )
+
+def contributor_card(name: str, count: int) -> str:
+    """Render a card with a contributor's name and contribution count."""
+    return _CONTRIBUTOR_CARD.substitute(name=html.escape(str(name)), count=count)
+
+def render_card_grid(cards: List[str], columns: int) -> str:
+    """Wrap rendered cards in a grid with the given number of columns (1-5)."""
+    return _GRID.substitute(columns=columns, cards="".join(cards))
+
+def show_card_grid(cards: List[str], columns: int):
+    """Send a grid of cards to the page as a single element."""
+    if cards:
+        st.markdown(render_card_grid(cards, columns), unsafe_allow_html=True)
+
+def _cached_fragment(kind: str, entry: Dict[str, Any], theme_mode: str, language: str,
+                     render: Callable[[Dict[str, Any]], str]) -> str:
+    """Render an entry fragment, reusing the cached HTML for saved entries."""
+    entry_id = entry.get('id')
+    if not entry_id:
+        return render(entry)
+
+    # Edited entries get a new updated_at, which retires their old fragments
+    key = (kind, entry_id, entry.get('updated_at'), theme_mode, language)
+    with _fragment_lock:
+        cached = _fragment_cache.get(key)
+        if cached is not None:
+            _fragment_cache.move_to_end(key)
+            _fragment_stats['hits'] += 1
+            return cached
+        _fragment_stats['misses'] += 1
+
+    fragment = render(entry)
+    with _fragment_lock:
+        _fragment_cache[key] = fragment
+        while len(_fragment_cache) > ENTRY_CARD_CACHE_SIZE:
+            _fragment_cache.popitem(last=False)
+    return fragment
+
+def get_fragment_cache_stats() -> Dict[str, int]:
+    """Get hit and miss counts and the current size of the entry fragment cache."""
+    with _fragment_lock:
+        return dict(_fragment_stats, size=len(_fragment_cache))
+
+def _format_timestamp(timestamp: str) -> str:
+    """Format an ISO timestamp for display, falling back to the raw value."""
+    try:
+        return datetime.fromisoformat(timestamp.replace('Z', '+00:00')).strftime('%Y-%m-%d %H:%M')
+    except (AttributeError, ValueError):
+        return timestamp
+
+def _render_entry_header(entry: Dict[str, Any]) -> str:
+    """Build the gallery title card for an entry."""
+    tone, icon, title_field, default_title = ENTRY_STYLES.get(
+        entry.get('type'), ('neutral', '📄', 'title', 'Untitled')
+    )
+    return _ENTRY_HEADER.substitute(
+        tone=tone,
+        icon=icon,
+        title=html.escape(str(entry.get(title_field) or default_title)),
+        contributor=html.escape(str(entry.get('contributor', 'Unknown'))),
+        date=html.escape(_format_timestamp(entry.get('timestamp', ''))),
+        region=html.escape(str(entry.get('region', 'Unknown')))
+    )
+
+def render_entry_header(entry: Dict[str, Any], theme_mode: str = 'light', language: str = 'English') -> str:
+    """Render the title card shown above a corpus entry in the gallery."""
+    return _cached_fragment('entry_header', entry, theme_mode, language, _render_entry_header)
+
+def _render_image_card(image: Dict[str, Any]) -> str:
+    """Build the browse card for a festival image entry."""
+    try:
+        stars = '⭐' * int(image.get('quality_score', 3))
+    except (TypeError, ValueError):
+        stars = ''
+    description = str(image.get('description', 'No description available'))[:100]
+    return _IMAGE_CARD.substitute(
+        title=html.escape(str(image.get('title', 'Untitled'))),
+        festival=html.escape(str(image.get('festival_event', 'General'))),
+        region=html.escape(str(image.get('region', 'Unknown'))),
+        image_type=html.escape(str(image.get('image_type', 'Photo'))),
+        description=html.escape(description),
+        contributor=html.escape(str(image.get('contributor', 'Unknown'))),
+        stars=stars
+    )
+
+def render_image_card(image: Dict[str, Any], theme_mode: str = 'light', language: str = 'English') -> str:
+    """Render a card for a festival_image entry."""
+    return _cached_fragment('image_card', image, theme_mode, language, _render_image_card)
+
+def render_sample_image_card(image: Dict[str, str]) -> str:
+    """Render a placeholder card for one of the built-in sample images."""
+    return _SAMPLE_IMAGE_CARD.substitute(
+        title=image['title'],
+        festival=image['festival'],
+        region=image['region'],
+        description=image['description']
+    )
@@ -0,0 +1,291 @@
+"""
+Single-writer corpus service shared by the Streamlit workers on one host.
+
+Each Streamlit process otherwise keeps its own copy of the corpus and its
+indexes, and writes from different processes only coordinate through the
+file. Run one service per host:
+
+    python -m utils.corpus_service --socket data/corpus_service.sock
+
+and start the workers with FESTIVEVOICE_CORPUS_SOCKET pointing at the same
+path. The service is an asyncio server on a Unix domain socket that owns the
+corpus file, the in-memory corpus, its indexes and caches; every public
+data_manager function decorated with via_service() is then executed there,
+with the same signature and return value. Calls run on a thread pool in the
+service, so concurrent saves are group-committed as they are in-process.
+
+Without FESTIVEVOICE_CORPUS_SOCKET everything runs in-process as before.
+When the service can't be reached, workers fall back to running the call
+in-process and try the service again after RETRY_SECONDS. Requests are
+pickled, so the socket is created readable and writable by its owner only.
+"""
+import argparse
+import asyncio
+import functools
+import os
+import pickle
+import signal
+import socket
+import struct
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+SOCKET_PATH = os.environ.get("FESTIVEVOICE_CORPUS_SOCKET", "")
+DEFAULT_SOCKET_PATH = "data/corpus_service.sock"
+# Threads running data_manager calls in the service
+SERVICE_WORKERS = int(os.environ.get("FESTIVEVOICE_CORPUS_SERVICE_WORKERS", 16))
+# Seconds to keep running in-process after the service could not be reached
+RETRY_SECONDS = 5.0
+# Idle connections kept per worker process
+POOL_SIZE = 8
+
+_FRAME = struct.Struct("!Q")
+
+# Functions that fill in fields of their first argument; the service sends it back
+_UPDATES_FIRST_ARG = {'save_user_data'}
+
+# Name -> failure value of the functions that may be forwarded
+_registry: Dict[str, Any] = {}
+_READ = object()
+
+_state = {'socket': SOCKET_PATH or None, 'retry_at': 0.0, 'serving': False}
+_stats = {'remote': 0, 'fallback': 0, 'failed': 0}
+_pool = []
+_pool_lock = threading.Lock()
+
+class _NotSent(Exception):
+    """The request never reached the service, so running it in-process is safe."""
+
+def use_corpus_service(socket_path: Optional[str]):
+    """Forward calls to the service at socket_path from now on; None runs them in-process."""
+    _state['socket'] = socket_path or None
+    _state['retry_at'] = 0.0
+    with _pool_lock:
+        while _pool:
+            _pool.pop().close()
+
+def is_serving() -> bool:
+    """Whether this process is the corpus service, running calls for the workers."""
+    return _state['serving']
+
+def get_service_stats() -> Dict[str, Any]:
+    """Get the socket in use and counts of forwarded, fallen back and failed calls."""
+    return {'socket': _state['socket'], **_stats}
+
+def _kept_result(kept: Dict[str, Any], version: str, call_key: str) -> Optional[list]:
+    with kept['lock']:
+        if kept['version'] == version:
+            return kept['results'].get(call_key)
+        return None
+
+def _keep_result(kept: Dict[str, Any], version: str, call_key: str, result: list):
+    with kept['lock']:
+        if kept['version'] != version:
+            kept['version'] = version
+            kept['results'] = {}
+        kept['results'][call_key] = result
+
+def via_service(failure: Any = _READ, snapshot: bool = False):
+    """
+    Run the decorated data_manager function in the corpus service when one is
+    configured. Pass failure for writes: it is returned, instead of running
+    the write in-process, when the request reached the service but no reply
+    came back, since the write may already have happened.
+
+    snapshot=True is for functions returning the whole corpus, or a projection
+    of it, as a list: results for the current corpus version are kept, one
+    per set of arguments, and reused as shallow copies while
+    get_corpus_version reports no change, so each is only transferred once
+    per version. A new version drops the results kept for the old one.
+    """
+    def decorator(function: Callable) -> Callable:
+        name = function.__name__
+        _registry[name] = failure
+        # Results for one corpus version, by call arguments
+        kept = {'version': None, 'results': {}, 'lock': threading.Lock()}
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if _state['socket'] is None or time.monotonic() < _state['retry_at']:
+                return function(*args, **kwargs)
+            try:
+                if snapshot:
+                    call_key = repr((args, sorted(kwargs.items())))
+                    version, _ = _call('get_corpus_version', (), {})
+                    result = _kept_result(kept, version, call_key)
+                    if result is not None:
+                        _stats['remote'] += 1
+                        return list(result)
+                result, updated = _call(name, args, kwargs)
+                if snapshot:
+                    _keep_result(kept, version, call_key, result)
+                    result = list(result)
+            except _NotSent as e:
+                print(f"Corpus service unavailable ({e.__cause__}), running {name} in-process")
+                _state['retry_at'] = time.monotonic() + RETRY_SECONDS
+                _stats['fallback'] += 1
+                return function(*args, **kwargs)
+            except (OSError, EOFError, pickle.PickleError) as e:
+                print(f"Corpus service failed during {name}: {e}")
+                _state['retry_at'] = time.monotonic() + RETRY_SECONDS
+                _stats['failed'] += 1
+                return function(*args, **kwargs) if failure is _READ else failure
+            _stats['remote'] += 1
+            if updated is not None:
+                args[0].update(updated)
+            return result
+
+        return wrapper
+    return decorator
+
+def _is_open(conn: socket.socket) -> bool:
+    """Whether a pooled connection is still open, e.g. the service has not restarted since."""
+    try:
+        return conn.recv(1, socket.MSG_PEEK | socket.MSG_DONTWAIT) != b""
+    except BlockingIOError:
+        return True
+    except OSError:
+        return False
+
+def _connect() -> socket.socket:
+    while True:
+        with _pool_lock:
+            conn = _pool.pop() if _pool else None
+        if conn is None:
+            break
+        if _is_open(conn):
+            return conn
+        conn.close()
+    try:
+        conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        conn.connect(_state['socket'])
+        return conn
+    except OSError as e:
+        raise _NotSent() from e
+
+def _release(conn: socket.socket):
+    with _pool_lock:
+        if len(_pool) < POOL_SIZE:
+            _pool.append(conn)
+            return
+    conn.close()
+
+def _recv_exactly(conn: socket.socket, size: int) -> bytes:
+    chunks = []
+    while size:
+        chunk = conn.recv(min(size, 1 << 20))
+        if not chunk:
+            raise EOFError("corpus service closed the connection")
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+def _call(name: str, args: tuple, kwargs: dict):
+    """Send one call to the service; returns (result, updated first argument or None)."""
+    payload = pickle.dumps((name, args, kwargs), protocol=pickle.HIGHEST_PROTOCOL)
+    conn = _connect()
+    try:
+        try:
+            conn.sendall(_FRAME.pack(len(payload)) + payload)
+        except OSError as e:
+            # A pooled connection the service has since closed
+            raise _NotSent() from e
+        size, = _FRAME.unpack(_recv_exactly(conn, _FRAME.size))
+        status, result, updated = pickle.loads(_recv_exactly(conn, size))
+    except BaseException:
+        conn.close()
+        raise
+    _release(conn)
+    if status == 'raise':
+        raise result
+    return result, updated
+
+def _dispatch(data_manager, name: str, args: tuple, kwargs: dict):
+    """Run one forwarded call in the service."""
+    if name not in _registry:
+        return 'raise', AttributeError(f"{name} is not served by the corpus service"), None
+    try:
+        result = getattr(data_manager, name)(*args, **kwargs)
+    except Exception as e:
+        return 'raise', e, None
+    return 'ok', result, args[0] if name in _UPDATES_FIRST_ARG else None
+
+async def _handle_connection(reader, writer, data_manager, executor, connections, stop):
+    """Answer calls on one client connection until it closes or the service stops."""
+    loop = asyncio.get_running_loop()
+    task = asyncio.current_task()
+    connections[task] = writer
+    try:
+        while not stop.is_set():
+            size, = _FRAME.unpack(await reader.readexactly(_FRAME.size))
+            # Busy connections are left to finish their call on shutdown
+            connections[task] = None
+            name, args, kwargs = pickle.loads(await reader.readexactly(size))
+            reply = await loop.run_in_executor(executor, _dispatch, data_manager, name, args, kwargs)
+            payload = pickle.dumps(reply, protocol=pickle.HIGHEST_PROTOCOL)
+            writer.write(_FRAME.pack(len(payload)) + payload)
+            await writer.drain()
+            connections[task] = writer
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        del connections[task]
+        writer.close()
+
+async def serve(socket_path: str, workers: int = SERVICE_WORKERS):
+    """Serve data_manager calls on socket_path until SIGINT or SIGTERM."""
+    # The service itself always runs the calls in-process
+    use_corpus_service(None)
+    _state['serving'] = True
+    from utils import data_manager
+
+    entries = len(data_manager.load_corpus_data())
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="corpus-service")
+    # Connection handler task -> its writer while idle, None while running a call
+    connections = {}
+    stop = asyncio.Event()
+
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+    os.makedirs(os.path.dirname(os.path.abspath(socket_path)), exist_ok=True)
+    old_umask = os.umask(0o177)
+    try:
+        server = await asyncio.start_unix_server(
+            lambda reader, writer: _handle_connection(reader, writer, data_manager, executor, connections, stop),
+            path=socket_path
+        )
+    finally:
+        os.umask(old_umask)
+
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stop.set)
+
+    print(f"Corpus service serving {entries} entries on {socket_path}")
+    await stop.wait()
+
+    # Stop accepting, hang up on idle clients and let calls in flight finish
+    server.close()
+    for writer in list(connections.values()):
+        if writer is not None:
+            writer.close()
+    await asyncio.gather(*connections, return_exceptions=True)
+    await server.wait_closed()
+    executor.shutdown(wait=True)
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+    print("Corpus service stopped")
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the corpus to the Streamlit workers on this host.")
+    parser.add_argument("--socket", default=SOCKET_PATH or DEFAULT_SOCKET_PATH, help="Unix socket to listen on")
+    parser.add_argument("--workers", type=int, default=SERVICE_WORKERS, help="Threads running data_manager calls")
+    args = parser.parse_args()
+    # Run under the module name data_manager imports, not as __main__
+    from utils import corpus_service
+    asyncio.run(corpus_service.serve(args.socket, args.workers))
+
+if __name__ == "__main__":
+    main()
@@ -1,32 +1,162 @@
+import bisect
 import json
 import os
+import time
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 import threading
+from contextlib import contextmanager
+from utils.instrumentation import instrument
+from utils.corpus_service import via_service, is_serving
+from utils.replication import is_follower, ship_changes
+from utils.backups import take_backup, start_backup_schedule
+from utils.partitions import (
+    MANIFEST_PATH, PARTITION_DIR, is_partitioned, has_partitions, partition_key,
+    read_partitions, write_partitions, get_partition_stats
+)
 
-# Thread lock for file operations
-file_lock = threading.Lock()
+# Thread lock for file operations and the in-memory corpus cache
+file_lock = threading.RLock()
 
 DATA_FILE = "data/corpus_data.json"
+# Append-only change feed: one JSON record per line with a sequence number
+CHANGE_LOG_FILE = "data/corpus_changes.jsonl"
+# Records kept in the change log; the file is cut back to this many once it
+# holds a quarter more. Readers further behind are told to reload.
+CHANGE_LOG_RETAIN = int(os.environ.get("FESTIVEVOICE_CHANGE_LOG_RETAIN", 10000))
+# Updates (patches) and deletes (tombstones) not yet folded into DATA_FILE,
+# one JSON record per line. Replayed on load; replaying twice is harmless.
+JOURNAL_FILE = "data/corpus_journal.jsonl"
+# Seconds between background compactions folding the journal into DATA_FILE
+COMPACT_INTERVAL_SECONDS = float(os.environ.get("FESTIVEVOICE_COMPACT_SECONDS", 60))
+
+# In-memory copy of the corpus and its indexes. Reloaded whenever the data file
+# or journal changes on disk, and kept up to date in place by writes from this process.
+_corpus_cache = {
+    'signature': None,  # (data file, journal) signatures as of the last load or write
+    'version': 0,       # bumped on every change, usable as a cache key
+    'entries': [],
+    'by_id': {},        # primary key: id -> entry
+    'positions': {},    # id -> index of the entry in entries and the data file
+    'by_contributor': {},
+    'by_type': {},      # entry type -> set of ids
+    'by_region': {},    # region -> set of ids
+    # Presorted (key, id) orderings, ascending; see _ordering_keys
+    'time_order': [],
+    'quality_order': [],
+    'contributor_order': [],
+    'query_cache': {},  # filtered orderings built by query_corpus
+    # Field projections sent by load_corpus_data(fields=...) from the corpus
+    # service, for one version
+    'projections': {'version': None, 'lists': {}},
+}
+
+# Change log records, oldest first, with consecutive sequence numbers
+_change_feed = {
+    'signature': None,
+    'records': [],
+    'latest': 0,        # sequence number of the newest record, 0 before any
+}
+
+# Orderings available for per-contributor listings: key function and direction
+CONTRIBUTOR_SORTS = {
+    'recent': (lambda entry: entry.get('timestamp', ''), True),
+    'oldest': (lambda entry: entry.get('timestamp', ''), False),
+    'quality': (lambda entry: entry.get('quality_score', 0), True),
+    'title': (lambda entry: str(entry.get('title', entry.get('content', ''))).lower(), False),
+}
+
+# Gallery sort options: presorted ordering to use and whether to walk it backwards
+GALLERY_SORTS = {
+    'recent': ('time_order', True),
+    'oldest': ('time_order', False),
+    'quality': ('quality_order', False),
+    'contributor': ('contributor_order', False),
+}
+
+# Maximum number of filtered orderings kept by query_corpus
+QUERY_CACHE_SIZE = 32
+
+# Counters for the metrics endpoint, read without touching the data file
+_cache_stats = {
+    'corpus_hits': 0,       # served from memory
+    'corpus_misses': 0,     # data file changed on disk and was reloaded
+    'query_hits': 0,
+    'query_misses': 0,
+}
+# Writers waiting for file_lock
+_write_queue = {'waiting': 0}
+_write_queue_lock = threading.Lock()
+
+# Group commit: save_user_data calls that arrive together are appended with one
+# file write. The first caller waits this long for others to join its batch.
+GROUP_COMMIT_WINDOW_MS = float(os.environ.get("FESTIVEVOICE_GROUP_COMMIT_MS", 5))
+GROUP_COMMIT_MAX_ENTRIES = int(os.environ.get("FESTIVEVOICE_GROUP_COMMIT_MAX", 500))
+# Pending save requests, and whether a caller is currently writing batches
+_commit_queue = {'pending': [], 'leader': False}
+_commit_lock = threading.Lock()
+
+# Journal records written since the last compaction, the partition months
+# (see utils.partitions) they touched, and the compactor thread
+_journal = {'records': 0, 'months': set(), 'compactor': None}
+
+# Entry id clock: last microsecond handed out, and a random node suffix per
+# process so ids from different workers never collide
+_id_clock = {'last_micros': 0, 'pid': None, 'node': None}
+_id_lock = threading.Lock()
+
+# Random per process, so get_corpus_version never repeats across restarts
+_version_nonce = os.urandom(8).hex()
+
+def _entry_chars(entry: Dict[str, Any]) -> int:
+    """Cheap size of an entry for instrumentation: total length of its string fields."""
+    return sum(len(value) for value in entry.values() if isinstance(value, str))
 
 def ensure_data_directory():
     """Ensure the data directory exists."""
     os.makedirs(os.path.dirname(DATA_FILE), exist_ok=True)
 
-def load_corpus_data() -> List[Dict[str, Any]]:
+def _file_signature(path: str) -> Optional[Tuple[int, int]]:
+    """Get (mtime_ns, size) for a file, or None if it doesn't exist."""
+    try:
+        stat = os.stat(path)
+        return (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        return None
+
+def _read_corpus_file() -> List[Dict[str, Any]]:
     """
-    Load corpus data from JSON file.
+    Read corpus data from the JSON file, or from its monthly partitions.
     Returns empty list if file doesn't exist or is corrupted.
     """
+    if is_partitioned():
+        return _read_partitioned_corpus()
+    return _read_data_file()
+
+def _read_partitioned_corpus() -> List[Dict[str, Any]]:
+    """Read the monthly partitions, migrating the data file into them the first time."""
+    try:
+        if has_partitions():
+            return read_partitions()
+        entries = _read_data_file()
+        if entries:
+            write_partitions(entries)
+            print(f"Moved {len(entries)} corpus entries from {DATA_FILE} into monthly partitions; {DATA_FILE} is no longer read")
+        return entries
+    except Exception as e:
+        print(f"Error loading corpus partitions: {e}")
+        return []
+
+def _read_data_file() -> List[Dict[str, Any]]:
+    """Read corpus data from the single JSON data file."""
     try:
         ensure_data_directory()
         
         if not os.path.exists(DATA_FILE):
             return []
         
-        with file_lock:
-            with open(DATA_FILE, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+        with open(DATA_FILE, 'r', encoding='utf-8') as f:
+            data = json.load(f)
                 
         # Ensure data is a list
         if isinstance(data, list):
@@ -42,25 +172,499 @@ def load_corpus_data() -> List[Dict[str, Any]]:
         print(f"Error loading corpus data: {e}")
         return []
 
+@instrument("data_manager.write_corpus_file", payload=lambda args, kwargs, result: result, unit="bytes")
+def _write_corpus_file(data: List[Dict[str, Any]], months: Optional[set] = None) -> int:
+    """
+    Write corpus data to the JSON file. The data goes to a temporary file that
+    is flushed to disk and then renamed over the old one, so the file is never
+    left half-written. Returns the size of the written file in bytes.
+    
+    In the monthly layout only the partitions for months are rewritten (all of
+    them when months is None), and the bytes written are returned.
+    """
+    ensure_data_directory()
+    if is_partitioned():
+        return write_partitions(data, months)
+    
+    tmp_file = f"{DATA_FILE}.tmp"
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+        size = f.tell()
+    os.replace(tmp_file, DATA_FILE)
+    return size
+
+def _new_contributor_view() -> Dict[str, Any]:
+    """Create an empty per-contributor view."""
+    return {
+        'ids': [],            # entry ids in insertion order
+        'type_counts': {},    # entry type -> count
+        'orderings': {},      # sort key -> sorted id list, built on demand
+        'export_blob': None,  # JSON of the contributions for exports, built on demand
+    }
+
+def _ordering_keys(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """Sort keys of an entry for each presorted ordering (all ascending)."""
+    return {
+        'time_order': str(entry.get('timestamp', '')),
+        # Negated so that ascending order is best quality first
+        'quality_order': -(entry.get('quality_score') or 0),
+        'contributor_order': str(entry.get('contributor') or 'Unknown').lower(),
+    }
+
+def _insert_sorted(ordering: List[Tuple[Any, str]], item: Tuple[Any, str]):
+    """Insert into a sorted list, appending directly when item sorts last."""
+    if not ordering or item >= ordering[-1]:
+        ordering.append(item)
+    else:
+        bisect.insort(ordering, item)
+
+def _index_entry(entry: Dict[str, Any], position: int, update_orderings: bool = True):
+    """Add a single entry, found at position in the corpus, to the corpus indexes."""
+    entry_id = entry.get('id')
+    if not entry_id:
+        return
+    _corpus_cache['by_id'][entry_id] = entry
+    _corpus_cache['positions'][entry_id] = position
+    
+    # New entries are almost always the newest, so the time index is usually an append
+    if update_orderings:
+        for order_name, key in _ordering_keys(entry).items():
+            _insert_sorted(_corpus_cache[order_name], (key, entry_id))
+    
+    _corpus_cache['by_type'].setdefault(entry.get('type', 'unknown'), set()).add(entry_id)
+    region = entry.get('region')
+    if region:
+        _corpus_cache['by_region'].setdefault(region, set()).add(entry_id)
+    _corpus_cache['query_cache'] = {}
+    
+    contributor = entry.get('contributor')
+    if contributor:
+        view = _corpus_cache['by_contributor'].setdefault(contributor, _new_contributor_view())
+        view['ids'].append(entry_id)
+        entry_type = entry.get('type', 'unknown')
+        view['type_counts'][entry_type] = view['type_counts'].get(entry_type, 0) + 1
+        # Derived data is stale once this contributor has a new entry
+        view['orderings'] = {}
+        view['export_blob'] = None
+
+def _rebuild_cache(entries: List[Dict[str, Any]]):
+    """Replace the cached corpus and rebuild every index from scratch."""
+    _corpus_cache['entries'] = entries
+    _corpus_cache['by_id'] = {}
+    _corpus_cache['positions'] = {}
+    _corpus_cache['by_contributor'] = {}
+    _corpus_cache['by_type'] = {}
+    _corpus_cache['by_region'] = {}
+    _corpus_cache['query_cache'] = {}
+    
+    # Ids are the primary key. Older ids were only unique to the microsecond;
+    # where two entries share one, the first keeps it and the other is not indexed.
+    indexed = {}
+    for position, entry in enumerate(entries):
+        entry_id = entry.get('id')
+        if entry_id and entry_id not in indexed:
+            indexed[entry_id] = position
+    duplicates = sum(1 for entry in entries if entry.get('id')) - len(indexed)
+    if duplicates:
+        print(f"Warning: {duplicates} corpus entries share an id with an earlier entry and are not indexed")
+    
+    # Build the orderings with one sort each rather than repeated inserts
+    orderings = {'time_order': [], 'quality_order': [], 'contributor_order': []}
+    for entry_id, position in indexed.items():
+        for order_name, key in _ordering_keys(entries[position]).items():
+            orderings[order_name].append((key, entry_id))
+    for order_name, ordering in orderings.items():
+        ordering.sort()
+        _corpus_cache[order_name] = ordering
+    
+    for entry_id, position in indexed.items():
+        _index_entry(entries[position], position, update_orderings=False)
+    _corpus_cache['version'] += 1
+
+def _storage_signature() -> Tuple[Optional[Tuple[int, int]], Optional[Tuple[int, int]]]:
+    """Signatures of the data file (the partition manifest in the monthly layout) and the journal."""
+    data_file = MANIFEST_PATH if is_partitioned() else DATA_FILE
+    return (_file_signature(data_file), _file_signature(JOURNAL_FILE))
+
+def _get_corpus_cache() -> Dict[str, Any]:
+    """Get the corpus cache, reloading it if the data file or journal changed on disk."""
+    with file_lock:
+        signature = _storage_signature()
+        if signature[0] is None or signature != _corpus_cache['signature']:
+            entries = _read_corpus_file()
+            journal = _read_journal()
+            _journal['records'] = len(journal)
+            _journal['months'] = _journal_months(entries, journal)
+            _rebuild_cache(_replay_journal(entries, journal))
+            _corpus_cache['signature'] = signature
+            _cache_stats['corpus_misses'] += 1
+        else:
+            _cache_stats['corpus_hits'] += 1
+        return _corpus_cache
+
+def _read_journal() -> List[Dict[str, Any]]:
+    """Read the journal records, skipping a torn last line."""
+    records = []
+    try:
+        with open(JOURNAL_FILE, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    print(f"Skipping damaged record in {JOURNAL_FILE}")
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print(f"Error loading corpus journal: {e}")
+    return records
+
+def _replay_journal(entries: List[Dict[str, Any]], journal: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Apply journal patches and tombstones to entries read from the data file."""
+    if not journal:
+        return entries
+    positions = {entry.get('id'): position for position, entry in enumerate(entries)}
+    deleted = set()
+    for record in journal:
+        position = positions.get(record.get('id'))
+        if position is None or position in deleted:
+            continue
+        if record['op'] == 'update':
+            entries[position] = {**entries[position], **record['patch']}
+        elif record['op'] == 'delete':
+            deleted.add(position)
+    return [entry for position, entry in enumerate(entries) if position not in deleted]
+
+def _journal_months(entries: List[Dict[str, Any]], journal: List[Dict[str, Any]]) -> set:
+    """Partition months of the entries journal records change, before and after."""
+    if not journal:
+        return set()
+    by_id = {entry.get('id'): entry for entry in entries}
+    months = set()
+    for record in journal:
+        entry = by_id.get(record.get('id'))
+        if entry is not None:
+            months.add(partition_key(entry))
+        if 'timestamp' in record.get('patch', {}):
+            months.add(partition_key(record['patch']))
+    return months
+
+def _write_journal(records: List[Dict[str, Any]]):
+    """Append patches and tombstones to the journal. Called with file_lock held."""
+    with open(JOURNAL_FILE, 'a', encoding='utf-8') as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+    _journal['records'] += len(records)
+    _start_compactor()
+
+def _write_snapshot(entries: List[Dict[str, Any]], months: Optional[set] = None):
+    """
+    Write the whole corpus to the data file. Anything in the journal is in
+    entries already, so the journal is emptied. Called with file_lock held.
+    
+    In the monthly layout, pass the months the change touched to rewrite only
+    those partitions; months the journal touched are rewritten with them.
+    """
+    _write_corpus_file(entries, None if months is None else months | _journal['months'])
+    if _journal['records'] or os.path.exists(JOURNAL_FILE):
+        with open(JOURNAL_FILE, 'w', encoding='utf-8'):
+            pass
+        _journal['records'] = 0
+    _journal['months'] = set()
+
+def _unindex_entry(entry: Dict[str, Any]):
+    """Remove a single entry from the corpus indexes, leaving entries as it is."""
+    entry_id = entry['id']
+    del _corpus_cache['by_id'][entry_id]
+    del _corpus_cache['positions'][entry_id]
+    
+    for order_name, key in _ordering_keys(entry).items():
+        ordering = _corpus_cache[order_name]
+        index = bisect.bisect_left(ordering, (key, entry_id))
+        if index < len(ordering) and ordering[index] == (key, entry_id):
+            del ordering[index]
+    
+    _corpus_cache['by_type'].get(entry.get('type', 'unknown'), set()).discard(entry_id)
+    region = entry.get('region')
+    if region:
+        _corpus_cache['by_region'].get(region, set()).discard(entry_id)
+    _corpus_cache['query_cache'] = {}
+    
+    contributor = entry.get('contributor')
+    view = _corpus_cache['by_contributor'].get(contributor) if contributor else None
+    if view:
+        view['ids'].remove(entry_id)
+        entry_type = entry.get('type', 'unknown')
+        view['type_counts'][entry_type] -= 1
+        if not view['type_counts'][entry_type]:
+            del view['type_counts'][entry_type]
+        if not view['ids']:
+            del _corpus_cache['by_contributor'][contributor]
+        view['orderings'] = {}
+        view['export_blob'] = None
+
+def _apply_journal_records(records: List[Dict[str, Any]]):
+    """Apply patches and tombstones to the cache in place, skipping entries that are gone."""
+    entries = _corpus_cache['entries']
+    by_id = _corpus_cache['by_id']
+    deleted = False
+    for record in records:
+        entry = by_id.get(record['id'])
+        if entry is None:
+            continue
+        position = _corpus_cache['positions'][record['id']]
+        _unindex_entry(entry)
+        if record['op'] == 'update':
+            # A new dict, so lists handed out earlier keep the entry as it was
+            entries[position] = {**entry, **record['patch']}
+            _index_entry(entries[position], position)
+        else:
+            entries[position] = None
+            deleted = True
+    
+    if deleted:
+        # Close the gaps in one pass, however many entries went
+        entries[:] = [entry for entry in entries if entry is not None]
+        positions = _corpus_cache['positions']
+        for position, entry in enumerate(entries):
+            entry_id = entry.get('id')
+            if entry_id and by_id.get(entry_id) is entry:
+                positions[entry_id] = position
+
+def _change_entries(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Journal and apply patches and tombstones, dropping those whose entry no
+    longer exists. Called with file_lock held. Returns the records applied.
+    """
+    _get_corpus_cache()
+    applied = [record for record in records if record['id'] in _corpus_cache['by_id']]
+    if not applied:
+        return []
+    _write_journal(applied)
+    _journal['months'] |= _journal_months([_corpus_cache['by_id'][record['id']] for record in applied], applied)
+    _apply_journal_records(applied)
+    _corpus_cache['version'] += 1
+    _corpus_cache['signature'] = _storage_signature()
+    return applied
+
+def _start_compactor():
+    """Start the background compactor thread, once per process."""
+    if _journal['compactor'] is None and COMPACT_INTERVAL_SECONDS > 0:
+        _journal['compactor'] = threading.Thread(target=_compact_periodically, name="corpus-compactor", daemon=True)
+        _journal['compactor'].start()
+
+def _compact_periodically():
+    while True:
+        time.sleep(COMPACT_INTERVAL_SECONDS)
+        if _journal['records']:
+            compact_corpus()
+
+def _read_change_log() -> List[Dict[str, Any]]:
+    """Read the change log records, skipping a torn last line."""
+    records = []
+    try:
+        with open(CHANGE_LOG_FILE, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    print(f"Skipping damaged record in {CHANGE_LOG_FILE}")
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print(f"Error loading change log: {e}")
+    return records
+
+def _get_change_feed() -> Dict[str, Any]:
+    """Get the change feed, reloading it if the log changed on disk."""
+    with file_lock:
+        signature = _file_signature(CHANGE_LOG_FILE)
+        if signature != _change_feed['signature']:
+            records = _read_change_log()
+            _change_feed['records'] = records
+            if records:
+                _change_feed['latest'] = records[-1]['seq']
+            _change_feed['signature'] = signature
+        return _change_feed
+
+def _rewrite_change_log(records: List[Dict[str, Any]]):
+    """Replace the change log with records. Called with file_lock held."""
+    feed = _get_change_feed()
+    tmp_file = f"{CHANGE_LOG_FILE}.tmp"
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_file, CHANGE_LOG_FILE)
+    feed['records'] = records
+    if records:
+        feed['latest'] = records[-1]['seq']
+    feed['signature'] = _file_signature(CHANGE_LOG_FILE)
+
+def _append_records(records: List[Dict[str, Any]]):
+    """
+    Append numbered records to the change log and ship them to followers.
+    Called with file_lock held, once the corpus cache reflects them.
+    """
+    feed = _get_change_feed()
+    with open(CHANGE_LOG_FILE, 'a', encoding='utf-8') as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+    feed['records'].extend(records)
+    feed['latest'] = records[-1]['seq']
+    feed['signature'] = _file_signature(CHANGE_LOG_FILE)
+    
+    if len(feed['records']) > CHANGE_LOG_RETAIN + CHANGE_LOG_RETAIN // 4:
+        _rewrite_change_log(feed['records'][-CHANGE_LOG_RETAIN:])
+    ship_changes(records, _corpus_cache['entries'])
+
+def _append_changes(changes: List[Dict[str, Any]]):
+    """
+    Number changes and append them to the change log. Called with file_lock held,
+    after the corpus write they describe.
+    """
+    latest = _get_change_feed()['latest']
+    now = datetime.now().isoformat()
+    _append_records([
+        {'seq': latest + number, 'at': now, **change}
+        for number, change in enumerate(changes, start=1)
+    ])
+
+def _refused_on_follower(name: str) -> bool:
+    """Read replicas only apply the primary's log; writes go to the primary."""
+    if is_follower():
+        print(f"{name} refused: this worker is a read replica, send writes to the primary")
+        return True
+    return False
+
+@contextmanager
+def _queued_write():
+    """
+    Hold file_lock for a write, counting the writers still waiting for it.
+    Starts the backup schedule once the lock is released.
+    """
+    with _write_queue_lock:
+        _write_queue['waiting'] += 1
+    try:
+        file_lock.acquire()
+    finally:
+        with _write_queue_lock:
+            _write_queue['waiting'] -= 1
+    try:
+        yield
+    finally:
+        file_lock.release()
+    # Backups are taken where the corpus is written; a follower's primary has
+    # its own. Started once file_lock is released, since a backup takes it.
+    if not is_follower():
+        start_backup_schedule()
+
+@instrument("data_manager.load_corpus_data", payload=lambda args, kwargs, result: len(result), unit="entries")
+@via_service(snapshot=True)
+def load_corpus_data(fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """
+    Load corpus data, served from the in-memory cache.
+    Returns empty list if file doesn't exist or is corrupted.
+    
+    With fields, list views name the few fields they show, leaving out the
+    large text ('content', 'transcription', 'description', 'significance');
+    get_entry_by_id fetches one entry's text when it is opened. From the
+    corpus service each entry then has only those fields (where it has them)
+    and its 'id', so much less is sent and kept per worker. In-process the
+    cached entries are returned whole, as they cost nothing extra there, so
+    callers must only rely on the fields they asked for.
+    """
+    with file_lock:
+        cache = _get_corpus_cache()
+        if fields is None or not is_serving():
+            return list(cache['entries'])
+        return list(_get_projection(cache, fields))
+
+def _get_projection(cache: Dict[str, Any], fields: List[str]) -> List[Dict[str, Any]]:
+    """
+    The entries cut down to fields and 'id', built once per corpus version
+    and kept for the next worker to ask. Only used in the corpus service.
+    """
+    projections = cache['projections']
+    if projections['version'] != cache['version']:
+        projections['version'] = cache['version']
+        projections['lists'] = {}
+    key = tuple(sorted(set(fields) | {'id'}))
+    projection = projections['lists'].get(key)
+    if projection is None:
+        projection = [{field: entry[field] for field in key if field in entry} for entry in cache['entries']]
+        projections['lists'][key] = projection
+    return projection
+
+@via_service()
+def get_corpus_metrics() -> Dict[str, Any]:
+    """
+    Get corpus gauges and counters for monitoring, from memory only.
+    Unlike the other readers this does not check the data file for changes.
+
+    Returns:
+        dict: 'entries', 'by_type', 'file' and 'file_bytes' (the data file,
+        or the partition directory with a trailing slash in the monthly
+        layout), 'partitions' (hot and frozen counts, monthly layout only), 'journal_records', 'version', 'cache'
+        (hit/miss counters) and 'writes_waiting'
+    """
+    with file_lock:
+        signature = _corpus_cache['signature']
+        partitions = get_partition_stats() if is_partitioned() else None
+        if partitions:
+            file_name = f"{os.path.basename(PARTITION_DIR.rstrip('/'))}/"
+            file_bytes = partitions['bytes']
+        else:
+            file_name = os.path.basename(DATA_FILE)
+            file_bytes = signature[0][1] if signature and signature[0] else 0
+        return {
+            'entries': len(_corpus_cache['entries']),
+            'by_type': {entry_type: len(ids) for entry_type, ids in _corpus_cache['by_type'].items()},
+            'file': file_name,
+            'file_bytes': file_bytes,
+            'partitions': partitions and {'hot': partitions['hot'], 'frozen': partitions['frozen']},
+            'journal_records': _journal['records'],
+            'version': _corpus_cache['version'],
+            'cache': dict(_cache_stats),
+            'writes_waiting': _write_queue['waiting']
+        }
+
+@via_service()
+def get_corpus_version() -> str:
+    """
+    Get a value that changes whenever the corpus changes.
+    Pass it to st.cache_data functions so their results expire on writes;
+    give those max_entries=1 so results for old versions are dropped.
+    
+    The cache's counter restarts at 0 with every process, so it is prefixed
+    with a random value per process: a version seen before a restart of this
+    process or the corpus service, or from another process, never matches.
+    """
+    with file_lock:
+        return f"{_version_nonce}-{_get_corpus_cache()['version']}"
+
+@instrument("data_manager.save_corpus_data", payload=lambda args, kwargs, result: len(args[0]), unit="entries", failed=lambda result: result is False)
+@via_service(False)
 def save_corpus_data(data: List[Dict[str, Any]]) -> bool:
     """
     Save corpus data to JSON file.
     Returns True if successful, False otherwise.
     """
+    if _refused_on_follower('save_corpus_data'):
+        return False
     try:
-        ensure_data_directory()
-        
-        with file_lock:
-            # Create backup of existing data
-            if os.path.exists(DATA_FILE):
-                backup_file = f"{DATA_FILE}.backup"
-                with open(DATA_FILE, 'r', encoding='utf-8') as original:
-                    with open(backup_file, 'w', encoding='utf-8') as backup:
-                        backup.write(original.read())
-            
-            # Write new data
-            with open(DATA_FILE, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+        with _queued_write():
+            _write_snapshot(data)
+            _rebuild_cache(list(data))
+            _corpus_cache['signature'] = _storage_signature()
+            # Followers of the change feed reload everything
+            _append_changes([{'op': 'reset', 'entries': len(data)}])
         
         return True
         
@@ -68,39 +672,420 @@ def save_corpus_data(data: List[Dict[str, Any]]) -> bool:
         print(f"Error saving corpus data: {e}")
         return False
 
+@instrument("data_manager.save_user_data", payload=lambda args, kwargs, result: _entry_chars(args[0]), unit="chars", failed=lambda result: result is False)
+@via_service(False)
 def save_user_data(user_entry: Dict[str, Any]) -> bool:
     """
     Save a single user contribution to the corpus.
-    Appends to existing data.
+    Concurrent calls are appended together in one write (group commit); each
+    returns once the write holding its entry is on disk.
     """
+    if _refused_on_follower('save_user_data'):
+        return False
     try:
         # Add metadata
         user_entry['id'] = generate_entry_id()
         user_entry['timestamp'] = datetime.now().isoformat()
         
-        # Load existing data
-        corpus_data = load_corpus_data()
+        request = {'entry': user_entry, 'done': threading.Event(), 'lead': False, 'saved': False}
+        with _commit_lock:
+            _commit_queue['pending'].append(request)
+            if not _commit_queue['leader']:
+                _commit_queue['leader'] = True
+                request['lead'] = True
         
-        # Append new entry
-        corpus_data.append(user_entry)
+        # Wait until a batch holding this entry is written, or this caller is
+        # handed the job of writing the next batch
+        if not request['lead']:
+            request['done'].wait()
+        if request['lead']:
+            _lead_group_commit()
         
-        # Save updated data
-        return save_corpus_data(corpus_data)
+        return request['saved']
         
     except Exception as e:
         print(f"Error saving user data: {e}")
         return False
 
+def _lead_group_commit():
+    """Write the pending save requests as one batch, then hand over to the next waiting caller."""
+    batch = []
+    saved = False
+    try:
+        with _commit_lock:
+            alone = len(_commit_queue['pending']) == 1
+        # Give concurrent callers a moment to join when there is nobody to batch with yet
+        if alone and GROUP_COMMIT_WINDOW_MS > 0:
+            time.sleep(GROUP_COMMIT_WINDOW_MS / 1000)
+        
+        with _commit_lock:
+            batch = _commit_queue['pending'][:GROUP_COMMIT_MAX_ENTRIES]
+            del _commit_queue['pending'][:len(batch)]
+        saved = _commit_batch([request['entry'] for request in batch])
+    finally:
+        with _commit_lock:
+            for request in batch:
+                request['saved'] = saved
+                request['lead'] = False
+                request['done'].set()
+            if _commit_queue['pending']:
+                successor = _commit_queue['pending'][0]
+                successor['lead'] = True
+                successor['done'].set()
+            else:
+                _commit_queue['leader'] = False
+
+@instrument("data_manager.group_commit", payload=lambda args, kwargs, result: len(args[0]), unit="entries", failed=lambda result: result is False)
+def _commit_batch(entries: List[Dict[str, Any]]) -> bool:
+    """Append a batch of new entries to the corpus with a single file write."""
+    try:
+        with _queued_write():
+            _add_entries(entries)
+            _append_changes([{'op': 'add', 'entry': entry} for entry in entries])
+        
+        return True
+        
+    except Exception as e:
+        print(f"Error saving user data: {e}")
+        return False
+
+def _add_entries(entries: List[Dict[str, Any]]):
+    """Append entries to the corpus file and cache. Called with file_lock held."""
+    corpus_data = _get_corpus_cache()['entries']
+    first_position = len(corpus_data)
+    corpus_data.extend(entries)
+    try:
+        _write_snapshot(corpus_data, {partition_key(entry) for entry in entries})
+    except Exception:
+        # Readers only ever get copies, so the cache can be put back as it was
+        del corpus_data[first_position:]
+        raise
+    
+    for position, entry in enumerate(entries, start=first_position):
+        _index_entry(entry, position)
+    _corpus_cache['version'] += 1
+    _corpus_cache['signature'] = _storage_signature()
+
+def _journal_record(change: Dict[str, Any]) -> Dict[str, Any]:
+    """The journal record for an update or delete change."""
+    record = {'op': change['op'], 'id': change['id'], 'at': change['at']}
+    if change['op'] == 'update':
+        record['patch'] = change['patch']
+    return record
+
+@instrument("data_manager.update_entry", failed=lambda result: result is False)
+@via_service(False)
+def update_entry(entry_id: str, patch: Dict[str, Any]) -> bool:
+    """
+    Change fields of an entry. The patch is appended to the journal rather
+    than rewriting the corpus, and readers see it at once; the compactor folds
+    it into the data file later. 'id' can't be changed; 'updated_at' is set.
+    Returns False if there is no such entry or the write failed.
+    """
+    if _refused_on_follower('update_entry'):
+        return False
+    now = datetime.now().isoformat()
+    patch = {**{field: value for field, value in patch.items() if field != 'id'}, 'updated_at': now}
+    try:
+        with _queued_write():
+            applied = _change_entries([{'op': 'update', 'id': entry_id, 'patch': patch, 'at': now}])
+            if applied:
+                _append_changes([{'op': 'update', 'id': entry_id, 'patch': patch}])
+        return bool(applied)
+    
+    except Exception as e:
+        print(f"Error updating entry {entry_id}: {e}")
+        return False
+
+@instrument("data_manager.delete_entries", payload=lambda args, kwargs, result: len(args[0]), unit="entries", failed=lambda result: result is False)
+@via_service(False)
+def delete_entries(entry_ids: List[str]) -> int:
+    """
+    Delete entries by id with tombstones in the journal, like update_entry.
+    Returns the number of entries deleted.
+    """
+    if _refused_on_follower('delete_entries'):
+        return 0
+    now = datetime.now().isoformat()
+    try:
+        with _queued_write():
+            applied = _change_entries([{'op': 'delete', 'id': entry_id, 'at': now} for entry_id in entry_ids])
+            if applied:
+                _append_changes([{'op': 'delete', 'id': record['id']} for record in applied])
+        return len(applied)
+    
+    except Exception as e:
+        print(f"Error deleting entries: {e}")
+        return 0
+
+def delete_entry(entry_id: str) -> bool:
+    """Delete an entry by id. Returns False if there is no such entry or the write failed."""
+    return delete_entries([entry_id]) == 1
+
+@instrument("data_manager.compact_corpus", payload=lambda args, kwargs, result: result, unit="records")
+@via_service(0)
+def compact_corpus() -> int:
+    """
+    Fold the journal into the data file, which is then rewritten once. Runs in
+    the background every COMPACT_INTERVAL_SECONDS after a journal write.
+    Returns the number of journal records folded.
+    """
+    try:
+        with _queued_write():
+            cache = _get_corpus_cache()
+            folded = _journal['records']
+            if not folded:
+                return 0
+            _write_snapshot(cache['entries'], set())
+            cache['signature'] = _storage_signature()
+        return folded
+    
+    except Exception as e:
+        print(f"Error compacting corpus: {e}")
+        return 0
+
+@via_service()
+def get_latest_sequence() -> int:
+    """Get the sequence number of the newest change, to start following the change feed from."""
+    with file_lock:
+        return _get_change_feed()['latest']
+
+@via_service()
+def changes_since(seq: int, limit: int = 500) -> Dict[str, Any]:
+    """
+    Get the corpus changes made after sequence number seq, oldest first.
+    
+    Each change has 'seq', 'at' and 'op': 'add' changes carry the new 'entry',
+    'update' changes the 'id' and 'patch' of an entry, 'delete' changes the
+    'id' of a deleted entry, and 'reset' changes mean the corpus was replaced
+    as a whole. Costs O(changes
+    returned), not O(corpus).
+    
+    Returns:
+        dict: 'changes' (at most limit), 'seq' (pass it to the next call) and
+        'reset', True when the caller must reload instead: seq is older than
+        the retained log or unknown, or a reset change came after it
+    """
+    with file_lock:
+        feed = _get_change_feed()
+        records = feed['records']
+        latest = feed['latest']
+        oldest = records[0]['seq'] if records else latest + 1
+        if seq == latest:
+            return {'changes': [], 'seq': latest, 'reset': False}
+        if seq > latest or seq < oldest - 1:
+            return {'changes': [], 'seq': latest, 'reset': True}
+        
+        start = seq - oldest + 1
+        changes = records[start:start + limit]
+        if any(change['op'] == 'reset' for change in changes):
+            return {'changes': [], 'seq': latest, 'reset': True}
+        return {'changes': changes, 'seq': changes[-1]['seq'], 'reset': False}
+
+@via_service()
+def get_replication_snapshot() -> Dict[str, Any]:
+    """
+    Get the whole corpus and the sequence number it is current as of, taken
+    together so a follower can apply the changes after it.
+    """
+    with file_lock:
+        entries = list(_get_corpus_cache()['entries'])
+        return {'seq': _get_change_feed()['latest'], 'entries': entries}
+
+@instrument("data_manager.apply_replica_snapshot", payload=lambda args, kwargs, result: len(args[1]), unit="entries", failed=lambda result: result is False)
+@via_service(False)
+def apply_replica_snapshot(seq: int, entries: List[Dict[str, Any]]) -> bool:
+    """
+    Replace the corpus with a snapshot from the primary, on a follower.
+    The change log restarts at the snapshot's sequence number with a reset, so
+    pages following it here reload.
+    """
+    try:
+        with _queued_write():
+            _write_snapshot(entries)
+            _rebuild_cache(list(entries))
+            _corpus_cache['signature'] = _storage_signature()
+            _rewrite_change_log([
+                {'seq': seq, 'at': datetime.now().isoformat(), 'op': 'reset', 'entries': len(entries)}
+            ])
+        return True
+    
+    except Exception as e:
+        print(f"Error applying replica snapshot: {e}")
+        return False
+
+@instrument("data_manager.apply_replica_changes", payload=lambda args, kwargs, result: len(args[0]), unit="changes", failed=lambda result: result is False)
+@via_service(False)
+def apply_replica_changes(changes: List[Dict[str, Any]]) -> bool:
+    """
+    Apply change records from the primary's log, oldest first, on a follower.
+    Records already applied are skipped, so several workers may apply the same
+    records. They are logged here with the primary's sequence numbers.
+    Updates and deletes go to the local journal as they do on the primary.
+    
+    Returns:
+        bool: False if the records don't continue from the last one applied
+        or include a reset; the follower needs a snapshot then
+    """
+    try:
+        with _queued_write():
+            latest = _get_change_feed()['latest']
+            changes = [change for change in changes if change['seq'] > latest]
+            if not changes:
+                return True
+            if changes[0]['seq'] != latest + 1 or any(change['op'] == 'reset' for change in changes):
+                return False
+            
+            # Consecutive adds share one write
+            added = []
+            for change in changes:
+                if change['op'] == 'add':
+                    added.append(change['entry'])
+                    continue
+                if added:
+                    _add_entries(added)
+                    added = []
+                _change_entries([_journal_record(change)])
+            if added:
+                _add_entries(added)
+            _append_records(changes)
+        return True
+    
+    except Exception as e:
+        print(f"Error applying replica changes: {e}")
+        return False
+
 def generate_entry_id() -> str:
-    """Generate a unique ID for a corpus entry."""
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
-    return f"entry_{timestamp}"
+    """
+    Generate a unique ID for a corpus entry.
+    
+    Ids are entry_<local time to the microsecond>_<node>. The time part never
+    repeats or goes backwards within a process, even if the clock does, and
+    node is random per process, so ids are unique across workers and sort in
+    creation order.
+    """
+    with _id_lock:
+        pid = os.getpid()
+        if _id_clock['pid'] != pid:
+            # New process, or forked from one: never share the parent's node
+            _id_clock.update(pid=pid, node=os.urandom(4).hex())
+        micros = max(time.time_ns() // 1000, _id_clock['last_micros'] + 1)
+        _id_clock['last_micros'] = micros
+        node = _id_clock['node']
+    
+    seconds, fraction = divmod(micros, 1_000_000)
+    timestamp = datetime.fromtimestamp(seconds).strftime("%Y%m%d_%H%M%S")
+    return f"entry_{timestamp}_{fraction:06d}_{node}"
+
+@via_service()
+def get_entry_by_id(entry_id: str) -> Optional[Dict[str, Any]]:
+    """Get a corpus entry by its id from the primary-key index, or None."""
+    with file_lock:
+        return _get_corpus_cache()['by_id'].get(entry_id)
+
+@via_service()
+def get_contributor_count(contributor: str) -> int:
+    """Get the number of corpus entries submitted by a contributor."""
+    with file_lock:
+        view = _get_corpus_cache()['by_contributor'].get(contributor)
+        return len(view['ids']) if view else 0
+
+@via_service()
+def get_contributor_counts() -> Dict[str, int]:
+    """Get the number of corpus entries for every contributor."""
+    with file_lock:
+        return {
+            contributor: len(view['ids'])
+            for contributor, view in _get_corpus_cache()['by_contributor'].items()
+        }
+
+@via_service()
+def get_contributor_summary(contributor: str) -> Dict[str, Any]:
+    """Get a contributor's total entry count and a breakdown by entry type."""
+    with file_lock:
+        view = _get_corpus_cache()['by_contributor'].get(contributor)
+        if not view:
+            return {'total': 0, 'type_counts': {}}
+        return {'total': len(view['ids']), 'type_counts': dict(view['type_counts'])}
+
+@via_service()
+def get_contributor_entries(
+    contributor: str,
+    entry_type: Optional[str] = None,
+    sort_by: Optional[str] = 'recent',
+    offset: int = 0,
+    limit: Optional[int] = None
+) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Get one page of a contributor's entries from their materialized view.
+    
+    sort_by is one of CONTRIBUTOR_SORTS, or None for submission order.
+    Returns (entries, total matching entries). Cost is proportional to the
+    contributor's own entries, never the whole corpus.
+    """
+    with file_lock:
+        cache = _get_corpus_cache()
+        view = cache['by_contributor'].get(contributor)
+        if not view:
+            return [], 0
+        
+        if sort_by is None:
+            ids = view['ids']
+        else:
+            ids = view['orderings'].get(sort_by)
+            if ids is None:
+                key, reverse = CONTRIBUTOR_SORTS[sort_by]
+                ids = sorted(view['ids'], key=lambda i: key(cache['by_id'][i]), reverse=reverse)
+                view['orderings'][sort_by] = ids
+        
+        entries = [cache['by_id'][i] for i in ids]
+    
+    if entry_type:
+        entries = [entry for entry in entries if entry.get('type') == entry_type]
+    
+    total = len(entries)
+    end = None if limit is None else offset + limit
+    return entries[offset:end], total
+
+@via_service()
+def get_contributor_export(contributor: str) -> str:
+    """
+    Get a contributor's data as a JSON export.
+    The contributions are serialized once and reused until the contributor
+    saves again; the export date is stamped on every call.
+    """
+    with file_lock:
+        cache = _get_corpus_cache()
+        view = cache['by_contributor'].get(contributor)
+        if view and view['export_blob'] is not None:
+            count, contributions_json = view['export_blob']
+        else:
+            contributions = [cache['by_id'][i] for i in view['ids']] if view else []
+            count = len(contributions)
+            contributions_json = json.dumps(contributions, indent=2, ensure_ascii=False)
+            if view:
+                view['export_blob'] = (count, contributions_json)
+    
+    # Same layout as json.dumps of the whole export with indent=2: the
+    # contributions are nested one level, so every line after the first is
+    # indented by two more spaces (newlines inside strings are escaped)
+    nested = contributions_json.replace('\n', '\n  ')
+    return (
+        '{\n'
+        f'  "username": {json.dumps(contributor, ensure_ascii=False)},\n'
+        f'  "export_date": {json.dumps(datetime.now().isoformat())},\n'
+        f'  "total_contributions": {count},\n'
+        f'  "contributions": {nested}\n'
+        '}'
+    )
 
+@via_service()
 def get_data_by_type(data_type: str) -> List[Dict[str, Any]]:
     """Get all corpus entries of a specific type."""
     corpus_data = load_corpus_data()
     return [entry for entry in corpus_data if entry.get('type') == data_type]
 
+@via_service()
 def get_data_by_language(language: str) -> List[Dict[str, Any]]:
     """Get all corpus entries in a specific language."""
     corpus_data = load_corpus_data()
@@ -109,16 +1094,19 @@ def get_data_by_language(language: str) -> List[Dict[str, Any]]:
         if entry.get('language') == language or entry.get('user_language') == language
     ]
 
+@via_service()
 def get_data_by_region(region: str) -> List[Dict[str, Any]]:
     """Get all corpus entries from a specific region."""
     corpus_data = load_corpus_data()
     return [entry for entry in corpus_data if entry.get('region') == region]
 
+@via_service()
 def get_data_by_festival(festival: str) -> List[Dict[str, Any]]:
     """Get all corpus entries linked to a specific festival."""
     corpus_data = load_corpus_data()
     return [entry for entry in corpus_data if entry.get('festival_event') == festival]
 
+@via_service()
 def get_festival_content_summary() -> Dict[str, Dict[str, int]]:
     """Get summary of content types for each festival."""
     corpus_data = load_corpus_data()
@@ -150,19 +1138,139 @@ def get_festival_content_summary() -> Dict[str, Dict[str, int]]:
     
     return festival_summary
 
+@via_service()
 def get_recent_data(limit: int = 10) -> List[Dict[str, Any]]:
-    """Get the most recent corpus entries."""
-    corpus_data = load_corpus_data()
+    """Get the most recent corpus entries, newest first, from the time index."""
+    if limit <= 0:
+        return []
     
-    # Sort by timestamp (most recent first)
-    sorted_data = sorted(
-        corpus_data, 
-        key=lambda x: x.get('timestamp', ''), 
-        reverse=True
+    with file_lock:
+        cache = _get_corpus_cache()
+        newest = cache['time_order'][-limit:]
+        return [cache['by_id'][entry_id] for _, entry_id in reversed(newest)]
+
+@via_service()
+def get_data_in_time_range(date_from: Optional[str] = None, date_to: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Get entries with date_from <= timestamp <= date_to, oldest first.
+    Bounds are ISO strings compared the same way as the stored timestamps.
+    """
+    with file_lock:
+        cache = _get_corpus_cache()
+        time_order = cache['time_order']
+        start = 0 if date_from is None else bisect.bisect_left(time_order, date_from, key=lambda item: item[0])
+        end = len(time_order) if date_to is None else bisect.bisect_right(time_order, date_to, key=lambda item: item[0])
+        return [cache['by_id'][entry_id] for _, entry_id in time_order[start:end]]
+
+@via_service()
+def get_type_counts() -> Dict[str, int]:
+    """Get the number of entries of each type from the type index."""
+    with file_lock:
+        return {entry_type: len(ids) for entry_type, ids in _get_corpus_cache()['by_type'].items()}
+
+@via_service()
+def get_region_counts() -> Dict[str, int]:
+    """Get the number of entries from each region from the region index."""
+    with file_lock:
+        return {region: len(ids) for region, ids in _get_corpus_cache()['by_region'].items()}
+
+def _matches_search(entry: Dict[str, Any], search_lower: str) -> bool:
+    """Check whether a lowercased search term appears in an entry's display text."""
+    return any(
+        search_lower in str(entry.get(field) or '').lower()
+        for field in ('title', 'name', 'description', 'content')
     )
+
+def _filtered_ordering(cache: Dict[str, Any], filters: Dict[str, Any], order_name: str) -> List[Tuple[Any, str]]:
+    """
+    Get the presorted ordering restricted to entries matching filters.
+    Filtered orderings are built from the smallest index set and cached
+    until the next write.
+    """
+    index_sets = []
+    if filters.get('type'):
+        index_sets.append(cache['by_type'].get(filters['type'], set()))
+    if filters.get('region'):
+        index_sets.append(cache['by_region'].get(filters['region'], set()))
+    if filters.get('contributor'):
+        view = cache['by_contributor'].get(filters['contributor'])
+        index_sets.append(set(view['ids']) if view else set())
+    search_lower = (filters.get('search') or '').strip().lower()
+    
+    if not index_sets and not search_lower:
+        return cache[order_name]
+    
+    cache_key = (order_name, filters.get('type'), filters.get('region'), filters.get('contributor'), search_lower)
+    ordering = cache['query_cache'].get(cache_key)
+    if ordering is not None:
+        _cache_stats['query_hits'] += 1
+        return ordering
+    _cache_stats['query_misses'] += 1
+    
+    if index_sets:
+        index_sets.sort(key=len)
+        candidates = index_sets[0].intersection(*index_sets[1:])
+    else:
+        candidates = cache['by_id'].keys()
+    
+    by_id = cache['by_id']
+    if search_lower:
+        candidates = [i for i in candidates if _matches_search(by_id[i], search_lower)]
+    ordering = sorted((_ordering_keys(by_id[i])[order_name], i) for i in candidates)
     
-    return sorted_data[:limit]
+    if len(cache['query_cache']) >= QUERY_CACHE_SIZE:
+        cache['query_cache'].pop(next(iter(cache['query_cache'])))
+    cache['query_cache'][cache_key] = ordering
+    return ordering
 
+@via_service()
+def query_corpus(
+    filters: Optional[Dict[str, Any]] = None,
+    sort_by: str = 'recent',
+    cursor: Optional[str] = None,
+    page_size: int = 10
+) -> Dict[str, Any]:
+    """
+    Get one page of corpus entries using keyset pagination.
+    
+    Filters can include:
+    - type: entry type
+    - contributor: contributor username
+    - region: region name
+    - search: text to look for in title, name, description or content
+    
+    sort_by is one of GALLERY_SORTS. cursor is the next_cursor returned by the
+    previous page (None for the first page); entries with equal sort keys are
+    ordered by their unique id, so a cursor stays valid while entries are
+    added. A page costs O(page_size + log N) once the filtered ordering is
+    cached.
+    
+    Returns a dict with 'items', 'next_cursor' (None on the last page) and
+    'total' (number of entries matching the filters).
+    """
+    order_name, descending = GALLERY_SORTS[sort_by]
+    
+    with file_lock:
+        cache = _get_corpus_cache()
+        ordering = _filtered_ordering(cache, filters or {}, order_name)
+        position = tuple(json.loads(cursor)) if cursor else None
+        
+        if descending:
+            end = len(ordering) if position is None else bisect.bisect_left(ordering, position)
+            start = max(0, end - page_size)
+            page_keys = ordering[start:end][::-1]
+            has_more = start > 0
+        else:
+            start = 0 if position is None else bisect.bisect_right(ordering, position)
+            page_keys = ordering[start:start + page_size]
+            has_more = start + page_size < len(ordering)
+        
+        items = [cache['by_id'][entry_id] for _, entry_id in page_keys]
+        next_cursor = json.dumps(list(page_keys[-1])) if has_more and page_keys else None
+        return {'items': items, 'next_cursor': next_cursor, 'total': len(ordering)}
+
+@instrument("data_manager.search_corpus", payload=lambda args, kwargs, result: len(result), unit="matches")
+@via_service()
 def search_corpus(query: str) -> List[Dict[str, Any]]:
     """
     Search corpus data for entries containing the query.
@@ -191,6 +1299,7 @@ def search_corpus(query: str) -> List[Dict[str, Any]]:
     
     return matching_entries
 
+@via_service()
 def get_festival_list() -> List[str]:
     """Get list of major Indian festivals for linking content."""
     return [
@@ -204,6 +1313,8 @@ def get_festival_list() -> List[str]:
         "Regional Festival", "Other"
     ]
 
+@instrument("data_manager.get_corpus_statistics", payload=lambda args, kwargs, result: result['total_entries'], unit="entries")
+@via_service()
 def get_corpus_statistics() -> Dict[str, Any]:
     """Get comprehensive statistics about the corpus including internship progress."""
     corpus_data = load_corpus_data()
@@ -242,7 +1353,6 @@ def get_corpus_statistics() -> Dict[str, Any]:
     }
     
     quality_scores = []
-    timestamps = []
     audio_video_hours = 0
     image_text_records = 0
     
@@ -278,10 +1388,6 @@ def get_corpus_statistics() -> Dict[str, Any]:
         # Collect quality scores
         if 'quality_score' in entry:
             quality_scores.append(entry['quality_score'])
-        
-        # Collect timestamps
-        if 'timestamp' in entry:
-            timestamps.append(entry['timestamp'])
     
     # Calculate quality statistics
     if quality_scores:
@@ -293,17 +1399,22 @@ def get_corpus_statistics() -> Dict[str, Any]:
             'low_quality_count': len([s for s in quality_scores if s < 3])
         }
     
-    # Calculate temporal statistics
-    if timestamps:
-        sorted_timestamps = sorted(timestamps)
-        stats['temporal_stats'] = {
-            'first_entry': sorted_timestamps[0],
-            'latest_entry': sorted_timestamps[-1],
-            'entries_today': len([
-                t for t in timestamps 
-                if t.startswith(datetime.now().strftime('%Y-%m-%d'))
-            ])
-        }
+    # Calculate temporal statistics from the time index: its ends and a
+    # bisected range for today, rather than sorting and scanning every timestamp
+    with file_lock:
+        time_order = _get_corpus_cache()['time_order']
+        # Entries without a timestamp sort first under ''
+        first_dated = bisect.bisect_left(time_order, ('\x00',))
+        if first_dated < len(time_order):
+            today = datetime.now().strftime('%Y-%m-%d')
+            stats['temporal_stats'] = {
+                'first_entry': time_order[first_dated][0],
+                'latest_entry': time_order[-1][0],
+                'entries_today': (
+                    bisect.bisect_left(time_order, (today + '\uffff',))
+                    - bisect.bisect_left(time_order, (today,))
+                )
+            }
     
     # Update internship progress
     stats['internship_progress'] = {
@@ -317,6 +1428,31 @@ def get_corpus_statistics() -> Dict[str, Any]:
     
     return stats
 
+def _matches_export_filters(entry: Dict[str, Any], filters: Dict[str, Any]) -> bool:
+    """Check an entry against the non-date export filters."""
+    # Filter by type
+    if 'types' in filters and entry.get('type') not in filters['types']:
+        return False
+    
+    # Filter by language
+    if 'languages' in filters:
+        entry_lang = entry.get('language', entry.get('user_language', ''))
+        if entry_lang not in filters['languages']:
+            return False
+    
+    # Filter by region
+    if 'regions' in filters and entry.get('region') not in filters['regions']:
+        return False
+    
+    # Filter by quality
+    if 'min_quality' in filters:
+        entry_quality = entry.get('quality_score', 0)
+        if entry_quality < filters['min_quality']:
+            return False
+    
+    return True
+
+@via_service()
 def export_corpus_subset(filters: Dict[str, Any]) -> List[Dict[str, Any]]:
     """
     Export a filtered subset of the corpus based on provided filters.
@@ -328,98 +1464,68 @@ def export_corpus_subset(filters: Dict[str, Any]) -> List[Dict[str, Any]]:
     - min_quality: minimum quality score
     - date_from: start date (ISO format)
     - date_to: end date (ISO format)
-    """
-    corpus_data = load_corpus_data()
-    filtered_data = []
     
-    for entry in corpus_data:
-        # Filter by type
-        if 'types' in filters and entry.get('type') not in filters['types']:
-            continue
-        
-        # Filter by language
-        if 'languages' in filters:
-            entry_lang = entry.get('language', entry.get('user_language', ''))
-            if entry_lang not in filters['languages']:
-                continue
-        
-        # Filter by region
-        if 'regions' in filters and entry.get('region') not in filters['regions']:
-            continue
-        
-        # Filter by quality
-        if 'min_quality' in filters:
-            entry_quality = entry.get('quality_score', 0)
-            if entry_quality < filters['min_quality']:
-                continue
-        
-        # Filter by date
-        entry_timestamp = entry.get('timestamp', '')
-        if 'date_from' in filters and entry_timestamp < filters['date_from']:
-            continue
-        if 'date_to' in filters and entry_timestamp > filters['date_to']:
-            continue
-        
-        filtered_data.append(entry)
+    Date bounds are answered with a range scan of the time index, and those
+    results come back oldest first. Without dates, corpus order is kept.
+    """
+    if 'date_from' in filters or 'date_to' in filters:
+        candidates = get_data_in_time_range(filters.get('date_from'), filters.get('date_to'))
+    else:
+        candidates = load_corpus_data()
     
-    return filtered_data
+    return [entry for entry in candidates if _matches_export_filters(entry, filters)]
 
-def backup_corpus_data() -> bool:
-    """Create a timestamped backup of the corpus data."""
+@instrument("data_manager.backup_corpus_data", failed=lambda result: result is False)
+@via_service(False)
+def backup_corpus_data(full: bool = False) -> bool:
+    """
+    Back up the corpus to utils.backups.BACKUP_DIR: a compressed delta of the
+    changes since the last backup, or a base snapshot when one is due or full
+    is set. Returns True if successful, including when nothing changed.
+    """
     try:
-        corpus_data = load_corpus_data()
-        
-        if not corpus_data:
-            return True  # Nothing to backup
-        
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        backup_filename = f"data/corpus_backup_{timestamp}.json"
-        
-        ensure_data_directory()
-        
-        with open(backup_filename, 'w', encoding='utf-8') as f:
-            json.dump(corpus_data, f, indent=2, ensure_ascii=False)
-        
-        print(f"Backup created: {backup_filename}")
+        backup = take_backup(full)
+        if backup:
+            print(f"Backup created: {backup['file']} ({backup['count']} {'entries' if backup['kind'] == 'base' else 'changes'})")
         return True
         
     except Exception as e:
         print(f"Error creating backup: {e}")
         return False
 
+@via_service(0)
 def clean_duplicate_entries() -> int:
     """
     Remove duplicate entries from the corpus based on content similarity.
     Returns the number of duplicates removed.
     """
+    if _refused_on_follower('clean_duplicate_entries'):
+        return 0
     corpus_data = load_corpus_data()
     
     if len(corpus_data) <= 1:
         return 0
     
-    unique_entries = []
-    duplicates_removed = 0
+    duplicate_ids = []
+    seen = set()
     
     for entry in corpus_data:
-        is_duplicate = False
-        
-        for unique_entry in unique_entries:
-            # Check for exact content match
-            if (entry.get('content') == unique_entry.get('content') and
-                entry.get('type') == unique_entry.get('type')):
-                is_duplicate = True
-                duplicates_removed += 1
-                break
-        
-        if not is_duplicate:
-            unique_entries.append(entry)
+        # Exact content match within the same type, checked with one set lookup
+        key = (entry.get('type'), json.dumps(entry.get('content'), sort_keys=True, default=str))
+        if key in seen:
+            if entry.get('id'):
+                duplicate_ids.append(entry['id'])
+        else:
+            seen.add(key)
     
+    # Tombstones for the duplicates instead of rewriting the corpus
+    duplicates_removed = delete_entries(duplicate_ids) if duplicate_ids else 0
     if duplicates_removed > 0:
-        save_corpus_data(unique_entries)
         print(f"Removed {duplicates_removed} duplicate entries")
     
     return duplicates_removed
 
+@via_service()
 def validate_corpus_integrity() -> Dict[str, Any]:
     """
     Validate the integrity of the corpus data.
@@ -435,6 +1541,7 @@ def validate_corpus_integrity() -> Dict[str, Any]:
     }
     
     required_fields = ['type', 'timestamp']
+    seen_ids = set()
     
     for i, entry in enumerate(corpus_data):
         entry_issues = []
@@ -444,6 +1551,14 @@ def validate_corpus_integrity() -> Dict[str, Any]:
             if field not in entry:
                 entry_issues.append(f"Missing required field: {field}")
         
+        # Ids are the primary key
+        entry_id = entry.get('id')
+        if not entry_id:
+            entry_issues.append("Missing id")
+        elif entry_id in seen_ids:
+            entry_issues.append("Duplicate id")
+        seen_ids.add(entry_id)
+        
         # Check timestamp format
         if 'timestamp' in entry:
             try:
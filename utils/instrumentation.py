@@ -0,0 +1,246 @@
+"""
+Latency instrumentation for the hot paths in data_manager, auth and ai_validation.
+
+Functions decorated with @instrument record, per operation and per page, how
+many times they were called, how many failed, a latency histogram and the
+size of what they read or wrote. Everything is kept in process memory and
+can be read with get_instrumentation_snapshot(), dumped as JSON, or browsed
+on the admin Metrics page. Set FESTIVEVOICE_INSTRUMENTATION=0 to turn it
+off; a disabled wrapper costs one flag check per call.
+"""
+import functools
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+# Upper bounds of the latency histogram buckets, in milliseconds; the last
+# bucket catches everything slower
+LATENCY_BUCKETS_MS = (0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+# Page name used for calls made outside a script run, e.g. by warm-up
+BACKGROUND_PAGE = "(background)"
+
+_enabled = os.environ.get("FESTIVEVOICE_INSTRUMENTATION", "1").lower() not in ("0", "false", "no", "off")
+
+# operation -> {'unit': payload unit, 'pages': {page -> stats}}
+_operations: Dict[str, Dict[str, Any]] = {}
+_operations_lock = threading.Lock()
+_started_at = datetime.now().isoformat()
+
+# page script hash -> page name
+_page_names: Dict[str, str] = {}
+
+def _new_stats() -> Dict[str, Any]:
+    return {
+        'count': 0,
+        'errors': 0,
+        'total_ms': 0.0,
+        'max_ms': 0.0,
+        'buckets': [0] * (len(LATENCY_BUCKETS_MS) + 1),
+        'payload_total': 0,
+        'payload_max': 0
+    }
+
+def _current_page() -> str:
+    """Get the name of the page whose script run made the current call."""
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+        ctx = get_script_run_ctx(suppress_warning=True)
+    except Exception:
+        return BACKGROUND_PAGE
+    if ctx is None:
+        return BACKGROUND_PAGE
+
+    page_hash = ctx.page_script_hash
+    name = _page_names.get(page_hash)
+    if name is None:
+        try:
+            info = ctx.pages_manager.get_pages().get(page_hash) or {}
+            name = info.get('page_name') or os.path.basename(info.get('script_path', '')) or "main"
+        except Exception:
+            name = "main"
+        _page_names[page_hash] = name
+    return name
+
+def _record(operation: str, page: str, elapsed_ms: float, failed: bool, payload: Optional[int]):
+    bucket = len(LATENCY_BUCKETS_MS)
+    for index, bound in enumerate(LATENCY_BUCKETS_MS):
+        if elapsed_ms <= bound:
+            bucket = index
+            break
+
+    with _operations_lock:
+        pages = _operations[operation]['pages']
+        stats = pages.get(page)
+        if stats is None:
+            stats = pages[page] = _new_stats()
+        stats['count'] += 1
+        stats['total_ms'] += elapsed_ms
+        stats['buckets'][bucket] += 1
+        if elapsed_ms > stats['max_ms']:
+            stats['max_ms'] = elapsed_ms
+        if failed:
+            stats['errors'] += 1
+        if payload:
+            stats['payload_total'] += payload
+            if payload > stats['payload_max']:
+                stats['payload_max'] = payload
+
+def _payload_size(payload, args, kwargs, result) -> Optional[int]:
+    # A size derived from the result is not available when the call raised
+    if payload is None:
+        return None
+    try:
+        return payload(args, kwargs, result)
+    except Exception:
+        return None
+
+def instrument(
+    operation: str,
+    payload: Optional[Callable[[tuple, dict, Any], int]] = None,
+    unit: str = "items",
+    failed: Optional[Callable[[Any], bool]] = None
+):
+    """
+    Decorator recording latency, call count and payload size of a function.
+
+    Args:
+        operation: Name the calls are reported under, e.g. "data_manager.search_corpus"
+        payload: Gets (args, kwargs, result) and returns the size of the data handled
+        unit: What payload measures, e.g. "entries" or "chars"
+        failed: Gets the result and returns True for a failure that was not raised,
+            e.g. a save function returning False
+    """
+    with _operations_lock:
+        _operations.setdefault(operation, {'unit': unit, 'pages': {}})
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+
+            start = time.perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            except BaseException:
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                _record(operation, _current_page(), elapsed_ms, True, _payload_size(payload, args, kwargs, None))
+                raise
+            elapsed_ms = (time.perf_counter() - start) * 1000
+
+            _record(
+                operation, _current_page(), elapsed_ms,
+                bool(failed and failed(result)), _payload_size(payload, args, kwargs, result)
+            )
+            return result
+        return wrapper
+    return decorator
+
+def is_instrumentation_enabled() -> bool:
+    return _enabled
+
+def set_instrumentation_enabled(enabled: bool):
+    """Turn recording on or off for this process."""
+    global _enabled
+    _enabled = bool(enabled)
+
+def reset_instrumentation():
+    """Clear everything recorded so far."""
+    global _started_at
+    with _operations_lock:
+        for info in _operations.values():
+            info['pages'] = {}
+        _started_at = datetime.now().isoformat()
+
+def _percentile(buckets: List[int], count: int, fraction: float) -> Optional[float]:
+    """Upper bound of the histogram bucket holding the given fraction of calls."""
+    if not count:
+        return None
+    target = count * fraction
+    seen = 0
+    for index, bucket_count in enumerate(buckets):
+        seen += bucket_count
+        if seen >= target:
+            return LATENCY_BUCKETS_MS[index] if index < len(LATENCY_BUCKETS_MS) else float('inf')
+    return float('inf')
+
+def _summarize(stats: Dict[str, Any]) -> Dict[str, Any]:
+    count = stats['count']
+    return {
+        'count': count,
+        'errors': stats['errors'],
+        'total_ms': round(stats['total_ms'], 3),
+        'mean_ms': round(stats['total_ms'] / count, 3) if count else None,
+        'max_ms': round(stats['max_ms'], 3),
+        'p50_ms': _percentile(stats['buckets'], count, 0.50),
+        'p95_ms': _percentile(stats['buckets'], count, 0.95),
+        'p99_ms': _percentile(stats['buckets'], count, 0.99),
+        'buckets': list(stats['buckets']),
+        'payload_total': stats['payload_total'],
+        'payload_mean': round(stats['payload_total'] / count, 1) if count else None,
+        'payload_max': stats['payload_max']
+    }
+
+def _merge(target: Dict[str, Any], stats: Dict[str, Any]):
+    target['count'] += stats['count']
+    target['errors'] += stats['errors']
+    target['total_ms'] += stats['total_ms']
+    target['max_ms'] = max(target['max_ms'], stats['max_ms'])
+    target['buckets'] = [a + b for a, b in zip(target['buckets'], stats['buckets'])]
+    target['payload_total'] += stats['payload_total']
+    target['payload_max'] = max(target['payload_max'], stats['payload_max'])
+
+def get_instrumentation_snapshot() -> Dict[str, Any]:
+    """
+    Get everything recorded so far.
+
+    Returns:
+        dict: 'enabled', 'since', 'bucket_bounds_ms' and 'operations', mapping each
+        operation to its 'unit', overall stats under 'all' and per-page stats under 'pages'
+    """
+    with _operations_lock:
+        raw = {
+            operation: (info['unit'], {page: dict(stats, buckets=list(stats['buckets'])) for page, stats in info['pages'].items()})
+            for operation, info in _operations.items()
+        }
+        since = _started_at
+
+    operations = {}
+    for operation, (unit, pages) in sorted(raw.items()):
+        overall = _new_stats()
+        for stats in pages.values():
+            _merge(overall, stats)
+        operations[operation] = {
+            'unit': unit,
+            'all': _summarize(overall),
+            'pages': {page: _summarize(stats) for page, stats in sorted(pages.items())}
+        }
+
+    return {
+        'enabled': _enabled,
+        'since': since,
+        'generated_at': datetime.now().isoformat(),
+        'bucket_bounds_ms': list(LATENCY_BUCKETS_MS),
+        'operations': operations
+    }
+
+def dump_instrumentation_json(path: Optional[str] = None) -> str:
+    """
+    Serialize the current snapshot as JSON, also writing it to path if given.
+    """
+    # inf percentiles (calls slower than the last bucket) are written as null
+    snapshot = get_instrumentation_snapshot()
+    for info in snapshot['operations'].values():
+        for stats in [info['all']] + list(info['pages'].values()):
+            for key in ('p50_ms', 'p95_ms', 'p99_ms'):
+                if stats[key] == float('inf'):
+                    stats[key] = None
+    text = json.dumps(snapshot, indent=2, ensure_ascii=False)
+    if path:
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+    return text
@@ -0,0 +1,64 @@
+"""
+Lazy loading for heavy dependencies.
+
+pandas, openai and anthropic each take from half a second to a couple of
+seconds to import, and a cold worker would otherwise pay for them on the
+first run of any page that imports them, even when the code path that needs
+them never runs. A module created with lazy_import is only imported the
+first time one of its attributes is used. Load times are recorded so
+benchmarks/startup_imports.py can report them.
+"""
+import importlib
+import sys
+import threading
+import time
+from typing import Dict
+
+_import_times: Dict[str, float] = {}
+_import_lock = threading.Lock()
+
+class LazyModule:
+    """Stand-in for a module that imports it on first attribute access."""
+
+    def __init__(self, name: str):
+        self.__dict__['_name'] = name
+        self.__dict__['_module'] = None
+
+    def _load(self):
+        """Import the real module, once, recording how long it took."""
+        module = self.__dict__['_module']
+        if module is None:
+            with _import_lock:
+                module = self.__dict__['_module']
+                if module is None:
+                    start = time.perf_counter()
+                    module = importlib.import_module(self._name)
+                    _import_times[self._name] = (time.perf_counter() - start) * 1000
+                    self.__dict__['_module'] = module
+        return module
+
+    def __getattr__(self, attr: str):
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr: str, value):
+        setattr(self._load(), attr, value)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.__dict__['_module'] is not None else "not loaded"
+        return f"<lazy module '{self._name}' ({state})>"
+
+def lazy_import(name: str) -> LazyModule:
+    """Get a lazy stand-in for a module. Import errors surface on first use."""
+    return LazyModule(name)
+
+def is_loaded(name: str) -> bool:
+    """Check whether a module has actually been imported in this process."""
+    return name in sys.modules
+
+def get_import_times() -> Dict[str, float]:
+    """Get the load time in milliseconds of each lazy module imported so far."""
+    with _import_lock:
+        return dict(_import_times)
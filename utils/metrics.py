@@ -0,0 +1,225 @@
+"""
+Metrics endpoint for production monitoring.
+
+Serves /metrics on the status server (see utils.status_server) in the
+Prometheus text exposition format. Every value comes from counters and
+caches already held in process memory: corpus counts from the corpus
+indexes, file sizes as of the last read or write, latency histograms from
+utils.instrumentation, cache hit/miss counters, queue depths and session
+accounting. A scrape never reads the data files.
+"""
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+PROCESS_START_TIME = time.time()
+
+# Per-operation histograms exported from utils.instrumentation
+DURATION_METRIC = "festivevoice_operation_duration_seconds"
+
+def _escape(value: Any) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return "+Inf"
+    if isinstance(value, float) and not value.is_integer():
+        return repr(value)
+    return str(int(value))
+
+def _family(
+    lines: List[str], name: str, metric_type: str, help_text: str,
+    samples: Iterable[Tuple[Optional[Dict[str, Any]], float]]
+):
+    """Append one metric family: its HELP and TYPE lines and a line per sample."""
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} {metric_type}")
+    for labels, value in samples:
+        label_text = ""
+        if labels:
+            label_text = "{" + ",".join(f'{key}="{_escape(val)}"' for key, val in labels.items()) + "}"
+        lines.append(f"{name}{label_text} {_format_value(value)}")
+
+def _operation_lines(lines: List[str]):
+    """Latency histograms, error counts and payload totals of instrumented operations."""
+    from utils.instrumentation import get_instrumentation_snapshot
+
+    snapshot = get_instrumentation_snapshot()
+    bounds = [bound / 1000 for bound in snapshot['bucket_bounds_ms']] + [float('inf')]
+    operations = snapshot['operations']
+
+    lines.append(f"# HELP {DURATION_METRIC} Latency of instrumented storage, auth and validation operations.")
+    lines.append(f"# TYPE {DURATION_METRIC} histogram")
+    for operation, info in operations.items():
+        stats = info['all']
+        cumulative = 0
+        for bound, count in zip(bounds, stats['buckets']):
+            cumulative += count
+            le = "+Inf" if bound == float('inf') else repr(bound)
+            lines.append(f'{DURATION_METRIC}_bucket{{operation="{_escape(operation)}",le="{le}"}} {cumulative}')
+        lines.append(f'{DURATION_METRIC}_sum{{operation="{_escape(operation)}"}} {_format_value(stats["total_ms"] / 1000)}')
+        lines.append(f'{DURATION_METRIC}_count{{operation="{_escape(operation)}"}} {stats["count"]}')
+
+    _family(
+        lines, "festivevoice_operation_errors_total", "counter",
+        "Instrumented calls that raised or reported failure.",
+        [({'operation': operation}, info['all']['errors']) for operation, info in operations.items()]
+    )
+    _family(
+        lines, "festivevoice_operation_payload_total", "counter",
+        "Total size of the data handled by instrumented calls, in the operation's unit.",
+        [({'operation': operation, 'unit': info['unit']}, info['all']['payload_total']) for operation, info in operations.items()]
+    )
+
+def _storage_lines(lines: List[str], corpus: Dict[str, Any]):
+    """Corpus and user file gauges and the corpus write queue."""
+    from utils.auth import get_users_file_stats
+    from utils.corpus_service import get_service_stats
+
+    users = get_users_file_stats()
+    service = get_service_stats()
+
+    _family(
+        lines, "festivevoice_corpus_entries", "gauge",
+        "Corpus entries by type.",
+        [({'type': entry_type}, count) for entry_type, count in sorted(corpus['by_type'].items())]
+    )
+    _family(
+        lines, "festivevoice_corpus_version", "gauge",
+        "Corpus cache version, bumped on every change.",
+        [(None, corpus['version'])]
+    )
+    _family(
+        lines, "festivevoice_data_file_bytes", "gauge",
+        "Size of the data files as last read or written by this process.",
+        [({'file': corpus['file']}, corpus['file_bytes']), ({'file': 'users.json'}, users['bytes'])]
+    )
+    _family(
+        lines, "festivevoice_registered_users", "gauge",
+        "Users in users.json as last read or written by this process.",
+        [(None, users['users'])]
+    )
+    if corpus['partitions']:
+        _family(
+            lines, "festivevoice_corpus_partitions", "gauge",
+            "Monthly corpus partitions, hot (uncompressed) or frozen (gzipped).",
+            [({'state': state}, corpus['partitions'][state]) for state in ('hot', 'frozen')]
+        )
+    _family(
+        lines, "festivevoice_corpus_journal_records", "gauge",
+        "Corpus updates and deletes not yet folded into the data file by the compactor.",
+        [(None, corpus['journal_records'])]
+    )
+    _family(
+        lines, "festivevoice_corpus_writes_waiting", "gauge",
+        "Corpus writers waiting for the file lock.",
+        [(None, corpus['writes_waiting'])]
+    )
+    _family(
+        lines, "festivevoice_corpus_service_calls_total", "counter",
+        "data_manager calls from this process sent to the corpus service, run in-process because it was unreachable, or failed in flight.",
+        [({'result': result}, service[result]) for result in ('remote', 'fallback', 'failed')]
+    )
+
+def _replication_lines(lines: List[str]):
+    """Progress and lag of a read replica; nothing on other workers."""
+    from utils.replication import get_replication_status
+
+    status = get_replication_status()
+    if status['role'] != 'follower':
+        return
+    _family(
+        lines, "festivevoice_replication_applied_sequence", "gauge",
+        "Sequence number of the last primary change applied by this follower.",
+        [(None, status['applied'] or 0)]
+    )
+    _family(
+        lines, "festivevoice_replication_lag_changes", "gauge",
+        "Changes the primary had that this follower had not applied, as of the last poll.",
+        [(None, status['lag_changes'] or 0)]
+    )
+    if status['lag_seconds'] is not None:
+        _family(
+            lines, "festivevoice_replication_lag_seconds", "gauge",
+            "Seconds since this follower last matched the primary.",
+            [(None, status['lag_seconds'])]
+        )
+    _family(
+        lines, "festivevoice_replication_snapshots_total", "counter",
+        "Full corpus snapshots this follower loaded from the primary.",
+        [(None, status['snapshots'])]
+    )
+
+def _cache_lines(lines: List[str], corpus: Dict[str, Any]):
+    """Hit and miss counters of the in-process caches."""
+    from utils.cards import get_fragment_cache_stats
+    from utils.theming import create_chatgpt_message, create_styled_card
+
+    fragments = get_fragment_cache_stats()
+    caches = [
+        ('corpus', corpus['cache']['corpus_hits'], corpus['cache']['corpus_misses']),
+        ('query', corpus['cache']['query_hits'], corpus['cache']['query_misses']),
+        ('entry_fragments', fragments['hits'], fragments['misses'])
+    ]
+    for name, cached in (('styled_cards', create_styled_card), ('chat_messages', create_chatgpt_message)):
+        info = cached.cache_info()
+        caches.append((name, info.hits, info.misses))
+
+    samples = []
+    for name, hits, misses in caches:
+        samples.append(({'cache': name, 'result': 'hit'}, hits))
+        samples.append(({'cache': name, 'result': 'miss'}, misses))
+    _family(
+        lines, "festivevoice_cache_requests_total", "counter",
+        "In-process cache lookups by result; hit ratio is hit / (hit + miss).",
+        samples
+    )
+
+def _process_lines(lines: List[str]):
+    """Queue depths, sessions and readiness."""
+    from utils.password_hashing import get_hash_queue_depth
+    from utils.session_memory import get_process_session_memory
+    from utils.warmup import is_ready
+
+    sessions = get_process_session_memory()
+    _family(
+        lines, "festivevoice_queue_depth", "gauge",
+        "Work waiting or running in in-process queues.",
+        [({'queue': 'password_hashing'}, get_hash_queue_depth())]
+    )
+    _family(
+        lines, "festivevoice_active_sessions", "gauge",
+        "Browser sessions that ran a page in the last 30 minutes.",
+        [(None, sessions['sessions'])]
+    )
+    _family(
+        lines, "festivevoice_session_state_bytes", "gauge",
+        "Approximate session state memory across active sessions.",
+        [({'stat': 'total'}, sessions['total_bytes']), ({'stat': 'max'}, sessions['max_bytes'])]
+    )
+    _family(
+        lines, "festivevoice_ready", "gauge",
+        "1 once warm-up has finished successfully.",
+        [(None, 1 if is_ready() else 0)]
+    )
+    _family(
+        lines, "festivevoice_process_start_time_seconds", "gauge",
+        "Start time of the process since the Unix epoch.",
+        [(None, PROCESS_START_TIME)]
+    )
+
+def render_metrics() -> str:
+    """Render every metric in the text exposition format."""
+    from utils.data_manager import get_corpus_metrics
+
+    corpus = get_corpus_metrics()
+    lines = []
+    _operation_lines(lines)
+    _storage_lines(lines, corpus)
+    _replication_lines(lines)
+    _cache_lines(lines, corpus)
+    _process_lines(lines)
+    return "\n".join(lines) + "\n"
+
+def metrics_route():
+    """Status server handler for /metrics."""
+    return 200, "text/plain; version=0.0.4; charset=utf-8", render_metrics()
@@ -0,0 +1,216 @@
+"""
+Monthly partitioned corpus storage.
+
+With FESTIVEVOICE_CORPUS_LAYOUT=monthly the corpus is kept in PARTITION_DIR
+as one JSON file per month of entry timestamp (YYYY-MM.json, plus
+undated.json for entries without one) instead of a single corpus_data.json.
+manifest.json lists the partitions with their entry counts and sizes, and is
+rewritten last on every write, so its signature tells readers whether
+anything changed.
+
+A write rewrites only the months it touched: a contribution costs a rewrite
+of the current month, not of the corpus. Months more than
+FREEZE_AFTER_MONTHS before the current one are frozen: rewritten once
+gzipped, and then never again unless an entry in them is edited or deleted.
+Partitions parsed once are kept per process and reused while their manifest
+record is unchanged, so reloading after another process wrote re-reads only
+the months it wrote, and frozen months are read once per process.
+A partition that cannot be read is left out of the loaded corpus and is
+never rewritten or removed by a write: writes that would add entries to its
+month fail until it is restored.
+
+data_manager decides which layout to use and calls these with its file_lock
+held. The first load in the monthly layout migrates corpus_data.json; the
+old file is left in place but no longer read.
+"""
+import gzip
+import json
+import os
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+CORPUS_LAYOUT = os.environ.get("FESTIVEVOICE_CORPUS_LAYOUT", "file")
+PARTITION_DIR = os.environ.get("FESTIVEVOICE_PARTITION_DIR", "data/corpus")
+MANIFEST_PATH = os.path.join(PARTITION_DIR, "manifest.json")
+# Months before the current one that stay uncompressed
+FREEZE_AFTER_MONTHS = int(os.environ.get("FESTIVEVOICE_FREEZE_AFTER_MONTHS", 3))
+UNDATED = "undated"
+COMPRESS_LEVEL = 6
+
+# Month -> (manifest record, entries) for every partition parsed by this process
+_loaded: Dict[str, Any] = {}
+# Months whose partition failed to read on the last read
+_unreadable = set()
+# Totals as of the last manifest read or write, for the metrics endpoint
+_state = {'bytes': 0, 'hot': 0, 'frozen': 0}
+
+def is_partitioned() -> bool:
+    """Whether the corpus is stored in monthly partitions."""
+    return CORPUS_LAYOUT == "monthly"
+
+def has_partitions() -> bool:
+    """Whether partitioned storage has been written yet."""
+    return os.path.exists(MANIFEST_PATH)
+
+def partition_key(entry: Dict[str, Any]) -> str:
+    """The month (YYYY-MM) an entry is stored under, from its timestamp."""
+    month = str(entry.get('timestamp') or '')[:7]
+    if len(month) == 7 and month[4] == '-' and month[:4].isdigit() and month[5:].isdigit():
+        return month
+    return UNDATED
+
+def _frozen_before() -> str:
+    """Months sorting before this one are frozen."""
+    now = datetime.now()
+    year, month = now.year, now.month - FREEZE_AFTER_MONTHS
+    while month < 1:
+        month += 12
+        year -= 1
+    return f"{year:04d}-{month:02d}"
+
+def load_manifest() -> Dict[str, Dict[str, Any]]:
+    """Get the partition records by month."""
+    try:
+        with open(MANIFEST_PATH, 'r', encoding='utf-8') as f:
+            return json.load(f)['partitions']
+    except FileNotFoundError:
+        return {}
+
+def _save_manifest(partitions: Dict[str, Dict[str, Any]]):
+    tmp_path = f"{MANIFEST_PATH}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'layout': 'monthly', 'partitions': partitions}, f, indent=2, sort_keys=True)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, MANIFEST_PATH)
+
+def _update_state(partitions: Dict[str, Dict[str, Any]]):
+    _state['bytes'] = sum(record['bytes'] for record in partitions.values())
+    _state['frozen'] = sum(1 for record in partitions.values() if record['frozen'])
+    _state['hot'] = len(partitions) - _state['frozen']
+
+def get_partition_stats() -> Dict[str, int]:
+    """Get the partition bytes and hot and frozen counts as of the last read or write."""
+    return dict(_state)
+
+def _read_partition(record: Dict[str, Any]) -> List[Dict[str, Any]]:
+    path = os.path.join(PARTITION_DIR, record['file'])
+    if record['frozen']:
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            return json.load(f)
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def _write_partition(month: str, entries: List[Dict[str, Any]], frozen: bool) -> Dict[str, Any]:
+    """Write one month's entries, flushed to disk and renamed into place; returns its record."""
+    if frozen:
+        name = f"{month}.json.gz"
+        data = gzip.compress(json.dumps(entries, ensure_ascii=False).encode('utf-8'), compresslevel=COMPRESS_LEVEL)
+    else:
+        name = f"{month}.json"
+        data = json.dumps(entries, indent=2, ensure_ascii=False).encode('utf-8')
+    path = os.path.join(PARTITION_DIR, name)
+    with open(f"{path}.tmp", 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(f"{path}.tmp", path)
+    return {
+        'file': name,
+        'entries': len(entries),
+        'bytes': len(data),
+        'frozen': frozen,
+        'written_at': datetime.now().isoformat()
+    }
+
+def read_partitions() -> List[Dict[str, Any]]:
+    """
+    Read the corpus from its partitions, oldest month first. Partitions whose
+    manifest record is unchanged since this process last read or wrote them
+    are not read again.
+    """
+    partitions = load_manifest()
+    entries = []
+    _unreadable.clear()
+    for month in sorted(partitions):
+        record = partitions[month]
+        kept = _loaded.get(month)
+        if kept is None or kept[0] != record:
+            try:
+                kept = (record, _read_partition(record))
+            except Exception as e:
+                print(f"Error loading corpus partition {record['file']}, leaving it untouched: {e}")
+                _loaded.pop(month, None)
+                _unreadable.add(month)
+                continue
+            _loaded[month] = kept
+        entries.extend(kept[1])
+    for month in set(_loaded) - set(partitions):
+        del _loaded[month]
+    _update_state(partitions)
+    return entries
+
+def _dirty_months(
+    partitions: Dict[str, Dict[str, Any]], grouped: Dict[str, List[Dict[str, Any]]],
+    months: Optional[Iterable[str]], frozen_before: str
+) -> set:
+    """The months a write rewrites or removes, leaving out unreadable ones."""
+    dirty = set(grouped) | set(partitions) if months is None else set(months)
+    # A month whose file could not be read is left alone rather than frozen empty
+    dirty |= {
+        month for month, record in partitions.items()
+        if not record['frozen'] and month < frozen_before and month in grouped
+    }
+    for month in dirty & _unreadable:
+        if grouped.get(month):
+            raise OSError(f"Corpus partition for {month} could not be read; restore it before adding entries to it")
+    return dirty - _unreadable
+
+def write_partitions(entries: List[Dict[str, Any]], months: Optional[Iterable[str]] = None) -> int:
+    """
+    Write the corpus to its partitions. Only the given months are rewritten
+    (all of them when months is None), plus any month due to be frozen;
+    months left without entries are removed. Months that could not be read
+    are skipped, as their entries are not in entries.
+
+    Returns:
+        int: Bytes written
+    """
+    if not has_partitions():
+        months = None
+    os.makedirs(PARTITION_DIR, exist_ok=True)
+    partitions = load_manifest()
+    frozen_before = _frozen_before()
+
+    grouped = {}
+    for entry in entries:
+        grouped.setdefault(partition_key(entry), []).append(entry)
+    dirty = _dirty_months(partitions, grouped, months, frozen_before)
+
+    written = 0
+    replaced = []
+    for month in sorted(dirty):
+        old = partitions.get(month)
+        month_entries = grouped.get(month)
+        if not month_entries:
+            if old:
+                replaced.append(old['file'])
+                del partitions[month]
+                _loaded.pop(month, None)
+            continue
+        record = _write_partition(month, month_entries, month < frozen_before)
+        if old and old['file'] != record['file']:
+            replaced.append(old['file'])
+        partitions[month] = record
+        _loaded[month] = (record, month_entries)
+        written += record['bytes']
+
+    # Readers go by the manifest, so old files are only removed once it is replaced
+    _save_manifest(partitions)
+    for name in replaced:
+        try:
+            os.remove(os.path.join(PARTITION_DIR, name))
+        except FileNotFoundError:
+            pass
+    _update_state(partitions)
+    return written
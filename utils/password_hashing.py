@@ -0,0 +1,196 @@
+"""
+Password hashing service for the FestiveVoice authentication system.
+
+Passwords are hashed with scrypt, a memory-hard KDF. Each hash costs tens of
+milliseconds of CPU, so the KDF runs in a bounded process pool instead of on
+the Streamlit script thread. The calling thread just waits on the result,
+which lets other sessions keep running while a login is being verified.
+
+Stored hash format: scrypt$<n>$<r>$<p>$<salt_b64>$<key_b64>
+Legacy unsalted SHA-256 hex digests are still accepted by verify_password and
+reported as needing a rehash.
+"""
+import base64
+import hashlib
+import hmac
+import multiprocessing
+import os
+import secrets
+import threading
+from concurrent.futures import BrokenExecutor, ProcessPoolExecutor
+from typing import Dict, Optional, Tuple
+
+HASH_SCHEME = "scrypt"
+SALT_BYTES = 16
+KEY_BYTES = 32
+
+# KDF cost parameters, tunable per deployment (see benchmarks/password_hashing.py)
+SCRYPT_N = int(os.environ.get("FESTIVEVOICE_SCRYPT_N", 2 ** 14))
+SCRYPT_R = int(os.environ.get("FESTIVEVOICE_SCRYPT_R", 8))
+SCRYPT_P = int(os.environ.get("FESTIVEVOICE_SCRYPT_P", 1))
+
+# Largest scrypt working set (128 * r * n bytes) accepted from a stored hash
+MAX_KDF_MEMORY = 256 * 1024 * 1024
+
+# Number of worker processes; 0 runs the KDF inline on the calling thread
+HASH_POOL_WORKERS = int(
+    os.environ.get("FESTIVEVOICE_HASH_WORKERS", min(4, os.cpu_count() or 1))
+)
+
+_hash_pool = None
+_hash_pool_lock = threading.Lock()
+# Hashes submitted to the pool and not yet finished
+_pool_jobs = {'pending': 0}
+_pool_jobs_lock = threading.Lock()
+
+
+def get_hash_parameters() -> Dict[str, int]:
+    """Get the KDF cost parameters used for new hashes."""
+    return {'n': SCRYPT_N, 'r': SCRYPT_R, 'p': SCRYPT_P}
+
+
+def _scrypt_maxmem(n: int, r: int, p: int) -> int:
+    """Memory limit for scrypt, with headroom over the 128 * r * (n + p) it needs."""
+    return 128 * r * (n + p + 2) + 1024 * 1024
+
+
+def _valid_parameters(n: int, r: int, p: int) -> bool:
+    """Whether scrypt accepts n, r and p within MAX_KDF_MEMORY."""
+    if n < 2 or n & (n - 1) or r < 1 or p < 1:
+        return False
+    return 128 * r * n <= MAX_KDF_MEMORY and r * p < 2 ** 30
+
+
+def _derive_key(password: str, salt: bytes, n: int, r: int, p: int) -> bytes:
+    """Run the scrypt KDF. Module-level so it can be pickled into pool workers."""
+    return hashlib.scrypt(
+        password.encode('utf-8'),
+        salt=salt,
+        n=n,
+        r=r,
+        p=p,
+        maxmem=_scrypt_maxmem(n, r, p),
+        dklen=KEY_BYTES
+    )
+
+
+def get_hash_pool() -> Optional[ProcessPoolExecutor]:
+    """Get the shared hashing pool, creating it on first use."""
+    global _hash_pool
+
+    if HASH_POOL_WORKERS <= 0:
+        return None
+
+    with _hash_pool_lock:
+        if _hash_pool is None:
+            # Forking the multi-threaded Streamlit server is unsafe, so spawn
+            # fresh interpreters that only import this module.
+            _hash_pool = ProcessPoolExecutor(
+                max_workers=HASH_POOL_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _hash_pool
+
+
+def configure_hash_pool(max_workers: int):
+    """Resize the hashing pool. Running work finishes on the old pool."""
+    global HASH_POOL_WORKERS
+    shutdown_hash_pool()
+    HASH_POOL_WORKERS = max_workers
+
+
+def shutdown_hash_pool():
+    """Shut down the hashing pool if it was started."""
+    global _hash_pool
+    with _hash_pool_lock:
+        if _hash_pool is not None:
+            _hash_pool.shutdown(wait=True)
+            _hash_pool = None
+
+
+def _discard_broken_pool(pool: ProcessPoolExecutor):
+    """Drop a pool whose workers died, so the next hash starts a fresh one."""
+    global _hash_pool
+    with _hash_pool_lock:
+        if _hash_pool is pool:
+            _hash_pool = None
+    pool.shutdown(wait=False)
+
+
+def _run_kdf(password: str, salt: bytes, n: int, r: int, p: int) -> bytes:
+    """
+    Run the KDF in the pool, or inline if the pool is disabled or broken.
+    Errors from the KDF itself are raised, not retried inline.
+    """
+    pool = get_hash_pool()
+    if pool is None:
+        return _derive_key(password, salt, n, r, p)
+
+    with _pool_jobs_lock:
+        _pool_jobs['pending'] += 1
+    try:
+        return pool.submit(_derive_key, password, salt, n, r, p).result()
+    except BrokenExecutor as e:
+        print(f"Password hashing pool broke ({e}), restarting it and hashing inline")
+        _discard_broken_pool(pool)
+        return _derive_key(password, salt, n, r, p)
+    finally:
+        with _pool_jobs_lock:
+            _pool_jobs['pending'] -= 1
+
+
+def get_hash_queue_depth() -> int:
+    """Get the number of hashes waiting for or running in the pool."""
+    with _pool_jobs_lock:
+        return _pool_jobs['pending']
+
+
+def hash_password(password: str, params: Optional[Dict[str, int]] = None) -> str:
+    """Hash a password with a random salt and the configured scrypt cost."""
+    params = params or get_hash_parameters()
+    n, r, p = params['n'], params['r'], params['p']
+    salt = secrets.token_bytes(SALT_BYTES)
+    key = _run_kdf(password, salt, n, r, p)
+
+    salt_b64 = base64.b64encode(salt).decode('ascii')
+    key_b64 = base64.b64encode(key).decode('ascii')
+    return f"{HASH_SCHEME}${n}${r}${p}${salt_b64}${key_b64}"
+
+
+def is_legacy_hash(stored_hash: str) -> bool:
+    """Check whether a stored hash is an unsalted SHA-256 hex digest."""
+    return len(stored_hash) == 64 and all(c in '0123456789abcdef' for c in stored_hash)
+
+
+def verify_password(password: str, stored_hash: str) -> Tuple[bool, bool]:
+    """
+    Check a password against a stored hash.
+    Returns (is_valid, needs_rehash). needs_rehash is True for legacy SHA-256
+    hashes and for scrypt hashes made with different cost parameters.
+    """
+    if not stored_hash:
+        return False, False
+
+    if is_legacy_hash(stored_hash):
+        legacy = hashlib.sha256(password.encode()).hexdigest()
+        return hmac.compare_digest(legacy, stored_hash), True
+
+    try:
+        scheme, n, r, p, salt_b64, key_b64 = stored_hash.split('$')
+        if scheme != HASH_SCHEME:
+            return False, False
+        n, r, p = int(n), int(r), int(p)
+        # binascii.Error, raised for bad base64, is a ValueError
+        salt = base64.b64decode(salt_b64, validate=True)
+        expected = base64.b64decode(key_b64, validate=True)
+    except ValueError:
+        print("Unrecognised password hash format")
+        return False, False
+    if not salt or len(expected) != KEY_BYTES or not _valid_parameters(n, r, p):
+        print("Password hash has invalid scrypt parameters")
+        return False, False
+
+    key = _run_kdf(password, salt, n, r, p)
+    is_valid = hmac.compare_digest(key, expected)
+    needs_rehash = (n, r, p) != (SCRYPT_N, SCRYPT_R, SCRYPT_P)
+    return is_valid, needs_rehash
@@ -0,0 +1,268 @@
+"""
+Opt-in per-rerun profiler for app.py and the pages/ scripts.
+
+Each page calls profile_page_run() once near the top. When profiling is on
+(FESTIVEVOICE_PROFILE=1, or the switch on the admin Metrics page), a sampler
+thread looks at the script thread's call stack every few milliseconds until
+the page script returns. Each sample is attributed to data loading
+(data_manager, auth, st.cache_* lookups), rendering (Streamlit elements,
+theming and cards) or computation (everything else), and to the section of
+the page script it was in, named after the nearest top-level "# ..." comment.
+The full stacks are kept only for reruns slower than the slow threshold. The
+last FESTIVEVOICE_PROFILE_HISTORY profiles are kept in a ring buffer.
+
+Fragment reruns do not run the page's top level and are not profiled.
+"""
+import collections
+import linecache
+import os
+import re
+import sys
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+PROFILE_HISTORY = int(os.environ.get("FESTIVEVOICE_PROFILE_HISTORY", 200))
+SAMPLE_INTERVAL_MS = float(os.environ.get("FESTIVEVOICE_PROFILE_INTERVAL_MS", 5))
+SLOW_RERUN_MS = float(os.environ.get("FESTIVEVOICE_PROFILE_SLOW_MS", 500))
+# Deepest stack kept for a slow rerun, counted from the page script
+STACK_DEPTH = 40
+# Sections and stacks kept per profile, largest first
+TOP_SECTIONS = 15
+TOP_STACKS = 20
+
+CATEGORIES = ('data', 'compute', 'render')
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_DATA_FILES = {os.path.join(ROOT, "utils", name) for name in ("data_manager.py", "auth.py")}
+_RENDER_FILES = {os.path.join(ROOT, "utils", name) for name in ("theming.py", "cards.py")}
+
+_enabled = os.environ.get("FESTIVEVOICE_PROFILE", "0").lower() in ("1", "true", "yes", "on")
+
+_profiles = collections.deque(maxlen=PROFILE_HISTORY)
+# script thread ident -> profile being recorded
+_active: Dict[int, Dict[str, Any]] = {}
+_lock = threading.Lock()
+_sampler_thread = None
+
+# (filename, line) -> section label
+_section_labels: Dict[tuple, str] = {}
+_SECTION_COMMENT = re.compile(r"^#\s*(.+?)\s*$")
+
+_streamlit_dir = None
+_streamlit_cache_dir = None
+
+def _streamlit_dirs():
+    global _streamlit_dir, _streamlit_cache_dir
+    if _streamlit_dir is None:
+        import streamlit
+        _streamlit_dir = os.path.dirname(streamlit.__file__) + os.sep
+        _streamlit_cache_dir = os.path.join(_streamlit_dir, "runtime", "caching") + os.sep
+    return _streamlit_dir, _streamlit_cache_dir
+
+def is_profiling_enabled() -> bool:
+    return _enabled
+
+def set_profiling_enabled(enabled: bool):
+    """Turn profiling of new page runs on or off for this process."""
+    global _enabled
+    _enabled = bool(enabled)
+
+def profile_page_run():
+    """
+    Profile the rest of the calling page script's run, if profiling is on.
+    Call it from the top level of the page script.
+    """
+    if not _enabled:
+        return
+
+    caller = sys._getframe(1)
+    thread_id = threading.get_ident()
+    now = time.perf_counter()
+    profile = {
+        'page': os.path.basename(caller.f_code.co_filename),
+        'code': caller.f_code,
+        'started_at': datetime.now().isoformat(),
+        'start': now,
+        'last_seen': now,
+        'samples': 0,
+        'categories': dict.fromkeys(CATEGORIES, 0),
+        'sections': collections.Counter(),
+        'stacks': collections.Counter()
+    }
+
+    with _lock:
+        previous = _active.pop(thread_id, None)
+        if previous is not None:
+            _finish(previous)
+        _active[thread_id] = profile
+    _ensure_sampler()
+
+def _ensure_sampler():
+    global _sampler_thread
+    with _lock:
+        if _sampler_thread is None or not _sampler_thread.is_alive():
+            _sampler_thread = threading.Thread(target=_sample_loop, name="page-profiler", daemon=True)
+            _sampler_thread.start()
+
+def _sample_loop():
+    """Sample every active page run until none are left."""
+    global _sampler_thread
+    interval = SAMPLE_INTERVAL_MS / 1000
+    while True:
+        time.sleep(interval)
+        frames = sys._current_frames()
+        now = time.perf_counter()
+        with _lock:
+            for thread_id, profile in list(_active.items()):
+                if not _sample(profile, frames.get(thread_id), now):
+                    del _active[thread_id]
+                    # It returned somewhere between the last two samples
+                    _finish(profile, (profile['last_seen'] + now) / 2)
+            if not _active:
+                _sampler_thread = None
+                return
+
+def _sample(profile: Dict[str, Any], frame, now: float) -> bool:
+    """Record one sample of a page run. Returns False once the page script has returned."""
+    # Innermost first, up to the page script's own frame
+    stack = []
+    while frame is not None and frame.f_code is not profile['code']:
+        stack.append(frame)
+        frame = frame.f_back
+    if frame is None:
+        return False
+
+    profile['last_seen'] = now
+    profile['samples'] += 1
+    profile['categories'][_categorize(stack)] += 1
+    profile['sections'][(frame.f_lineno, _section_label(frame.f_code.co_filename, frame.f_lineno))] += 1
+    outer = stack[::-1][:STACK_DEPTH]
+    profile['stacks'][";".join(
+        [f"{profile['page']}:{frame.f_lineno}"]
+        + [f"{os.path.basename(f.f_code.co_filename)}:{f.f_code.co_name}:{f.f_lineno}" for f in outer]
+    )] += 1
+    return True
+
+def _categorize(stack: List[Any]) -> str:
+    """Attribute a sample to the innermost frame that belongs to a known category."""
+    streamlit_dir, streamlit_cache_dir = _streamlit_dirs()
+    for frame in stack:
+        filename = frame.f_code.co_filename
+        if filename in _DATA_FILES or filename.startswith(streamlit_cache_dir):
+            return 'data'
+        if filename in _RENDER_FILES or filename.startswith(streamlit_dir):
+            return 'render'
+        if filename.startswith(ROOT) and os.sep + "site-packages" + os.sep not in filename:
+            return 'compute'
+    return 'compute'
+
+def _section_label(filename: str, lineno: int) -> str:
+    """Name of the page section a line is in: the nearest top-level comment above it."""
+    key = (filename, lineno)
+    label = _section_labels.get(key)
+    if label is None:
+        label = f"line {lineno}"
+        for number in range(lineno, 0, -1):
+            match = _SECTION_COMMENT.match(linecache.getline(filename, number))
+            if match:
+                label = match.group(1)
+                break
+        _section_labels[key] = label
+    return label
+
+def _finish(profile: Dict[str, Any], end: Optional[float] = None):
+    """Turn a finished run's samples into a stored profile. Called with _lock held."""
+    end = profile['last_seen'] if end is None else end
+    wall_ms = (end - profile['start']) * 1000
+    samples = profile['samples']
+    per_sample_ms = wall_ms / samples if samples else 0
+
+    sections = {}
+    for (line, label), count in profile['sections'].items():
+        section = sections.setdefault(label, {'section': label, 'line': line, 'ms': 0.0})
+        section['line'] = min(section['line'], line)
+        section['ms'] += count * per_sample_ms
+
+    slow = wall_ms >= SLOW_RERUN_MS
+    _profiles.append({
+        'page': profile['page'],
+        'started_at': profile['started_at'],
+        'wall_ms': round(wall_ms, 1),
+        'samples': samples,
+        'split_ms': {name: round(count * per_sample_ms, 1) for name, count in profile['categories'].items()},
+        'sections': sorted(sections.values(), key=lambda s: s['ms'], reverse=True)[:TOP_SECTIONS],
+        'slow': slow,
+        'stacks': [
+            {'stack': stack, 'ms': round(count * per_sample_ms, 1)}
+            for stack, count in profile['stacks'].most_common(TOP_STACKS)
+        ] if slow else None
+    })
+
+def get_page_profiles(limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Get the stored profiles, newest first."""
+    with _lock:
+        profiles = list(_profiles)
+    profiles.reverse()
+    return profiles[:limit] if limit else profiles
+
+def get_page_summary() -> List[Dict[str, Any]]:
+    """
+    Aggregate the stored profiles per page, slowest mean wall time first.
+
+    Returns:
+        list: dicts with 'page', 'runs', 'mean_ms', 'max_ms', 'slow_runs' and mean 'split_ms'
+    """
+    pages = {}
+    for profile in get_page_profiles():
+        page = pages.setdefault(profile['page'], {
+            'page': profile['page'], 'runs': 0, 'total_ms': 0.0, 'max_ms': 0.0,
+            'slow_runs': 0, 'split_ms': dict.fromkeys(CATEGORIES, 0.0)
+        })
+        page['runs'] += 1
+        page['total_ms'] += profile['wall_ms']
+        page['max_ms'] = max(page['max_ms'], profile['wall_ms'])
+        page['slow_runs'] += int(profile['slow'])
+        for name, ms in profile['split_ms'].items():
+            page['split_ms'][name] += ms
+
+    summary = []
+    for page in pages.values():
+        runs = page.pop('runs')
+        total_ms = page.pop('total_ms')
+        page.update(
+            runs=runs,
+            mean_ms=round(total_ms / runs, 1),
+            split_ms={name: round(ms / runs, 1) for name, ms in page['split_ms'].items()}
+        )
+        summary.append(page)
+    return sorted(summary, key=lambda p: p['mean_ms'], reverse=True)
+
+def get_section_summary() -> List[Dict[str, Any]]:
+    """
+    Aggregate time per page section across the stored profiles, largest total first.
+
+    Returns:
+        list: dicts with 'page', 'section', 'line', 'runs' and 'total_ms'
+    """
+    sections = {}
+    for profile in get_page_profiles():
+        for section in profile['sections']:
+            key = (profile['page'], section['section'])
+            entry = sections.setdefault(key, {
+                'page': profile['page'], 'section': section['section'],
+                'line': section['line'], 'runs': 0, 'total_ms': 0.0
+            })
+            entry['runs'] += 1
+            entry['total_ms'] += section['ms']
+            entry['line'] = min(entry['line'], section['line'])
+
+    for entry in sections.values():
+        entry['total_ms'] = round(entry['total_ms'], 1)
+    return sorted(sections.values(), key=lambda s: s['total_ms'], reverse=True)
+
+def clear_page_profiles():
+    """Drop every stored profile."""
+    with _lock:
+        _profiles.clear()
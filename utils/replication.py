@@ -0,0 +1,524 @@
+"""
+Read replicas: ship the primary's corpus change log and users store to followers.
+
+Contributions go to one primary. Followers serve read-heavy pages such as the
+gallery and exports from their own copy of the corpus, kept current by
+applying the primary's change log (see data_manager.changes_since) to their
+own corpus file, cache and indexes. Set FESTIVEVOICE_REPLICATION_ROLE to
+primary or follower and pick a transport:
+
+- FESTIVEVOICE_REPLICATION_DIR, a directory shared between nodes: the primary
+  appends every change record to corpus_changes.jsonl there, and keeps
+  corpus_snapshot.json and a copy of users.json next to it.
+- FESTIVEVOICE_REPLICATION_SOCKET, a Unix socket: the primary answers follower
+  requests for changes, snapshots and the users store, one JSON line each way.
+
+A follower bootstraps from a snapshot, then polls every POLL_SECONDS, and
+refuses corpus and user writes. get_replication_status() reports how far it
+lags behind; so do /replication on the status server and /metrics.
+
+Two processes are enough to try it locally, each in its own working directory:
+
+    python -m utils.replication serve --socket /tmp/festivevoice-repl.sock
+    python -m utils.replication follow --socket /tmp/festivevoice-repl.sock
+"""
+import argparse
+import hashlib
+import json
+import os
+import socket
+import socketserver
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+REPLICATION_ROLE = os.environ.get("FESTIVEVOICE_REPLICATION_ROLE", "").strip().lower()
+REPLICATION_DIR = os.environ.get("FESTIVEVOICE_REPLICATION_DIR", "")
+REPLICATION_SOCKET = os.environ.get("FESTIVEVOICE_REPLICATION_SOCKET", "")
+# Seconds between a follower's polls of the primary
+POLL_SECONDS = float(os.environ.get("FESTIVEVOICE_REPLICATION_POLL_SECONDS", 1))
+# Records kept in the shipped log, as data_manager.CHANGE_LOG_RETAIN does for its own
+SHIPPED_LOG_RETAIN = int(os.environ.get("FESTIVEVOICE_CHANGE_LOG_RETAIN", 10000))
+# How long warm-up waits for a follower's first sync
+BOOTSTRAP_TIMEOUT_SECONDS = 60
+
+SHIPPED_LOG = "corpus_changes.jsonl"
+SNAPSHOT_FILE = "corpus_snapshot.json"
+USERS_FILE = "users.json"
+# Changes a follower asks for per request over the socket
+CHANGES_PER_REQUEST = 500
+
+_state = {
+    'role': REPLICATION_ROLE if REPLICATION_ROLE in ('primary', 'follower') else None,
+    'dir': REPLICATION_DIR or None,
+    'socket': REPLICATION_SOCKET or None,
+}
+
+# Primary: records in the shipped log, counted on first use
+_shipping = {'records': None}
+_shipping_lock = threading.Lock()
+
+# Follower progress, read by get_replication_status()
+_follower = {
+    'state': 'idle',            # idle -> following | waiting (last sync failed)
+    'applied': None,            # sequence number applied locally
+    'primary_latest': None,     # newest sequence number the primary reported
+    'caught_up_at': None,       # time.time() when applied last matched the primary
+    'last_contact': None,
+    'snapshots': 0,
+    'changes_applied': 0,
+    'users_version': None,      # digest or file signature of the users store applied
+    'error': None,
+}
+_follower_lock = threading.Lock()
+_bootstrapped = threading.Event()
+
+# Follower: read position in the shipped log
+_tail = {'inode': None, 'offset': 0, 'latest': 0}
+# Follower: connection to the primary's socket
+_client = {'sock': None, 'file': None}
+_client_lock = threading.Lock()
+
+_started = {'server': None, 'thread': None}
+_start_lock = threading.Lock()
+
+class ReplicationError(Exception):
+    """The primary could not provide what a follower needs."""
+
+def configure_replication(role: Optional[str], directory: Optional[str] = None, socket_path: Optional[str] = None):
+    """Set this process's role ('primary', 'follower' or None) and transport from now on."""
+    _state.update(role=role, dir=directory or None, socket=socket_path or None)
+    _shipping['records'] = None
+    _tail.update(inode=None, offset=0, latest=0)
+    _close_client()
+
+def is_follower() -> bool:
+    """Whether this process is a read replica."""
+    return _state['role'] == 'follower'
+
+def _shared_path(name: str) -> str:
+    return os.path.join(_state['dir'], name)
+
+def _write_json_atomically(path: str, data: Any):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+def _read_lines(path: str) -> List[bytes]:
+    try:
+        with open(path, 'rb') as f:
+            return [line for line in f if line.endswith(b"\n")]
+    except FileNotFoundError:
+        return []
+
+# Primary
+
+def ship_changes(records: List[Dict[str, Any]], entries: List[Dict[str, Any]]):
+    """
+    Append change records to the shared directory, on a primary shipping to one.
+    Called by data_manager with its file lock held, so entries is the corpus as
+    of the last record. A snapshot is written as well after a reset, when the
+    shipped log is trimmed, or if there is none yet.
+    """
+    if _state['role'] != 'primary' or not _state['dir']:
+        return
+    try:
+        with _shipping_lock:
+            os.makedirs(_state['dir'], exist_ok=True)
+            log_path = _shared_path(SHIPPED_LOG)
+            if _shipping['records'] is None:
+                _shipping['records'] = len(_read_lines(log_path))
+            lines = [json.dumps(record, ensure_ascii=False) + "\n" for record in records]
+            with open(log_path, 'a', encoding='utf-8') as f:
+                f.writelines(lines)
+                f.flush()
+                os.fsync(f.fileno())
+            _shipping['records'] += len(lines)
+
+            snapshot = any(record['op'] == 'reset' for record in records) or not os.path.exists(_shared_path(SNAPSHOT_FILE))
+            if _shipping['records'] > SHIPPED_LOG_RETAIN + SHIPPED_LOG_RETAIN // 4:
+                kept = _read_lines(log_path)[-SHIPPED_LOG_RETAIN:]
+                with open(f"{log_path}.tmp", 'wb') as f:
+                    f.writelines(kept)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(f"{log_path}.tmp", log_path)
+                _shipping['records'] = len(kept)
+                # Followers behind the trimmed log need a snapshot that is newer than it
+                snapshot = True
+            if snapshot:
+                _write_json_atomically(_shared_path(SNAPSHOT_FILE), {'seq': records[-1]['seq'], 'entries': entries})
+    except Exception as e:
+        print(f"Error shipping corpus changes: {e}")
+
+def ship_users(users: Dict[str, Any]):
+    """Copy the users store to the shared directory, on a primary shipping to one."""
+    if _state['role'] != 'primary' or not _state['dir']:
+        return
+    try:
+        os.makedirs(_state['dir'], exist_ok=True)
+        _write_json_atomically(_shared_path(USERS_FILE), users)
+    except Exception as e:
+        print(f"Error shipping users: {e}")
+
+def publish_snapshot() -> int:
+    """Write a fresh corpus snapshot and users copy to the shared directory. Returns its sequence number."""
+    from utils.auth import load_users
+    from utils.data_manager import get_replication_snapshot
+
+    snapshot = get_replication_snapshot()
+    with _shipping_lock:
+        os.makedirs(_state['dir'], exist_ok=True)
+        _write_json_atomically(_shared_path(SNAPSHOT_FILE), snapshot)
+    ship_users(load_users())
+    return snapshot['seq']
+
+def _users_reply(known: Optional[str]) -> Dict[str, Any]:
+    """The users store, unless the follower already has this version of it."""
+    from utils.auth import AUTH_FILE
+
+    try:
+        with open(AUTH_FILE, 'rb') as f:
+            raw = f.read()
+    except FileNotFoundError:
+        raw = b"{}"
+    digest = hashlib.sha256(raw).hexdigest()
+    if digest == known:
+        return {'version': digest}
+    return {'version': digest, 'users': json.loads(raw)}
+
+def _answer(request: Dict[str, Any]) -> Dict[str, Any]:
+    """Answer one follower request on the primary."""
+    from utils import data_manager
+
+    op = request.get('op')
+    if op == 'changes':
+        feed = data_manager.changes_since(int(request['since']), int(request.get('limit', CHANGES_PER_REQUEST)))
+        return {**feed, 'latest': data_manager.get_latest_sequence()}
+    if op == 'snapshot':
+        return data_manager.get_replication_snapshot()
+    if op == 'users':
+        return _users_reply(request.get('version'))
+    return {'error': f"unknown request {op!r}"}
+
+class _ReplicationHandler(socketserver.StreamRequestHandler):
+    """Answer requests from one follower connection, one JSON line each."""
+
+    def handle(self):
+        for line in self.rfile:
+            try:
+                reply = _answer(json.loads(line))
+            except Exception as e:
+                reply = {'error': str(e)}
+            self.wfile.write(json.dumps(reply, ensure_ascii=False).encode('utf-8') + b"\n")
+            self.wfile.flush()
+
+class _ReplicationServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+def serve_replication(socket_path: str) -> Optional[_ReplicationServer]:
+    """
+    Serve the change log, snapshots and the users store to followers on
+    socket_path, from a daemon thread. Returns None if another process on
+    this host already serves that socket.
+    """
+    if os.path.exists(socket_path):
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(socket_path)
+            print(f"Replication socket {socket_path} is already served")
+            return None
+        except OSError:
+            os.unlink(socket_path)
+        finally:
+            probe.close()
+    os.makedirs(os.path.dirname(os.path.abspath(socket_path)), exist_ok=True)
+    # The users store goes over this socket; only its owner may connect
+    old_umask = os.umask(0o177)
+    try:
+        server = _ReplicationServer(socket_path, _ReplicationHandler)
+    finally:
+        os.umask(old_umask)
+    threading.Thread(target=server.serve_forever, name="replication-server", daemon=True).start()
+    return server
+
+# Follower
+
+def _close_client():
+    with _client_lock:
+        if _client['sock'] is not None:
+            _client['file'].close()
+            _client['sock'].close()
+        _client.update(sock=None, file=None)
+
+def _request(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Send one request to the primary's socket and wait for its reply."""
+    with _client_lock:
+        try:
+            if _client['sock'] is None:
+                sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                sock.settimeout(30)
+                sock.connect(_state['socket'])
+                _client.update(sock=sock, file=sock.makefile('rwb'))
+            _client['file'].write(json.dumps(payload).encode('utf-8') + b"\n")
+            _client['file'].flush()
+            line = _client['file'].readline()
+            if not line:
+                raise ConnectionError("the primary closed the connection")
+        except OSError:
+            if _client['sock'] is not None:
+                _client['file'].close()
+                _client['sock'].close()
+            _client.update(sock=None, file=None)
+            raise
+    reply = json.loads(line)
+    if 'error' in reply:
+        raise ReplicationError(reply['error'])
+    return reply
+
+def _fetch_snapshot() -> Dict[str, Any]:
+    if _state['socket']:
+        return _request({'op': 'snapshot'})
+    try:
+        with open(_shared_path(SNAPSHOT_FILE), 'r', encoding='utf-8') as f:
+            snapshot = json.load(f)
+    except FileNotFoundError:
+        raise ReplicationError("the primary has not published a snapshot yet")
+    # Read the shipped log from the start again to find what follows the snapshot
+    _tail.update(inode=None, offset=0)
+    return snapshot
+
+def _read_shipped_changes(seq: int) -> Dict[str, Any]:
+    """Like data_manager.changes_since(seq), from the shipped log, reading only what was appended since the last call."""
+    try:
+        with open(_shared_path(SHIPPED_LOG), 'rb') as f:
+            inode = os.fstat(f.fileno()).st_ino
+            if inode != _tail['inode']:
+                # First read, or the primary trimmed the log
+                _tail.update(inode=inode, offset=0)
+            f.seek(_tail['offset'])
+            data = f.read()
+    except FileNotFoundError:
+        data = b""
+    # Leave a line the primary is still writing for the next call
+    complete = data[:data.rfind(b"\n") + 1]
+    _tail['offset'] += len(complete)
+
+    changes = []
+    for line in complete.splitlines():
+        try:
+            record = json.loads(line)
+        except ValueError:
+            continue
+        _tail['latest'] = max(_tail['latest'], record['seq'])
+        if record['seq'] > seq:
+            changes.append(record)
+    latest = max(_tail['latest'], seq)
+    if changes and (changes[0]['seq'] != seq + 1 or any(change['op'] == 'reset' for change in changes)):
+        return {'changes': [], 'seq': latest, 'reset': True, 'latest': latest}
+    return {'changes': changes, 'seq': changes[-1]['seq'] if changes else seq, 'reset': False, 'latest': latest}
+
+def _fetch_changes(seq: int) -> Dict[str, Any]:
+    if _state['socket']:
+        return _request({'op': 'changes', 'since': seq, 'limit': CHANGES_PER_REQUEST})
+    return _read_shipped_changes(seq)
+
+def _sync_users():
+    """Apply the primary's users store if it changed since the last sync."""
+    from utils.auth import apply_replica_users
+
+    if _state['socket']:
+        reply = _request({'op': 'users', 'version': _follower['users_version']})
+        version, users = reply['version'], reply.get('users')
+    else:
+        path = _shared_path(USERS_FILE)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return
+        version, users = f"{stat.st_mtime_ns}:{stat.st_size}", None
+        if version != _follower['users_version']:
+            with open(path, 'r', encoding='utf-8') as f:
+                users = json.load(f)
+    if users is not None and apply_replica_users(users):
+        _follower['users_version'] = version
+
+def sync_once() -> int:
+    """
+    Bring this follower up to date with the primary: bootstrap from a snapshot
+    on the first call or when the log can't be followed, then apply changes
+    until none are left, then the users store.
+
+    Returns:
+        int: Number of changes applied
+    """
+    from utils import data_manager
+
+    applied = 0
+    needs_snapshot = not _bootstrapped.is_set()
+    snapshot_taken = False
+    while True:
+        if needs_snapshot:
+            if snapshot_taken:
+                raise ReplicationError("the primary's log does not continue from its snapshot yet")
+            snapshot = _fetch_snapshot()
+            if not data_manager.apply_replica_snapshot(snapshot['seq'], snapshot['entries']):
+                raise ReplicationError("could not apply the snapshot")
+            snapshot_taken = True
+            with _follower_lock:
+                _follower['snapshots'] += 1
+
+        seq = data_manager.get_latest_sequence()
+        feed = _fetch_changes(seq)
+        with _follower_lock:
+            _follower['primary_latest'] = feed['latest']
+            _follower['last_contact'] = time.time()
+        needs_snapshot = feed['reset']
+        if needs_snapshot:
+            continue
+        if not feed['changes']:
+            break
+        if not data_manager.apply_replica_changes(feed['changes']):
+            needs_snapshot = True
+            continue
+        applied += len(feed['changes'])
+
+    _sync_users()
+    with _follower_lock:
+        _follower.update(state='following', applied=seq, caught_up_at=time.time(), error=None)
+        _follower['changes_applied'] += applied
+    _bootstrapped.set()
+    return applied
+
+def _follow():
+    """Poll the primary for as long as the process runs."""
+    while True:
+        try:
+            sync_once()
+        except (OSError, ValueError, KeyError, ReplicationError) as e:
+            if str(e) != _follower['error']:
+                print(f"Replication from the primary failed: {e}")
+            with _follower_lock:
+                _follower.update(state='waiting', error=str(e))
+        time.sleep(POLL_SECONDS)
+
+# Both roles
+
+def get_replication_status() -> Dict[str, Any]:
+    """
+    Get this process's replication role and, on a follower, how far it lags.
+
+    Returns:
+        dict: 'role', 'transport'; on a follower also 'state', 'applied',
+        'primary_latest', 'lag_changes' (as of the last contact), 'lag_seconds'
+        (time since it last matched the primary), 'seconds_since_contact',
+        'snapshots', 'changes_applied' and 'error'
+    """
+    status = {'role': _state['role'], 'transport': _state['socket'] or _state['dir']}
+    if not is_follower():
+        return status
+    now = time.time()
+    with _follower_lock:
+        follower = dict(_follower)
+    lag = None
+    if follower['applied'] is not None and follower['primary_latest'] is not None:
+        lag = max(0, follower['primary_latest'] - follower['applied'])
+    status.update(
+        state=follower['state'],
+        applied=follower['applied'],
+        primary_latest=follower['primary_latest'],
+        lag_changes=lag,
+        lag_seconds=round(now - follower['caught_up_at'], 3) if follower['caught_up_at'] else None,
+        seconds_since_contact=round(now - follower['last_contact'], 3) if follower['last_contact'] else None,
+        snapshots=follower['snapshots'],
+        changes_applied=follower['changes_applied'],
+        error=follower['error']
+    )
+    return status
+
+def _status_route():
+    """Status server handler for /replication."""
+    return 200, "application/json", json.dumps(get_replication_status())
+
+def start_replication() -> bool:
+    """
+    Start this process's part in replication, once: the socket server on a
+    primary, the polling thread on a follower. Also registers /replication.
+
+    Returns:
+        bool: True if this call started something
+    """
+    from utils.status_server import register_route
+
+    with _start_lock:
+        if _state['role'] is None or _started['server'] or _started['thread']:
+            return False
+        register_route("/replication", _status_route)
+        if _state['role'] == 'primary' and _state['socket']:
+            _started['server'] = serve_replication(_state['socket'])
+        elif is_follower():
+            if not (_state['socket'] or _state['dir']):
+                print("Replication follower has no FESTIVEVOICE_REPLICATION_SOCKET or FESTIVEVOICE_REPLICATION_DIR")
+                return False
+            _started['thread'] = threading.Thread(target=_follow, name="replication-follower", daemon=True)
+            _started['thread'].start()
+        return True
+
+def warm_replication() -> str:
+    """
+    Warm-up step: a follower waits for its first sync, a primary shipping to a
+    directory publishes a snapshot there.
+    """
+    if is_follower():
+        if not _bootstrapped.wait(BOOTSTRAP_TIMEOUT_SECONDS):
+            raise ReplicationError(f"no sync with the primary yet: {_follower['error']}")
+        return f"following at {_follower['applied']}"
+    if _state['role'] == 'primary':
+        if _state['dir']:
+            return f"published snapshot at {publish_snapshot()}"
+        return f"serving {_state['socket']}"
+    return "replication off"
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve or follow the corpus change log from the command line.")
+    parser.add_argument("command", choices=["serve", "follow"], help="serve: primary on --socket; follow: apply the primary's log to ./data")
+    parser.add_argument("--socket", default=REPLICATION_SOCKET or None, help="Unix socket of the primary")
+    parser.add_argument("--dir", default=REPLICATION_DIR or None, help="Shared directory the primary ships to (follow only)")
+    args = parser.parse_args()
+    # Run under the module name data_manager imports, not as __main__
+    from utils import replication
+
+    if args.command == "serve":
+        if not args.socket:
+            parser.error("serve needs --socket")
+        replication.configure_replication('primary', socket_path=args.socket)
+        if replication.serve_replication(args.socket) is None:
+            return 1
+        print(f"Serving the change log of {os.path.abspath('data')} on {args.socket}")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            os.unlink(args.socket)
+        return 0
+
+    if not (args.socket or args.dir):
+        parser.error("follow needs --socket or --dir")
+    replication.configure_replication('follower', directory=args.dir, socket_path=args.socket)
+    try:
+        while True:
+            try:
+                applied = replication.sync_once()
+                status = replication.get_replication_status()
+                print(f"applied {applied:>5} changes, at {status['applied']}, primary at {status['primary_latest']}")
+            except (OSError, ValueError, KeyError, ReplicationError) as e:
+                print(f"waiting for the primary: {e}")
+            time.sleep(POLL_SECONDS)
+    except KeyboardInterrupt:
+        return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,153 @@
+"""
+Session memory management for FestiveVoice.
+
+Streamlit keeps every session's st.session_state in the server process for
+as long as the browser tab stays connected, so anything a page appends there
+grows worker memory. Contributions are recorded here as small summaries
+(id, type, title and a few scalar fields) in a capped list, with running
+per-type counts that are not capped, and each session's state size is
+tracked so worker memory can be sized from the number of sessions.
+"""
+import os
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import streamlit as st
+
+# Most recent contribution summaries kept per session
+SESSION_CONTRIBUTIONS_LIMIT = int(os.environ.get("FESTIVEVOICE_SESSION_CONTRIBUTIONS", 50))
+# Longest text kept in a summary field
+SUMMARY_TEXT_LIMIT = 80
+# Sessions not seen for this long are dropped from the accounting
+SESSION_IDLE_SECONDS = 30 * 60
+
+SUMMARY_FIELDS = (
+    'id', 'type', 'timestamp', 'title', 'name', 'category',
+    'region', 'quality_score', 'is_correct'
+)
+
+_session_sizes: Dict[str, Dict[str, Any]] = {}
+_session_sizes_lock = threading.Lock()
+
+def summarize_entry(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """Reduce a corpus entry to the small fields pages need from session state."""
+    summary = {}
+    for field in SUMMARY_FIELDS:
+        value = entry.get(field)
+        if value is None:
+            continue
+        if isinstance(value, str) and len(value) > SUMMARY_TEXT_LIMIT:
+            value = value[:SUMMARY_TEXT_LIMIT]
+        summary[field] = value
+    return summary
+
+def record_contribution(entry: Dict[str, Any]):
+    """
+    Remember a contribution made in this session.
+    Only a summary is kept, and only the newest SESSION_CONTRIBUTIONS_LIMIT of them.
+    """
+    if 'user_contributions' not in st.session_state:
+        st.session_state.user_contributions = []
+    if 'contribution_counts' not in st.session_state:
+        st.session_state.contribution_counts = {}
+
+    contributions = st.session_state.user_contributions
+    contributions.append(summarize_entry(entry))
+    if len(contributions) > SESSION_CONTRIBUTIONS_LIMIT:
+        del contributions[:len(contributions) - SESSION_CONTRIBUTIONS_LIMIT]
+
+    counts = st.session_state.contribution_counts
+    entry_type = entry.get('type', 'unknown')
+    counts[entry_type] = counts.get(entry_type, 0) + 1
+    if entry.get('is_correct'):
+        counts['correct_answers'] = counts.get('correct_answers', 0) + 1
+
+    update_session_accounting()
+
+def get_session_contributions(entry_types: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """Get this session's recent contribution summaries, optionally filtered by type."""
+    contributions = st.session_state.get('user_contributions', [])
+    if entry_types is None:
+        return list(contributions)
+    return [c for c in contributions if c.get('type') in entry_types]
+
+def get_session_contribution_counts() -> Dict[str, int]:
+    """Get how many contributions of each type this session made, plus 'correct_answers'."""
+    return dict(st.session_state.get('contribution_counts', {}))
+
+def clear_session_contributions():
+    """Forget this session's contribution summaries and counts, e.g. on logout."""
+    for key in ('user_contributions', 'contribution_counts'):
+        if key in st.session_state:
+            del st.session_state[key]
+
+def estimate_size(obj: Any, _seen: Optional[set] = None) -> int:
+    """Approximate deep size of an object in bytes."""
+    if _seen is None:
+        _seen = set()
+    if id(obj) in _seen:
+        return 0
+    _seen.add(id(obj))
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(estimate_size(k, _seen) + estimate_size(v, _seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(estimate_size(item, _seen) for item in obj)
+    return size
+
+def get_session_memory_report() -> Dict[str, Any]:
+    """
+    Get the approximate size of each key in this session's state.
+
+    Returns:
+        dict: 'total_bytes' and 'keys' (key -> bytes, largest first)
+    """
+    sizes = {}
+    for key in list(st.session_state.keys()):
+        try:
+            sizes[str(key)] = estimate_size(st.session_state[key])
+        except Exception:
+            sizes[str(key)] = 0
+    ordered = dict(sorted(sizes.items(), key=lambda item: item[1], reverse=True))
+    return {'total_bytes': sum(sizes.values()), 'keys': ordered}
+
+def _get_session_id() -> Optional[str]:
+    """Get the id of the session running the current script, if any."""
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+        ctx = get_script_run_ctx()
+        return ctx.session_id if ctx else None
+    except Exception:
+        return None
+
+def update_session_accounting():
+    """Record this session's state size in the process-wide accounting."""
+    session_id = _get_session_id()
+    if session_id is None:
+        return
+
+    total = get_session_memory_report()['total_bytes']
+    now = time.time()
+    with _session_sizes_lock:
+        _session_sizes[session_id] = {'bytes': total, 'last_seen': now}
+        for stale in [sid for sid, info in _session_sizes.items() if now - info['last_seen'] > SESSION_IDLE_SECONDS]:
+            del _session_sizes[stale]
+
+def get_process_session_memory() -> Dict[str, Any]:
+    """
+    Get session state memory across this worker's recently active sessions.
+
+    Returns:
+        dict: 'sessions', 'total_bytes' and 'max_bytes'
+    """
+    now = time.time()
+    with _session_sizes_lock:
+        active = [info['bytes'] for info in _session_sizes.values() if now - info['last_seen'] <= SESSION_IDLE_SECONDS]
+    return {
+        'sessions': len(active),
+        'total_bytes': sum(active),
+        'max_bytes': max(active) if active else 0
+    }
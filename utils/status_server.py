@@ -0,0 +1,72 @@
+"""
+Side-channel HTTP server for load balancer and monitoring probes.
+
+Streamlit's own /_stcore/health only reports that the server is up. This
+server runs in a daemon thread on FESTIVEVOICE_STATUS_PORT (disabled when
+unset) and answers GET requests from routes that other modules register,
+such as /ready from utils.warmup.
+"""
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Optional, Tuple
+
+STATUS_HOST = os.environ.get("FESTIVEVOICE_STATUS_HOST", "0.0.0.0")
+STATUS_PORT = int(os.environ.get("FESTIVEVOICE_STATUS_PORT", 0) or 0)
+
+# path -> handler returning (status code, content type, body)
+_routes: Dict[str, Callable[[], Tuple[int, str, str]]] = {}
+_server = None
+_server_lock = threading.Lock()
+
+def register_route(path: str, handler: Callable[[], Tuple[int, str, str]]):
+    """Serve the result of handler() for GET requests to path."""
+    _routes[path] = handler
+
+class _StatusHandler(BaseHTTPRequestHandler):
+    """Dispatch GET requests to the registered routes."""
+
+    def do_GET(self):
+        handler = _routes.get(self.path.split('?', 1)[0])
+        if handler is None:
+            status, content_type, body = 404, "text/plain; charset=utf-8", "not found\n"
+        else:
+            try:
+                status, content_type, body = handler()
+            except Exception as e:
+                status, content_type, body = 500, "text/plain; charset=utf-8", f"error: {e}\n"
+
+        payload = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        # Probes hit this every few seconds; keep them out of the app log
+        pass
+
+def start_status_server(port: Optional[int] = None) -> Optional[int]:
+    """
+    Start the status server if it is enabled and not already running.
+
+    Returns:
+        int: The port it is listening on, or None if disabled or unavailable
+    """
+    global _server
+    port = STATUS_PORT if port is None else port
+    if not port:
+        return None
+
+    with _server_lock:
+        if _server is None:
+            try:
+                _server = ThreadingHTTPServer((STATUS_HOST, port), _StatusHandler)
+            except OSError as e:
+                print(f"Error starting status server on port {port}: {e}")
+                return None
+            _server.daemon_threads = True
+            threading.Thread(target=_server.serve_forever, name="status-server", daemon=True).start()
+        return _server.server_address[1]
@@ -1,12 +1,163 @@
+import hashlib
+import os
+import re
+from functools import lru_cache
+from typing import Dict
+
 import streamlit as st
 
-def apply_chatgpt_theme(theme_mode: str = 'light'):
+from utils.cards import build_card_css
+
+# Generated stylesheets are written under the app's static folder, which
+# Streamlit serves at app/static/ when server.enableStaticServing is on.
+STATIC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "static")
+STYLESHEET_DIR = os.path.join(STATIC_DIR, "css")
+STYLESHEET_URL = "app/static/css"
+
+def _minify_css(css: str) -> str:
+    """Strip comments and redundant whitespace from a stylesheet."""
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.S)
+    css = re.sub(r'\s+', ' ', css)
+    css = re.sub(r'\s*([{};,>])\s*', r'\1', css)
+    css = re.sub(r':\s+', ':', css)
+    return css.replace(';}', '}').strip()
+
+def _publish_stylesheet(name: str, css: str) -> Dict[str, str]:
     """
-    Apply ChatGPT-inspired theming to the Streamlit app.
+    Minify a stylesheet and write it to the static folder under a content-hashed
+    file name, so browsers can cache it indefinitely.
     
-    Args:
-        theme_mode: Either 'light' or 'dark'
+    Returns:
+        dict: 'css' (minified text), 'digest' and 'url' ('' if it could not be written)
+    """
+    css = _minify_css(css)
+    digest = hashlib.sha256(css.encode('utf-8')).hexdigest()[:12]
+    filename = f"{name}.{digest}.css"
+    path = os.path.join(STYLESHEET_DIR, filename)
+    
+    try:
+        if not os.path.exists(path):
+            os.makedirs(STYLESHEET_DIR, exist_ok=True)
+            temp_path = f"{path}.{os.getpid()}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                f.write(css)
+            os.replace(temp_path, path)
+            
+            # Remove stylesheets left over from earlier builds
+            for old in os.listdir(STYLESHEET_DIR):
+                if old.startswith(f"{name}.") and old.endswith(".css") and old != filename:
+                    os.remove(os.path.join(STYLESHEET_DIR, old))
+        url = f"{STYLESHEET_URL}/{filename}"
+    except OSError as e:
+        print(f"Error publishing stylesheet {name}: {e}")
+        url = ""
+    
+    return {'css': css, 'digest': digest, 'url': url}
+
+@lru_cache(maxsize=None)
+def _static_stylesheets_supported() -> bool:
     """
+    Check whether a <link> to app/static can be used for stylesheets.
+    Needs static serving enabled and a server that sends .css files as text/css;
+    older Tornado-based servers send them as text/plain with nosniff, which
+    browsers refuse to apply.
+    """
+    try:
+        if not st.get_option("server.enableStaticServing"):
+            return False
+    except Exception:
+        return False
+    
+    try:
+        from streamlit.web.server.app_static_file_handler import SAFE_APP_STATIC_FILE_EXTENSIONS
+    except ImportError:
+        return True
+    return ".css" in SAFE_APP_STATIC_FILE_EXTENSIONS
+
+def _inject_stylesheet(stylesheet: Dict[str, str]):
+    """Reference a published stylesheet by URL, or inline it if it cannot be served."""
+    if stylesheet['url'] and _static_stylesheets_supported():
+        st.markdown(f'<link rel="stylesheet" href="{stylesheet["url"]}">', unsafe_allow_html=True)
+    else:
+        st.markdown(f"<style>{stylesheet['css']}</style>", unsafe_allow_html=True)
+
+@lru_cache(maxsize=None)
+def get_theme_stylesheet(theme_mode: str = 'light') -> Dict[str, str]:
+    """Get the published stylesheet for a theme mode, building it on first use."""
+    return _publish_stylesheet(f"theme-{theme_mode}", _build_theme_css(theme_mode))
+
+@lru_cache(maxsize=None)
+def get_responsive_stylesheet() -> Dict[str, str]:
+    """Get the published responsive layout stylesheet, building it on first use."""
+    return _publish_stylesheet("responsive", RESPONSIVE_CSS)
+
+RESPONSIVE_CSS = """
+    /* Mobile responsiveness */
+    @media (max-width: 768px) {
+        .main .block-container {
+            padding-left: 1rem !important;
+            padding-right: 1rem !important;
+            padding-top: 1rem !important;
+        }
+        
+        .stButton > button {
+            width: 100%;
+            margin-bottom: 0.5rem;
+        }
+        
+        .stColumns > div {
+            margin-bottom: 1rem;
+        }
+        
+        /* Make cards full width on mobile */
+        .chat-message,
+        .user-message,
+        .assistant-message,
+        .event-card {
+            margin-left: 0 !important;
+            margin-right: 0 !important;
+            max-width: 100% !important;
+        }
+        
+        /* Reduce font sizes on mobile */
+        h1 { font-size: 1.5rem !important; }
+        h2 { font-size: 1.3rem !important; }
+        h3 { font-size: 1.1rem !important; }
+    }
+    
+    /* Tablet responsiveness */
+    @media (min-width: 768px) and (max-width: 1024px) {
+        .main .block-container {
+            padding-left: 2rem !important;
+            padding-right: 2rem !important;
+        }
+        
+        .chat-message {
+            max-width: 90%;
+        }
+        
+        .user-message {
+            margin-left: 10%;
+        }
+        
+        .assistant-message {
+            margin-right: 10%;
+        }
+    }
+    
+    /* Improve touch targets for mobile */
+    @media (max-width: 768px) {
+        .stButton > button,
+        .stSelectbox > div > div,
+        .stTextInput > div > div > input,
+        .stTextArea > div > div > textarea {
+            min-height: 44px;
+        }
+    }
+"""
+
+def _build_theme_css(theme_mode: str) -> str:
+    """Build the ChatGPT-inspired stylesheet for a theme mode."""
     
     if theme_mode == 'dark':
         # Dark mode colors
@@ -27,9 +178,7 @@ def apply_chatgpt_theme(theme_mode: str = 'light'):
         input_bg = "#FFFFFF"
         border_color = "#E5E5E5"
     
-    # Apply custom CSS
-    st.markdown(f"""
-    <style>
+    return f"""
     /* Main app background */
     .stApp {{
         background-color: {bg_color};
@@ -299,8 +448,16 @@ def apply_chatgpt_theme(theme_mode: str = 'light'):
     ::-webkit-scrollbar-thumb:hover {{
         background: {accent_color};
     }}
-    </style>
-    """, unsafe_allow_html=True)
+    """ + build_card_css(get_theme_colors(theme_mode))
+
+def apply_chatgpt_theme(theme_mode: str = 'light'):
+    """
+    Apply ChatGPT-inspired theming to the Streamlit app.
+    
+    Args:
+        theme_mode: Either 'light' or 'dark'
+    """
+    _inject_stylesheet(get_theme_stylesheet(theme_mode))
 
 def toggle_theme():
     """Toggle between light and dark themes."""
@@ -346,9 +503,11 @@ def get_theme_colors(theme_mode: str = 'light') -> dict:
             'info_color': "#3B82F6"
         }
 
+@lru_cache(maxsize=256)
 def create_styled_card(content: str, title: str = "", card_type: str = "default", theme_mode: str = 'light') -> str:
     """
     Create a styled card component with ChatGPT-like styling.
+    Colors come from the .fv-card classes in the theme stylesheet.
     
     Args:
         content: The main content of the card
@@ -360,50 +519,16 @@ def create_styled_card(content: str, title: str = "", card_type: str = "default"
         str: HTML string for the styled card
     """
     
-    colors = get_theme_colors(theme_mode)
-    
-    # Determine card colors based on type
-    if card_type == 'success':
-        bg_color = f"rgba(16, 163, 127, 0.1)"
-        border_color = colors['success_color']
-    elif card_type == 'warning':
-        bg_color = f"rgba(245, 158, 11, 0.1)"
-        border_color = colors['warning_color']
-    elif card_type == 'error':
-        bg_color = f"rgba(239, 68, 68, 0.1)"
-        border_color = colors['error_color']
-    elif card_type == 'info':
-        bg_color = f"rgba(59, 130, 246, 0.1)"
-        border_color = colors['info_color']
-    else:
-        bg_color = colors['secondary_bg']
-        border_color = colors['border_color']
-    
-    title_html = f"<h4 style='margin-top: 0; color: {colors['text_color']};'>{title}</h4>" if title else ""
-    
-    card_html = f"""
-    <div style="
-        background-color: {bg_color};
-        padding: 1.5rem;
-        border-radius: 12px;
-        border: 1px solid {border_color};
-        margin: 1rem 0;
-        color: {colors['text_color']};
-        box-shadow: 0 1px 3px rgba(0,0,0,0.1);
-        transition: all 0.2s;
-    ">
-        {title_html}
-        <div style="color: {colors['text_color']};">
-            {content}
-        </div>
-    </div>
-    """
+    type_class = f" fv-card-{card_type}" if card_type in ('success', 'warning', 'error', 'info') else ""
+    title_html = f"<h4>{title}</h4>" if title else ""
     
-    return card_html
+    return f'<div class="fv-card{type_class}">{title_html}<div>{content}</div></div>'
 
+@lru_cache(maxsize=256)
 def create_chatgpt_message(content: str, is_user: bool = False, theme_mode: str = 'light') -> str:
     """
     Create a ChatGPT-style message bubble.
+    Colors come from the .fv-message classes in the theme stylesheet.
     
     Args:
         content: Message content
@@ -414,107 +539,20 @@ def create_chatgpt_message(content: str, is_user: bool = False, theme_mode: str
         str: HTML string for the message bubble
     """
     
-    colors = get_theme_colors(theme_mode)
-    
     if is_user:
-        bg_color = colors['accent_color']
-        text_color = "white"
-        margin_style = "margin-left: 20%; margin-right: 0;"
+        role_class = " fv-message-user"
         avatar = "🧑‍💻"
     else:
-        bg_color = colors['secondary_bg']
-        text_color = colors['text_color']
-        margin_style = "margin-left: 0; margin-right: 20%;"
+        role_class = ""
         avatar = "🤖"
     
-    message_html = f"""
-    <div style="
-        background-color: {bg_color};
-        color: {text_color};
-        padding: 1rem 1.5rem;
-        border-radius: 12px;
-        margin: 1rem 0;
-        {margin_style}
-        box-shadow: 0 1px 3px rgba(0,0,0,0.1);
-        max-width: 80%;
-    ">
-        <div style="display: flex; align-items: flex-start; gap: 0.5rem;">
-            <span style="font-size: 1.2rem;">{avatar}</span>
-            <div style="flex: 1;">
-                {content}
-            </div>
-        </div>
-    </div>
-    """
-    
-    return message_html
+    return (
+        f'<div class="fv-message{role_class}"><div class="fv-message-body">'
+        f'<span class="fv-message-avatar">{avatar}</span>'
+        f'<div class="fv-message-content">{content}</div>'
+        f'</div></div>'
+    )
 
 def apply_responsive_layout():
     """Apply responsive layout adjustments for mobile and tablet devices."""
-    
-    st.markdown("""
-    <style>
-    /* Mobile responsiveness */
-    @media (max-width: 768px) {
-        .main .block-container {
-            padding-left: 1rem !important;
-            padding-right: 1rem !important;
-            padding-top: 1rem !important;
-        }
-        
-        .stButton > button {
-            width: 100%;
-            margin-bottom: 0.5rem;
-        }
-        
-        .stColumns > div {
-            margin-bottom: 1rem;
-        }
-        
-        /* Make cards full width on mobile */
-        .chat-message,
-        .user-message,
-        .assistant-message,
-        .event-card {
-            margin-left: 0 !important;
-            margin-right: 0 !important;
-            max-width: 100% !important;
-        }
-        
-        /* Reduce font sizes on mobile */
-        h1 { font-size: 1.5rem !important; }
-        h2 { font-size: 1.3rem !important; }
-        h3 { font-size: 1.1rem !important; }
-    }
-    
-    /* Tablet responsiveness */
-    @media (min-width: 768px) and (max-width: 1024px) {
-        .main .block-container {
-            padding-left: 2rem !important;
-            padding-right: 2rem !important;
-        }
-        
-        .chat-message {
-            max-width: 90%;
-        }
-        
-        .user-message {
-            margin-left: 10%;
-        }
-        
-        .assistant-message {
-            margin-right: 10%;
-        }
-    }
-    
-    /* Improve touch targets for mobile */
-    @media (max-width: 768px) {
-        .stButton > button,
-        .stSelectbox > div > div,
-        .stTextInput > div > div > input,
-        .stTextArea > div > div > textarea {
-            min-height: 44px;
-        }
-    }
-    </style>
-    """, unsafe_allow_html=True)
+    _inject_stylesheet(get_responsive_stylesheet())
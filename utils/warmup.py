@@ -0,0 +1,165 @@
+"""
+Warm-up routine for a freshly started worker.
+
+Without it the first sessions after a deploy pay for parsing the corpus and
+building its indexes, generating the theme stylesheets, importing the AI SDKs
+and constructing their clients, and spawning the password hashing pool.
+start_warmup() does all of that in a background thread at server start (see
+run.py) and publishes the result on /ready, so a load balancer only sends
+traffic to workers that are warm. The same server answers /metrics. A read
+replica is only ready once it has synced with its primary (see
+utils.replication).
+"""
+import json
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict
+
+from utils.status_server import register_route, start_status_server
+
+# Steps whose failure leaves the worker unable to serve pages properly.
+# The others only make the first request to their feature slower.
+REQUIRED_STEPS = {'replica', 'corpus', 'theme'}
+
+_status = {
+    'state': 'idle',        # idle -> warming -> ready | failed
+    'started_at': None,
+    'finished_at': None,
+    'steps': {}
+}
+_status_lock = threading.Lock()
+_warmup_thread = None
+
+def _warm_replica() -> str:
+    """On a read replica, wait for the first sync with the primary."""
+    from utils.replication import warm_replication
+    return warm_replication()
+
+def _warm_corpus() -> str:
+    """Load the corpus file and build its indexes."""
+    from utils.data_manager import get_recent_data, get_type_counts, load_corpus_data
+    entries = load_corpus_data()
+    get_type_counts()
+    get_recent_data(5)
+    return f"{len(entries)} entries"
+
+def _warm_theme() -> str:
+    """Build and publish the stylesheets for both theme modes."""
+    from utils.theming import get_responsive_stylesheet, get_theme_stylesheet
+    digests = [get_theme_stylesheet(mode)['digest'] for mode in ('light', 'dark')]
+    digests.append(get_responsive_stylesheet()['digest'])
+    return ", ".join(digests)
+
+def _warm_translations() -> str:
+    """Resolve the translation table for every supported language."""
+    from utils.translations import SUPPORTED_LANGUAGES, get_translations
+    for language in SUPPORTED_LANGUAGES:
+        get_translations(language)
+    return f"{len(SUPPORTED_LANGUAGES)} languages"
+
+def _warm_validation_clients() -> str:
+    """Import the AI SDKs and construct their clients, where keys are set."""
+    from utils.ai_validation import get_anthropic_client, get_openai_client
+    built = []
+    if get_openai_client() is not None:
+        built.append("openai")
+    if get_anthropic_client() is not None:
+        built.append("anthropic")
+    return ", ".join(built) or "no API keys set"
+
+def _warm_password_hashing() -> str:
+    """Spawn every worker in the password hashing pool."""
+    from utils import password_hashing
+    pool = password_hashing.get_hash_pool()
+    if pool is None:
+        return "inline hashing"
+    # One cheap job per worker makes the pool start all of its processes
+    jobs = [
+        pool.submit(password_hashing._derive_key, "warmup", b"warmup", 2 ** 10, 8, 1)
+        for _ in range(password_hashing.HASH_POOL_WORKERS)
+    ]
+    for job in jobs:
+        job.result()
+    return f"{password_hashing.HASH_POOL_WORKERS} workers"
+
+WARMUP_STEPS = [
+    ('replica', _warm_replica),
+    ('corpus', _warm_corpus),
+    ('theme', _warm_theme),
+    ('translations', _warm_translations),
+    ('validation_clients', _warm_validation_clients),
+    ('password_hashing', _warm_password_hashing),
+]
+
+def run_warmup():
+    """Run every warm-up step in order, recording how long each one took."""
+    with _status_lock:
+        _status['state'] = 'warming'
+        _status['started_at'] = datetime.now().isoformat()
+        _status['steps'] = {}
+
+    failed_required = False
+    for name, step in WARMUP_STEPS:
+        start = time.perf_counter()
+        try:
+            detail = step()
+            result = {'ok': True, 'detail': detail}
+        except Exception as e:
+            print(f"Warm-up step {name} failed: {e}")
+            result = {'ok': False, 'detail': str(e)}
+            failed_required = failed_required or name in REQUIRED_STEPS
+        result['ms'] = round((time.perf_counter() - start) * 1000, 1)
+
+        with _status_lock:
+            _status['steps'][name] = result
+
+    state = 'failed' if failed_required else 'ready'
+    with _status_lock:
+        _status['state'] = state
+        _status['finished_at'] = datetime.now().isoformat()
+    print(f"Warm-up finished: {state}")
+
+def start_warmup() -> bool:
+    """
+    Start the warm-up thread and the /ready probe, once per process.
+
+    Returns:
+        bool: True if this call started it, False if it was already started
+    """
+    global _warmup_thread
+    with _status_lock:
+        if _warmup_thread is not None:
+            return False
+        _warmup_thread = threading.Thread(target=run_warmup, name="warmup", daemon=True)
+
+    from utils.metrics import metrics_route
+    from utils.replication import start_replication
+
+    register_route("/ready", _ready_route)
+    register_route("/live", _live_route)
+    register_route("/metrics", metrics_route)
+    start_status_server()
+    start_replication()
+    _warmup_thread.start()
+    return True
+
+def get_warmup_status() -> Dict[str, Any]:
+    """Get the warm-up state and the result of each step so far."""
+    with _status_lock:
+        return json.loads(json.dumps(_status))
+
+def is_ready() -> bool:
+    """Check whether warm-up has finished without a required step failing."""
+    with _status_lock:
+        return _status['state'] == 'ready'
+
+def _ready_route():
+    """Readiness probe: 200 once warm, 503 while warming or after a failure."""
+    status = get_warmup_status()
+    code = 200 if status['state'] == 'ready' else 503
+    return code, "application/json", json.dumps(status)
+
+def _live_route():
+    """Liveness probe: the process is up and serving."""
+    return 200, "text/plain; charset=utf-8", "ok\n"